@@ -43,13 +43,9 @@ class AnalyzeDailyActivity(ActivityBase):
             )  # or pass memory another way
             # If not found, fallback to your framework's global memory reference
             if not memory_obj:
-                from framework.main import DigitalBeing
+                from framework.main import get_current_being
 
-                # Fallback to the global being's memory if you prefer
-                # In some setups, you can pass it in shared_data, or fetch it from a global reference
-                being = DigitalBeing()
-                being.initialize()
-                memory_obj = being.memory
+                memory_obj = get_current_being().memory
 
             recent_activities = memory_obj.get_recent_activities(limit=10, offset=0)
 
@@ -60,7 +56,27 @@ class AnalyzeDailyActivity(ActivityBase):
                 text_snippets.append(snippet)
 
             combined_text = "\n".join(text_snippets)
-            prompt = f"Here are recent logs:\n{combined_text}\n\nProduce a short daily reflection or summary."
+
+            # Older memories related to today's activities, for context
+            recent_timestamps = {act["timestamp"] for act in recent_activities}
+            related_snippets = []
+            if combined_text:
+                for act in memory_obj.recall(
+                    combined_text, k=5 + len(recent_activities)
+                ):
+                    if act["timestamp"] in recent_timestamps:
+                        continue
+                    related_snippets.append(
+                        f"- {act['timestamp']} {act['activity_type']}, data={act.get('data')}"
+                    )
+                    if len(related_snippets) >= 5:
+                        break
+
+            prompt = f"Here are recent logs:\n{combined_text}\n\n"
+            if related_snippets:
+                related_text = "\n".join(related_snippets)
+                prompt += f"Related earlier memories:\n{related_text}\n\n"
+            prompt += "Produce a short daily reflection or summary."
 
             response = await chat_skill.get_chat_completion(
                 prompt=prompt, system_prompt=self.system_prompt, max_tokens=150
@@ -7,7 +7,7 @@ from skills.skill_chat import chat_skill
 
 from framework.skill_config import DynamicComposioSkills
 from framework.api_management import api_manager
-from framework.main import DigitalBeing
+from framework.main import get_current_being
 
 logger = logging.getLogger(__name__)
 
@@ -67,11 +67,10 @@ class BuildOrUpdateActivity(ActivityBase):
             "# 4) Memory usage\n"
             "- If referencing memory or retrieving recent activities, you can import from 'framework.main' or 'framework.memory'.\n"
             "- Typically, do:\n"
-            "     from framework.main import DigitalBeing\n"
-            "     being = DigitalBeing()\n"
-            "     being.initialize()\n"
-            "     mem = being.memory.get_recent_activities(limit=10)\n"
-            "- We do not store the skill or memory object in `shared_data` as a permanent reference. It's optional if you want.\n\n"
+            "     memory = shared_data.get('system', 'memory_ref')\n"
+            "     mem = memory.get_recent_activities(limit=10)\n"
+            "- For configs, use `from framework.main import get_current_being` and `get_current_being().configs`.\n"
+            "- Never construct a new DigitalBeing inside an activity; it reloads all of memory.\n\n"
             "# 5) Common pitfalls\n"
             "- DO NOT reference unknown modules or placeholders like 'some_module'.\n"
             "- DO NOT rely on fallback calls to uninitialized XAPISkill, if you do not intend them.\n"
@@ -127,8 +126,7 @@ class BuildOrUpdateActivity(ActivityBase):
                 )
 
             # 2) Access the being + memory
-            being = DigitalBeing()
-            being.initialize()
+            being = get_current_being()
             recent_activities = being.memory.get_recent_activities(limit=20)
 
             # 3) Gather skill info (both manual + dynamic)
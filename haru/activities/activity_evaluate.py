@@ -38,10 +38,9 @@ class EvaluateActivity(ActivityBase):
                 )
 
             # Possibly fetch the last created/updated code from memory
-            from framework.main import DigitalBeing
+            from framework.main import get_current_being
 
-            being = DigitalBeing()
-            being.initialize()
+            being = get_current_being()
             recents = being.memory.get_recent_activities(limit=10)
             code_found = None
 
@@ -4,14 +4,17 @@ import requests
 import json
 import time
 import http.client
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
 import re
 import asyncio
 import random
 
 from framework.activity_decorator import activity, ActivityBase, ActivityResult
 from framework.api_management import api_manager
+from framework.composio_integration import composio_manager
+from framework.deadline import remaining_time
 from framework.memory import Memory
+from framework.pipeline import Pipeline, Stage
 from skills.skill_chat import chat_skill
 from skills.skill_generate_image import ImageGenerationSkill
 from skills.skill_x_api import XAPISkill
@@ -26,6 +29,11 @@ STYLE_REFS = [
     "378114956",  # Ink wash painting style
 ]
 
+class TweetDraft(NamedTuple):
+    text: str
+    prompt: str
+
+
 def strip_html_tags(text):
     """Remove HTML tags from a string."""
     clean = re.compile('<.*?>')
@@ -36,6 +44,7 @@ def strip_html_tags(text):
     energy_cost=0.4,
     cooldown=3600,  # 1 hour
     required_skills=["twitter_posting", "image_generation"],
+    timeout=600,  # text + Midjourney polling (max_wait_time) + upload
 )
 class PostTweetActivity(ActivityBase):
     """
@@ -58,68 +67,97 @@ class PostTweetActivity(ActivityBase):
         # Maximum time to wait for image generation (in seconds)
         self.max_wait_time = 300  # 5 minutes
 
-    async def execute(self, shared_data) -> ActivityResult:
-        try:
-            logger.info("Starting tweet posting activity...")
-
-            # 1) Gather personality + recent tweets
-            character_config = self._get_character_config(shared_data)
-            personality_data = character_config.get("personality", {})
-            recent_tweets = self._get_recent_tweets(shared_data, limit=10)
-
-            # 2) Generate tweet text with Google AI
-            prompt_text = self._build_chat_prompt(personality_data, recent_tweets, shared_data)
-            google_api_key = os.getenv("GOOGLE_API_KEY")
-            if not google_api_key:
-                return ActivityResult(success=False, error="Google API key not found")
+    def setup(self):
+        self.pipeline = self._build_pipeline()
 
-            client = Client(api_key=google_api_key)
-            response = client.models.generate_content(
-                model="gemini-exp-1206",
-                contents=[prompt_text]
+    def _build_pipeline(self) -> Pipeline:
+        """
+        Stages and their data dependencies. The critical path is
+        prompt -> tweet -> image_prompt -> image -> post; the X API setup
+        does not depend on any of it and is checked first, so a missing
+        Composio connection fails the run before the Google and Midjourney
+        calls are paid for. The character config and the recent tweets are
+        cheap lookups and run inline on the event loop.
+        """
+        pipeline = Pipeline("post_a_tweet")
+        pipeline.add_stage(
+            Stage(
+                "character_config",
+                self._get_character_config,
+                ["shared_data"],
+                output=dict,
+            )
+        )
+        pipeline.add_stage(
+            Stage("recent_tweets", self._get_recent_tweets, ["shared_data"], output=list)
+        )
+        pipeline.add_stage(
+            Stage(
+                "prompt",
+                self._build_prompt,
+                ["character_config", "recent_tweets"],
+                output=str,
             )
+        )
+        pipeline.add_stage(
+            Stage("tweet", self._generate_tweet, ["prompt"], output=TweetDraft, blocking=True)
+        )
+        pipeline.add_stage(
+            Stage(
+                "image_prompt",
+                self._generate_tweet_image_prompt,
+                ["character_config", "tweet"],
+            )
+        )
+        pipeline.add_stage(
+            Stage("image", self._generate_image, ["image_prompt"], output=list)
+        )
+        pipeline.add_stage(Stage("x_api", self._create_x_api, output=XAPISkill))
+        pipeline.add_stage(
+            Stage("post", self._post_tweet, ["tweet", "image", "x_api"], output=dict)
+        )
+        return pipeline
 
-            tweet_text = response.text.strip()
-            if len(tweet_text) > self.max_length:
-                tweet_text = tweet_text[: self.max_length - 3] + "..."
-
-            # 3) Generate an image based on the tweet text
-            if self.image_generation_enabled:
-                image_prompt, media_urls = await self._generate_image_for_tweet_mj(tweet_text, personality_data, shared_data)
-            else:
-                image_prompt, media_urls = None, []
-
-            # 4) Post the tweet via X API
-            x_api = XAPISkill({
-                "enabled": True,
-                "twitter_username": self.twitter_username
-            })
-            post_result = await x_api.post_tweet(tweet_text, media_urls)
-            if not post_result["success"]:
-                error_msg = post_result.get(
-                    "error", "Unknown error posting tweet via Composio"
+    async def execute(self, shared_data) -> ActivityResult:
+        try:
+            logger.info("Starting tweet posting activity...")
+            if getattr(self, "pipeline", None) is None:
+                self.setup()
+
+            result = await self.pipeline.run(shared_data=shared_data)
+            if not result.success:
+                error_message = strip_html_tags(result.error)
+                logger.error(f"Failed to post tweet: {error_message}")
+                return ActivityResult(
+                    success=False,
+                    error=error_message,
+                    metadata={"pipeline": result.summary()},
                 )
-                logger.error(f"Tweet posting failed: {error_msg}")
-                return ActivityResult(success=False, error=error_msg)
 
-            tweet_id = post_result.get("tweet_id")
+            tweet = result["tweet"]
+            image_prompt = result["image_prompt"]
+            media_urls = result["image"]
+            tweet_id = result["post"].get("tweet_id")
             tweet_link = (
                 f"https://twitter.com/{self.twitter_username}/status/{tweet_id}"
                 if tweet_id
                 else None
             )
 
-            # 5) Return success, adding link & prompt in metadata
-            logger.info(f"Successfully posted tweet: {tweet_text[:50]}...")
-            return ActivityResult(
-                success=True,
-                data={"tweet_id": tweet_id, "content": tweet_text},
+            # Return success, adding link & prompt in metadata
+            logger.info(f"Successfully posted tweet: {tweet.text[:50]}...")
+            return result.to_activity_result(
+                data={
+                    "tweet_id": tweet_id,
+                    "content": tweet.text,
+                    "media_urls": media_urls,
+                },
                 metadata={
-                    "length": len(tweet_text),
+                    "length": len(tweet.text),
                     "method": "google_ai",
                     "model": "gemini-exp-1206",
                     "tweet_link": tweet_link,
-                    "prompt_used": prompt_text,
+                    "prompt_used": tweet.prompt,
                     "image_prompt_used": image_prompt,
                     "image_count": len(media_urls),
                 },
@@ -130,6 +168,73 @@ class PostTweetActivity(ActivityBase):
             logger.error(f"Failed to post tweet: {error_message}", exc_info=True)
             return ActivityResult(success=False, error=error_message)
 
+    def _build_prompt(
+        self, character_config: Dict[str, Any], recent_tweets: List[str]
+    ) -> str:
+        personality_data = character_config.get("personality", {})
+        return self._build_chat_prompt(personality_data, recent_tweets, character_config)
+
+    def _generate_tweet(self, prompt: str) -> TweetDraft:
+        """Generate tweet text with Google AI (runs in a worker thread)."""
+        prompt_text = prompt
+        google_api_key = os.getenv("GOOGLE_API_KEY")
+        if not google_api_key:
+            raise RuntimeError("Google API key not found")
+
+        client = Client(api_key=google_api_key)
+        response = client.models.generate_content(
+            model="gemini-exp-1206",
+            contents=[prompt_text]
+        )
+
+        tweet_text = response.text.strip()
+        if len(tweet_text) > self.max_length:
+            tweet_text = tweet_text[: self.max_length - 3] + "..."
+        return TweetDraft(tweet_text, prompt_text)
+
+    async def _generate_tweet_image_prompt(
+        self, character_config: Dict[str, Any], tweet: TweetDraft
+    ) -> Optional[str]:
+        """Midjourney prompt for the tweet, or None if no image will be made."""
+        if not self.image_generation_enabled:
+            return None
+        if not os.getenv("MJ_API_KEY"):
+            logger.error("Midjourney API key not found in environment variables")
+            return None
+        origin = character_config.get("backstory", {}).get("origin", "")
+        return await self._generate_image_prompt(
+            tweet.text, character_config.get("personality", {}), origin
+        )
+
+    async def _generate_image(self, image_prompt: Optional[str]) -> List[str]:
+        """Generate the image for the prompt, if any, and return its URLs."""
+        if image_prompt is None:
+            return []
+        return await self._generate_image_mj(image_prompt)
+
+    def _create_x_api(self) -> XAPISkill:
+        """
+        Prepare the X API client, failing the run before the text and image
+        are generated if Composio has no toolset to post with.
+        """
+        if composio_manager._toolset is None:
+            raise RuntimeError("Composio toolset is not initialized")
+        return XAPISkill({
+            "enabled": True,
+            "twitter_username": self.twitter_username
+        })
+
+    async def _post_tweet(
+        self, tweet: TweetDraft, image: List[str], x_api: XAPISkill
+    ) -> Dict[str, Any]:
+        """Post the tweet via X API."""
+        post_result = await x_api.post_tweet(tweet.text, image)
+        if not post_result["success"]:
+            raise RuntimeError(
+                post_result.get("error", "Unknown error posting tweet via Composio")
+            )
+        return post_result
+
     def _get_character_config(self, shared_data) -> Dict[str, Any]:
         """
         Retrieve character_config from SharedData['system'] or re-init the Being if not found.
@@ -140,11 +245,9 @@ class PostTweetActivity(ActivityBase):
             return maybe_config
 
         # fallback
-        from framework.main import DigitalBeing
+        from framework.main import get_current_being
 
-        being = DigitalBeing()
-        being.initialize()
-        return being.configs.get("character_config", {})
+        return get_current_being().configs.get("character_config", {})
 
     def _get_recent_tweets(self, shared_data, limit: int = 10) -> List[str]:
         """
@@ -154,11 +257,9 @@ class PostTweetActivity(ActivityBase):
         memory_obj: Memory = system_data.get("memory_ref")
 
         if not memory_obj:
-            from framework.main import DigitalBeing
+            from framework.main import get_current_being
 
-            being = DigitalBeing()
-            being.initialize()
-            memory_obj = being.memory
+            memory_obj = get_current_being().memory
 
         recent_activities = memory_obj.get_recent_activities(limit=50, offset=0)
         tweets = []
@@ -170,7 +271,7 @@ class PostTweetActivity(ActivityBase):
 
         return tweets[:limit]
 
-    def _build_chat_prompt(self, personality: Dict[str, Any], recent_tweets: List[str], shared_data: Dict[str, Any]) -> str:
+    def _build_chat_prompt(self, personality: Dict[str, Any], recent_tweets: List[str], character_config: Dict[str, Any]) -> str:
         """
         Construct the user prompt referencing personality + last tweets.
         """
@@ -183,7 +284,6 @@ class PostTweetActivity(ActivityBase):
             last_tweets_str = "(No recent tweets)"
 
         # Get backstory information from character config
-        character_config = self._get_character_config(shared_data)
         backstory = character_config.get("backstory", {})
         origin = backstory.get("origin", "")
         purpose = backstory.get("purpose", "")
@@ -237,7 +337,8 @@ class PostTweetActivity(ActivityBase):
         
         try:
             client = Client(api_key=google_api_key)
-            response = client.models.generate_content(
+            response = await asyncio.to_thread(
+                client.models.generate_content,
                 model="gemini-exp-1206",
                 contents=[prompt_for_image_prompt]
             )
@@ -286,27 +387,17 @@ class PostTweetActivity(ActivityBase):
             logger.info(f"Image is still generating. Status: {response_data.get('data', {}).get('status')}")
             return None
 
-    async def _generate_image_for_tweet_mj(self, tweet_text: str, personality_data: Dict[str, Any], shared_data: Dict[str, Any] = None) -> Tuple[str, List[str]]:
+    async def _generate_image_mj(self, image_prompt: str) -> List[str]:
         """
-        Generate an image for the tweet using ImagineAPI (Midjourney).
-        Returns a tuple of (image_prompt, media_urls).
-        If generation fails, returns (None, []).
+        Generate an image for the prompt using ImagineAPI (Midjourney).
+        Returns the media URLs, or [] if generation fails.
         """
         logger.info("Starting image generation with ImagineAPI (Midjourney)")
-        
-        # Get the API key from environment variables
         mj_api_key = os.getenv("MJ_API_KEY")
         if not mj_api_key:
             logger.error("Midjourney API key not found in environment variables")
-            return None, []
-        
-        # Extract origin from character config
-        character_config = self._get_character_config(shared_data)
-        origin = character_config.get("backstory", {}).get("origin", "")
-        
-        # Generate a dynamic image prompt using Google AI
-        image_prompt = await self._generate_image_prompt(tweet_text, personality_data, origin)
-        
+            return []
+
         # Prepare the request data and headers
         data = {
             "prompt": image_prompt,
@@ -319,11 +410,13 @@ class PostTweetActivity(ActivityBase):
         
         try:
             # Send the initial request to generate the image
-            prompt_response = self._send_mj_request('POST', '/items/images/', data, headers)
+            prompt_response = await asyncio.to_thread(
+                self._send_mj_request, 'POST', '/items/images/', data, headers
+            )
             
             if not prompt_response.get('data', {}).get('id'):
                 logger.error(f"Failed to initiate image generation: {prompt_response}")
-                return image_prompt, []
+                return []
             
             image_id = prompt_response['data']['id']
             logger.info(f"Image generation initiated with ID: {image_id}")
@@ -331,20 +424,27 @@ class PostTweetActivity(ActivityBase):
             # Poll for image completion
             start_time = time.time()
             completed_data = None
-            
-            while time.time() - start_time < self.max_wait_time:
-                completed_data = self._check_image_status(image_id, headers)
+            # Stop polling early enough to post without the image
+            max_wait_time = self.max_wait_time
+            time_left = remaining_time()
+            if time_left is not None:
+                max_wait_time = min(max_wait_time, time_left - 60)
+
+            while time.time() - start_time < max_wait_time:
+                completed_data = await asyncio.to_thread(
+                    self._check_image_status, image_id, headers
+                )
                 if completed_data:
                     break
                 await asyncio.sleep(5)  # Wait for 5 seconds before checking again
             
             if not completed_data:
-                logger.warning(f"Image generation timed out after {self.max_wait_time} seconds")
-                return image_prompt, []
+                logger.warning(f"Image generation timed out after {max_wait_time} seconds")
+                return []
             
             if completed_data.get('status') == 'failed':
                 logger.error(f"Image generation failed: {completed_data.get('error')}")
-                return image_prompt, []
+                return []
             
             # Get the image URL - only use the base URL
             image_url = completed_data.get('url')
@@ -357,14 +457,14 @@ class PostTweetActivity(ActivityBase):
             
             if not image_url:
                 logger.error("No image URL found in the completed data")
-                return image_prompt, []
+                return []
             
             logger.info(f"Successfully generated image: {image_url}")
-            return image_prompt, [image_url]
+            return [image_url]
             
         except Exception as e:
             logger.error(f"Error during image generation: {str(e)}")
-            return image_prompt, []
+            return []
 
     # Keep the original method for fallback or reference
     async def _generate_image_for_tweet(self, tweet_text: str, personality_data: Dict[str, Any], shared_data: Dict[str, Any] = None) -> Tuple[str, List[str]]:
@@ -38,10 +38,17 @@ class PostRecentMemoriesTweetActivity(ActivityBase):
 
         # How many recent memory entries to consider
         self.num_activities_to_fetch = num_activities_to_fetch
+        # How many older memories related to the objectives to add
+        self.num_related_memories = 3
+
+        # Media URLs recorded by memory for each memory summary gathered in
+        # the current run (the selector reuses this instance across runs)
+        self._media_urls_by_memory: Dict[str, List[str]] = {}
 
     async def execute(self, shared_data) -> ActivityResult:
         try:
             logger.info("Starting PostRecentMemoriesTweetActivity...")
+            self._media_urls_by_memory = {}
 
             # 1) Initialize chat skill
             if not await chat_skill.initialize():
@@ -59,6 +66,14 @@ class PostRecentMemoriesTweetActivity(ActivityBase):
             recent_memories = self._get_recent_memories(
                 shared_data, limit=self.num_activities_to_fetch
             )
+            # Also bring back older memories related to the being's objectives
+            recent_memories += [
+                m
+                for m in self._recall_related_memories(
+                    shared_data, objectives_data, limit=self.num_related_memories
+                )
+                if m not in recent_memories
+            ]
             if not recent_memories:
                 logger.info("No relevant memories found to tweet about.")
                 return ActivityResult(
@@ -136,6 +151,7 @@ class PostRecentMemoriesTweetActivity(ActivityBase):
                 data={
                     "tweet_id": tweet_id,
                     "content": tweet_text,
+                    "media_urls": drawing_urls,
                     "recent_memories_used": new_memories,  # store these for next run
                 },
                 metadata={
@@ -152,19 +168,21 @@ class PostRecentMemoriesTweetActivity(ActivityBase):
             logger.error(f"Failed to post recent memories tweet: {e}", exc_info=True)
             return ActivityResult(success=False, error=str(e))
 
+    def _get_memory(self, shared_data) -> Memory:
+        """The running being's memory, from SharedData['system'] if published there."""
+        memory_obj: Memory = shared_data.get_category_data("system").get("memory_ref")
+        if not memory_obj:
+            from framework.main import get_current_being
+
+            memory_obj = get_current_being().memory
+        return memory_obj
+
     def _get_memories_used_last_time(self, shared_data) -> List[str]:
         """
         Look in memory for the most recent successful run of this same activity.
         Return the list of 'recent_memories_used' from that run, or [] if none.
         """
-        system_data = shared_data.get_category_data("system")
-        memory_obj: Memory = system_data.get("memory_ref")
-        if not memory_obj:
-            from framework.main import DigitalBeing
-
-            being = DigitalBeing()
-            being.initialize()
-            memory_obj = being.memory
+        memory_obj = self._get_memory(shared_data)
 
         # Search in the last ~10 runs for this activity
         recent_activities = memory_obj.get_recent_activities(limit=10, offset=0)
@@ -187,11 +205,9 @@ class PostRecentMemoriesTweetActivity(ActivityBase):
             return maybe_config
 
         # fallback
-        from framework.main import DigitalBeing
+        from framework.main import get_current_being
 
-        being = DigitalBeing()
-        being.initialize()
-        return being.configs.get("character_config", {})
+        return get_current_being().configs.get("character_config", {})
 
     def _get_recent_memories(self, shared_data, limit: int = 10) -> List[str]:
         """
@@ -199,16 +215,7 @@ class PostRecentMemoriesTweetActivity(ActivityBase):
         ignoring certain activity types in self.ignored_activity_types.
         We'll just gather a short summary for each activity.
         """
-        system_data = shared_data.get_category_data("system")
-        memory_obj: Memory = system_data.get("memory_ref")
-
-        if not memory_obj:
-            from framework.main import DigitalBeing
-
-            being = DigitalBeing()
-            being.initialize()
-            memory_obj = being.memory
-
+        memory_obj = self._get_memory(shared_data)
         recent_activities = memory_obj.get_recent_activities(limit=50, offset=0)
         memories = []
         for act in recent_activities:
@@ -217,7 +224,7 @@ class PostRecentMemoriesTweetActivity(ActivityBase):
                 continue  # skip
 
             # Some minimal representation
-            summary = f"{act_type} => {act.get('data', {})}"
+            summary = self._summarize_memory(act)
             memories.append(summary)
 
             if len(memories) >= limit:
@@ -225,6 +232,35 @@ class PostRecentMemoriesTweetActivity(ActivityBase):
 
         return memories
 
+    def _recall_related_memories(
+        self, shared_data, objectives: Dict[str, Any], limit: int = 3
+    ) -> List[str]:
+        """
+        Recall up to 'limit' memories from all history that are semantically
+        closest to the objectives, in the same summary form as recent memories.
+        """
+        query = " ".join(str(v) for v in objectives.values())
+        if not query.strip():
+            return []
+
+        memories = []
+        for act in self._get_memory(shared_data).recall(query, k=limit + 10):
+            act_type = act.get("activity_type")
+            if act_type in self.ignored_activity_types:
+                continue
+            memories.append(self._summarize_memory(act))
+            if len(memories) >= limit:
+                break
+        return memories
+
+    def _summarize_memory(self, act: Dict[str, Any]) -> str:
+        """One-line summary of a memory entry, remembering its media URLs."""
+        summary = f"{act.get('activity_type')} => {act.get('data', {})}"
+        media_urls = act.get("artifacts", {}).get("media_urls", [])
+        if media_urls:
+            self._media_urls_by_memory[summary] = media_urls
+        return summary
+
     def _build_chat_prompt(
         self,
         personality: Dict[str, Any],
@@ -274,26 +310,17 @@ class PostRecentMemoriesTweetActivity(ActivityBase):
         Returns a list of valid URLs, empty list if none found.
         """
         drawing_urls = []
-        
+
         for memory in memories:
-            if memory.startswith("DrawActivity =>"):
-                try:
-                    # Extract the JSON-like string after '=>'
-                    data_str = memory.split("=>")[1].strip()
-                    # Convert string representation to dict
-                    data = eval(data_str)
-                    
-                    # Extract URL from image_data
-                    if 'image_data' in data and 'url' in data['image_data']:
-                        url = data['image_data']['url']
-                        # Validate URL
-                        result = urlparse(url)
-                        if all([result.scheme, result.netloc]):
-                            drawing_urls.append(url)
-                        else:
-                            logger.warning(f"Invalid URL format found in DrawActivity: {url}")
-                except Exception as e:
-                    logger.error(f"Failed to extract drawing URL: {e}")
-                    continue
-        
+            if not memory.startswith("DrawActivity =>"):
+                continue
+            # Media URLs are extracted by memory when the entry is stored
+            for url in self._media_urls_by_memory.get(memory, []):
+                # Validate URL
+                result = urlparse(url)
+                if all([result.scheme, result.netloc]):
+                    drawing_urls.append(url)
+                else:
+                    logger.warning(f"Invalid URL format found in DrawActivity: {url}")
+
         return drawing_urls
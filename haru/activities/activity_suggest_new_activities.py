@@ -7,7 +7,7 @@ from skills.skill_chat import chat_skill
 
 # We import these so we can list out both manual + dynamic skill records
 from framework.skill_config import DynamicComposioSkills
-from framework.main import DigitalBeing
+from framework.main import get_current_being
 
 logger = logging.getLogger(__name__)
 
@@ -45,8 +45,7 @@ If relevant, mention which skill(s) would be used for each suggestion.
                 )
 
             # 2) Gather the being + config
-            being = DigitalBeing()
-            being.initialize()
+            being = get_current_being()
             char_cfg = being.configs.get("character_config", {})
             objectives = char_cfg.get("objectives", {})
             primary_obj = objectives.get("primary", "No primary objective found.")
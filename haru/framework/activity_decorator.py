@@ -1,9 +1,13 @@
+import asyncio
 import functools
 import logging
 from typing import Callable, Any, Dict, List, Optional
 from datetime import datetime
 import json
 
+from .deadline import deadline_scope
+from .memory_entry import OUTCOME_TIMEOUT
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,14 +16,22 @@ def activity(
     energy_cost: float = 0.2,
     cooldown: int = 0,
     required_skills: Optional[List[str]] = None,
+    timeout: Optional[float] = None,
 ):
-    """Decorator for activity classes."""
+    """
+    Decorator for activity classes.
+
+    timeout (seconds): execute() is cancelled once it runs this long and
+    the run is recorded with outcome "timeout". Skills called meanwhile can
+    read the time left with framework.deadline.remaining_time().
+    """
 
     def decorator(cls):
         cls.activity_name = name
         cls.energy_cost = energy_cost
         cls.cooldown = cooldown
         cls.required_skills = required_skills or []
+        cls.timeout = timeout
         cls.last_execution = None
 
         # Add metadata to the class
@@ -28,6 +40,7 @@ def activity(
             "energy_cost": energy_cost,
             "cooldown": cooldown,
             "required_skills": required_skills,
+            "timeout": timeout,
         }
 
         # Wrap the execute method
@@ -47,8 +60,24 @@ def activity(
                 logger.info(f"Starting activity: {name}")
                 start_time = datetime.now()
 
-                # Execute the activity
-                result = await original_execute(self, *args, **kwargs)
+                # Execute the activity, cancelling it at its timeout
+                with deadline_scope(timeout):
+                    try:
+                        async with asyncio.timeout(timeout) as limit:
+                            result = await original_execute(self, *args, **kwargs)
+                    except TimeoutError:
+                        # A TimeoutError raised inside execute() (e.g. by an
+                        # HTTP client) is an ordinary error, not this timeout
+                        if not limit.expired():
+                            raise
+                        logger.error(
+                            f"Activity {name} timed out after {timeout} seconds"
+                        )
+                        return ActivityResult(
+                            success=False,
+                            error=f"Timed out after {timeout} seconds",
+                            metadata={"outcome": OUTCOME_TIMEOUT, "timeout": timeout},
+                        )
 
                 # Post-execution processing
                 end_time = datetime.now()
@@ -129,6 +158,16 @@ class ActivityBase:
         self.last_execution: Optional[datetime] = None
         self.cooldown: int = 0
 
+    def setup(self):
+        """
+        Called once after construction, before the instance first runs.
+        The selector keeps instances alive between runs, so acquire
+        expensive resources (skills, SDK clients) here rather than per run.
+        """
+
+    def teardown(self):
+        """Called when the selector drops the instance (reload, disable, shutdown)."""
+
     def _can_execute(self) -> bool:
         """Check if the activity can be executed."""
         if self.last_execution is None:
@@ -0,0 +1,220 @@
+"""Cron expressions and daily time windows that restrict when activities run."""
+
+import logging
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+# Cron day-of-week numbering (0 or 7 = Sunday) -> datetime.weekday()
+CRON_DOW_NAMES = {"sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6}
+CRON_MONTH_NAMES = {
+    name: i + 1
+    for i, name in enumerate(
+        [
+            "jan",
+            "feb",
+            "mar",
+            "apr",
+            "may",
+            "jun",
+            "jul",
+            "aug",
+            "sep",
+            "oct",
+            "nov",
+            "dec",
+        ]
+    )
+}
+
+# A missed cron fire older than this is skipped rather than run late
+DEFAULT_CRON_GRACE_SECONDS = 3600
+
+# How far ahead next_fire() searches before giving up (e.g. "0 0 30 2 *")
+CRON_SEARCH_DAYS = 366 * 5
+
+
+def _parse_field(field: str, low: int, high: int, names: Dict[str, int]) -> Set[int]:
+    values: Set[int] = set()
+    for part in field.lower().split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"invalid step in '{field}'")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start = names.get(start_text, None)
+            start = int(start_text) if start is None else start
+            end = names.get(end_text, None)
+            end = int(end_text) if end is None else end
+        else:
+            start = names.get(part, None)
+            start = int(part) if start is None else start
+            end = high if step > 1 else start
+        if not (low <= start <= high and low <= end <= high and start <= end):
+            raise ValueError(f"'{field}' is out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    Standard five-field cron expression: minute hour day-of-month month
+    day-of-week, with *, lists, ranges, steps and three-letter names. As in
+    Vixie cron, when both day fields are restricted a day matches either.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: '{expression}'")
+        self.expression = expression
+        self.minutes = _parse_field(fields[0], 0, 59, {})
+        self.hours = _parse_field(fields[1], 0, 23, {})
+        self.days = _parse_field(fields[2], 1, 31, {})
+        self.months = _parse_field(fields[3], 1, 12, CRON_MONTH_NAMES)
+        # Cron Sunday (0 or 7) -> weekday() 6, Monday 1 -> 0, ...
+        self.weekdays = {
+            (d - 1) % 7 for d in _parse_field(fields[4], 0, 7, CRON_DOW_NAMES)
+        }
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        dom = day.day in self.days
+        dow = day.weekday() in self.weekdays
+        if self._any_day:
+            return dow
+        if self._any_weekday:
+            return dom
+        return dom or dow
+
+    def next_fire(self, after: datetime) -> Optional[datetime]:
+        """First fire time strictly after `after`, or None if there is none."""
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=CRON_SEARCH_DAYS)
+        hours = sorted(self.hours)
+        minutes = sorted(self.minutes)
+        while t < limit:
+            if not self._day_matches(t):
+                t = datetime.combine(t.date() + timedelta(days=1), time())
+                continue
+            hour = next((h for h in hours if h >= t.hour), None)
+            if hour is None:
+                t = datetime.combine(t.date() + timedelta(days=1), time())
+                continue
+            if hour != t.hour:
+                t = t.replace(hour=hour, minute=0)
+            minute = next((m for m in minutes if m >= t.minute), None)
+            if minute is None:
+                t = t.replace(minute=0) + timedelta(hours=1)
+                continue
+            return t.replace(minute=minute)
+        return None
+
+
+class TimeWindow:
+    """
+    A daily window such as 09:00-22:00, optionally limited to some days of
+    the week. A window whose end is before its start wraps past midnight,
+    and belongs to the day it starts on.
+    """
+
+    def __init__(self, start: str, end: str, days: Optional[List[str]] = None):
+        self.start = time.fromisoformat(start)
+        self.end = time.fromisoformat(end)
+        self.weekdays = (
+            {DAY_NAMES.index(d.lower()[:3]) for d in days} if days else set(range(7))
+        )
+        length = datetime.combine(datetime.min, self.end) - datetime.combine(
+            datetime.min, self.start
+        )
+        if length <= timedelta(0):
+            length += timedelta(days=1)
+        self.length = length
+
+    def next_open(self, at: datetime) -> datetime:
+        """`at` if the window is open then, else the next time it opens."""
+        # A window that opened yesterday may still be open
+        day = at.date() - timedelta(days=1)
+        for _ in range(9):
+            opens = datetime.combine(day, self.start)
+            if day.weekday() in self.weekdays:
+                if opens <= at < opens + self.length:
+                    return at
+                if opens > at:
+                    return opens
+            day += timedelta(days=1)
+        return at  # Not reached: every window has at least one day
+
+
+class ActivitySchedule:
+    """
+    The calendar constraints of one activity, from its entry under
+    activity_requirements:
+
+        "AnalyzeDailyActivity": {"cron": "55 23 * * *"},
+        "PostTweetActivity": {"time_windows": [{"start": "09:00", "end": "22:00"}]}
+
+    With "cron", the activity becomes eligible once per fire time (a fire
+    missed by more than cron_grace_seconds is skipped). With
+    "time_windows", it is only eligible inside one of the windows. Both can
+    be combined; the decorator cooldown applies on top.
+    """
+
+    def __init__(self, requirements: Dict[str, Any]):
+        cron = requirements.get("cron")
+        self.cron = CronSchedule(cron) if cron else None
+        self.cron_grace = timedelta(
+            seconds=requirements.get("cron_grace_seconds", DEFAULT_CRON_GRACE_SECONDS)
+        )
+        self.windows = [
+            TimeWindow(w["start"], w["end"], w.get("days"))
+            for w in requirements.get("time_windows", [])
+        ]
+
+    def next_allowed(
+        self, earliest: datetime, last_run: Optional[datetime], now: datetime
+    ) -> Optional[datetime]:
+        """
+        First time at or after `earliest` when the activity may run, given
+        its last run; None if the cron expression never fires again.
+        """
+        t = earliest
+        if self.cron:
+            # The first fire since the last run, unless it is too old to run
+            # late; a never-run activity may take a fire within the grace
+            oldest = now - self.cron_grace
+            fire = self.cron.next_fire(max(last_run, oldest) if last_run else oldest)
+            if fire is None:
+                return None
+            t = max(t, fire)
+        if self.windows:
+            t = min(w.next_open(t) for w in self.windows)
+        return t
+
+
+def compile_schedules(
+    activity_requirements: Dict[str, Any],
+) -> Dict[str, ActivitySchedule]:
+    """ActivitySchedule per activity that has cron or time_windows; bad entries are logged and skipped."""
+    schedules = {}
+    for name, requirements in (activity_requirements or {}).items():
+        if not isinstance(requirements, dict):
+            continue
+        if "cron" not in requirements and "time_windows" not in requirements:
+            continue
+        try:
+            schedules[name] = ActivitySchedule(requirements)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Invalid schedule for {name} in activity_requirements: {e}")
+    return schedules
@@ -1,13 +1,193 @@
+import asyncio
+import heapq
 import logging
-import random
+import math
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 
+from .activity_schedule import compile_schedules
+from .clock import SYSTEM_CLOCK
+from .selection_policy import PersonalityPolicy
+
 logger = logging.getLogger(__name__)
 
+# Energy regained per second, as in State.update() (0.1 per hour)
+ENERGY_RECOVERY_PER_SECOND = 0.1 / 3600
+
+# Longest single sleep, so a missed wake or a clock jump corrects itself
+MAX_IDLE_SECONDS = 3600
+
+# How long an activity that was due but could not be selected (e.g. its
+# instance failed to construct) waits before it is considered again
+RETRY_SECONDS = 60
+
+
+class CooldownScheduler:
+    """
+    Min-heap of (next eligible time, activity name) for the loaded
+    activities, from each class's decorator cooldown, its last run time and
+    the time the being needs to recover enough energy for it.
+
+    Run loops await wait(), which sleeps exactly until the earliest entry is
+    due, or until wake() is called because something that moves the
+    schedule changed (config, pause/resume, energy). Entries are invalidated
+    lazily: the heap may hold outdated times, and only the time recorded in
+    _due for a name counts.
+    """
+
+    def __init__(self, selector: "ActivitySelector"):
+        self.selector = selector
+        self._heap: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+        self._classes: Dict[str, Any] = {}
+        self._stale = True
+        self._wakeup = asyncio.Event()
+
+    def wake(self):
+        """Recompute the schedule and wake any waiting loop."""
+        self._stale = True
+        self._wakeup.set()
+
+    def _energy_wait(self, activity_class) -> float:
+        """Seconds until energy covers the activity's cost at the recovery rate."""
+        energy = self.selector._available_energy()
+        deficit = getattr(activity_class, "energy_cost", 0.2) - energy
+        return max(0.0, deficit / ENERGY_RECOVERY_PER_SECOND)
+
+    def _eligible_at(self, activity_class, now: float) -> float:
+        ready = now
+        name = activity_class.__name__
+        last_time = self.selector.last_activity_times.get(name)
+        current_time = self.selector.clock.now()
+        if last_time:
+            cooldown = getattr(activity_class, "cooldown", 0)
+            elapsed = (current_time - last_time).total_seconds()
+            ready = now + max(0.0, cooldown - elapsed)
+        ready = max(ready, now + self._energy_wait(activity_class))
+
+        # Cron / time-window constraints push the time to the next opening
+        schedule = self.selector.schedules.get(name)
+        if schedule is not None:
+            allowed = schedule.next_allowed(
+                current_time + timedelta(seconds=ready - now), last_time, current_time
+            )
+            if allowed is None:
+                return math.inf
+            ready = now + (allowed - current_time).total_seconds()
+        return ready
+
+    def _push(self, name: str, when: float):
+        self._due[name] = when
+        heapq.heappush(self._heap, (when, name))
+
+    def rebuild(self):
+        """Recompute every enabled activity's next eligible time."""
+        self._stale = False
+        self._heap = []
+        self._due = {}
+        self._classes = {}
+        loader = self.selector.activity_loader
+        if not loader:
+            self.selector.prune_instances({})
+            return
+        self.selector.schedules = compile_schedules(
+            self.selector.constraints.get("activity_requirements", {})
+        )
+        now = self.selector.clock.time()
+        for activity_class in loader.get_all_activities().values():
+            name = activity_class.__name__
+            if not self.selector._is_enabled(name):
+                continue
+            self._classes[name] = activity_class
+            self._due[name] = self._eligible_at(activity_class, now)
+        self._heap = [(when, name) for name, when in self._due.items()]
+        heapq.heapify(self._heap)
+        # Instances of disabled or reloaded classes are no longer needed
+        self.selector.prune_instances(self._classes)
+
+    def _top(self) -> Optional[Tuple[float, str]]:
+        if self._stale:
+            self.rebuild()
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)  # Superseded entry
+        return self._heap[0] if self._heap else None
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Seconds until the next activity is eligible (0 if one is now), or None."""
+        top = self._top()
+        if top is None:
+            return None
+        return max(0.0, top[0] - self.selector.clock.time())
+
+    def due_classes(self) -> List[Any]:
+        """Activity classes eligible now, soonest-due first."""
+        if self._top() is None:
+            return []
+        now = self.selector.clock.time()
+        # Pop the due prefix (O(k log n) rather than sorting the whole heap)
+        popped = []
+        while self._heap and self._heap[0][0] <= now:
+            popped.append(heapq.heappop(self._heap))
+        due = []
+        for when, name in popped:
+            if self._due.get(name) == when:
+                due.append(self._classes[name])
+                heapq.heappush(self._heap, (when, name))
+        return due
+
+    def mark_selected(self, name: str):
+        """Reschedule an activity that was just picked (its cooldown starts now)."""
+        activity_class = self._classes.get(name)
+        if activity_class is not None:
+            now = self.selector.clock.time()
+            self._push(name, self._eligible_at(activity_class, now))
+
+    def defer(self, name: str, seconds: float):
+        """Push a due activity back, e.g. when it could not be selected."""
+        if name in self._classes:
+            self._push(name, self.selector.clock.time() + seconds)
+
+    def upcoming(self) -> List[Tuple[str, float]]:
+        """(activity, seconds until eligible) for every scheduled activity."""
+        self._top()
+        now = self.selector.clock.time()
+        return sorted(
+            ((name, max(0.0, when - now)) for name, when in self._due.items()),
+            key=lambda item: item[1],
+        )
+
+    async def wait_for_wake(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sleep until wake() is called or the timeout passes; True if woken.
+        Wakes from before the call were raised by the caller's own loop
+        iteration and are already reflected in the (stale) schedule.
+        """
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            self._wakeup.clear()
+
+    async def wait(self, max_wait: float = MAX_IDLE_SECONDS) -> bool:
+        """
+        Sleep until the next activity is eligible (no sleep if one already
+        is), or until wake(). Returns True if woken early.
+        """
+        self._wakeup.clear()
+        delay = self.seconds_until_next()
+        if delay is None:
+            delay = max_wait
+        delay = min(delay, max_wait)
+        if delay <= 0:
+            return False
+        return await self.wait_for_wake(delay)
+
 
 class ActivitySelector:
-    def __init__(self, constraints: Dict[str, Any], state):
+    def __init__(self, constraints: Dict[str, Any], state, clock=None):
         """
         :param constraints: A dictionary that typically includes:
             {
@@ -16,32 +196,71 @@ class ActivitySelector:
               "activities_config": { "DrawActivity": {"enabled": false}, ... }
             }
         :param state: The DigitalBeing's State object, used to check mood, energy, etc.
+        :param clock: Time source (framework.clock); a VirtualClock in simulations.
         """
         self.constraints = constraints
         self.state = state
+        self.clock = clock or SYSTEM_CLOCK
+
+        # Cron / time-window rules from activity_requirements, compiled by
+        # the scheduler whenever it rebuilds
+        self.schedules: Dict[str, Any] = {}
 
         # Tracks the last time each activity class was executed
         self.last_activity_times: Dict[str, datetime] = {}
+        # (name, previous last time) of the latest selection, for cancel_selection()
+        self._last_selection: Optional[Tuple[str, Optional[datetime]]] = None
 
         # The loader is not set until set_activity_loader() is called
         self.activity_loader = None
 
+        # Long-lived activity instances, class name -> (class, instance).
+        # Only the chosen activity is ever instantiated, once per class.
+        self._instances: Dict[str, Tuple[Any, Any]] = {}
+
+        # Chooses among suitable activities; see selection_policy.py
+        self.policy = PersonalityPolicy()
+
+        # Next eligible time of each activity; run loops sleep on it
+        self.scheduler = CooldownScheduler(self)
+        if state is not None and hasattr(state, "add_energy_listener"):
+            state.add_energy_listener(self.scheduler.wake)
+
     def set_activity_loader(self, loader):
         """
         Attach an ActivityLoader instance to this ActivitySelector.
         That loader has the loaded_activities dictionary (module_name -> activity_class).
         """
         self.activity_loader = loader
+        self.scheduler.wake()
         logger.debug("Activity loader set in selector")
 
-    def select_next_activity(self):
+    def set_selection_policy(self, policy):
+        """Replace the policy used to choose among suitable activities."""
+        self.policy = policy
+        logger.info(f"Activity selection policy: {policy.name}")
+
+    def record_outcome(
+        self, activity_name: str, success: bool, duration: Optional[float] = None
+    ):
+        """Feed a finished run back to the selection policy."""
+        self.policy.record_outcome(activity_name, success, duration)
+
+    def select_next_activity(self, can_run=None):
         """
         Main entry point:
-        1. Gather all available activities (not on cooldown, not disabled).
+        1. Gather all available activity classes (not on cooldown, not disabled).
         2. Filter them by additional requirements like energy, skill requirements, etc.
         3. Use personality to pick one at random (weighted).
         4. Record the time we picked it.
-        5. Return the activity instance or None.
+        5. Return its pooled instance or None.
+
+        Only the chosen class is instantiated (on first use), so selection
+        cost does not depend on activity constructors.
+
+        can_run, if given, is a predicate on activity classes used by the
+        concurrent executor; classes it rejects are held back until the
+        scheduler is next woken (which the executor does when a slot frees).
         """
         if not self.activity_loader:
             logger.error("Activity loader not set; cannot select activity.")
@@ -57,16 +276,28 @@ class ActivitySelector:
             return None
 
         # Step 2: filter out ones that fail "energy" or "activity_requirements"
+        current_energy = self._available_energy()
         suitable_activities = []
-        for activity in available_activities:
-            activity_name = activity.__class__.__name__
-            if self._check_energy_requirements(
-                activity
-            ) and self._check_activity_requirements(activity_name):
+        for activity_class in available_activities:
+            activity_name = activity_class.__name__
+            if can_run is not None and not can_run(activity_class):
+                logger.debug(
+                    f"Activity {activity_name} is blocked by running activities."
+                )
+                self.scheduler.defer(activity_name, MAX_IDLE_SECONDS)
+                continue
+            if not self._check_energy_requirements(activity_class, current_energy):
+                # Due again once enough energy has been recovered
+                self.scheduler.defer(
+                    activity_name, self.scheduler._energy_wait(activity_class)
+                )
+            elif self._check_activity_requirements(activity_name):
                 logger.debug(f"Activity {activity_name} is suitable for execution.")
-                suitable_activities.append(activity)
+                suitable_activities.append(activity_class)
+                continue
             else:
-                logger.debug(f"Activity {activity_name} does not meet requirements.")
+                self.scheduler.defer(activity_name, RETRY_SECONDS)
+            logger.debug(f"Activity {activity_name} does not meet requirements.")
 
         if not suitable_activities:
             logger.debug("No activities suitable for current state.")
@@ -75,17 +306,120 @@ class ActivitySelector:
         # Step 3: personality-based selection
         # (If you have a "personality" dict in state, else use {}.)
         personality = self.state.get_current_state().get("personality", {})
-        selected_activity = self._select_based_on_personality(
-            suitable_activities, personality
-        )
+        while suitable_activities:
+            chosen_class = self._select_based_on_personality(
+                suitable_activities, personality
+            )
+            selected_activity = self._get_instance(chosen_class)
+            if selected_activity is None:
+                # Constructor or setup() failed; pick among the rest
+                suitable_activities.remove(chosen_class)
+                continue
 
-        if selected_activity:
-            chosen_name = selected_activity.__class__.__name__
+            chosen_name = chosen_class.__name__
             logger.debug(f"Selected activity: {chosen_name}")
             # Step 4: record the time we picked it
-            self.last_activity_times[chosen_name] = datetime.now()
+            self._last_selection = (
+                chosen_name,
+                self.last_activity_times.get(chosen_name),
+            )
+            self.last_activity_times[chosen_name] = self.clock.now()
+            self.scheduler.mark_selected(chosen_name)
+            return selected_activity
+
+        return None
 
-        return selected_activity
+    def cancel_selection(self, activity) -> bool:
+        """
+        Undo the latest select_next_activity() for an activity that could not
+        be started after all: its previous run time is restored, so no
+        cooldown starts, and it is retried once the scheduler is next woken
+        (or after RETRY_SECONDS).
+        """
+        name = activity.__class__.__name__
+        if self._last_selection is None or self._last_selection[0] != name:
+            return False
+        previous = self._last_selection[1]
+        self._last_selection = None
+        if previous is None:
+            self.last_activity_times.pop(name, None)
+        else:
+            self.last_activity_times[name] = previous
+        self.scheduler.defer(name, RETRY_SECONDS)
+        return True
+
+    def _get_instance(self, activity_class) -> Optional[Any]:
+        """
+        The pooled instance of an activity class, constructed and set up on
+        first use. A class replaced by a reload gets a fresh instance.
+        Returns None (and defers the activity) if construction fails.
+        """
+        name = activity_class.__name__
+        pooled = self._instances.get(name)
+        if pooled is not None:
+            if pooled[0] is activity_class:
+                return pooled[1]
+            self._release(name)
+
+        try:
+            instance = activity_class()
+            setup = getattr(instance, "setup", None)
+            if setup is not None:
+                setup()
+        except Exception as e:
+            logger.error(f"Failed to create instance of {name}: {e}", exc_info=True)
+            self.scheduler.defer(name, RETRY_SECONDS)
+            return None
+
+        logger.debug(f"Created instance of {name} successfully.")
+        self._instances[name] = (activity_class, instance)
+        return instance
+
+    def _release(self, name: str):
+        """Drop a pooled instance, calling its teardown() hook."""
+        _, instance = self._instances.pop(name)
+        teardown = getattr(instance, "teardown", None)
+        if teardown is None:
+            return
+        try:
+            teardown()
+        except Exception as e:
+            logger.error(f"Teardown of {name} failed: {e}")
+
+    def prune_instances(self, keep: Dict[str, Any]):
+        """Release pooled instances whose class is not in keep (name -> class)."""
+        for name, (activity_class, _) in list(self._instances.items()):
+            if keep.get(name) is not activity_class:
+                self._release(name)
+
+    def close(self):
+        """Release every pooled instance (on shutdown)."""
+        self.prune_instances({})
+
+    def export_state(self) -> Dict[str, Any]:
+        """Timing state for a checkpoint (ISO timestamps)."""
+        return {
+            "last_activity_times": {
+                name: when.isoformat()
+                for name, when in self.last_activity_times.items()
+            }
+        }
+
+    def restore_state(self, data: Dict[str, Any]):
+        """Reload timing state saved by export_state(), so cooldowns survive restarts."""
+        for name, when in data.get("last_activity_times", {}).items():
+            try:
+                restored = datetime.fromisoformat(when)
+            except (TypeError, ValueError):
+                logger.warning(f"Ignoring invalid checkpointed time for {name}: {when}")
+                continue
+            current = self.last_activity_times.get(name)
+            if current is None or restored > current:
+                self.last_activity_times[name] = restored
+        self.scheduler.wake()
+        logger.info(
+            f"Restored last run times for {len(self.last_activity_times)} activities"
+        )
 
     def get_next_available_times(self) -> List[Dict[str, Any]]:
         """
@@ -93,7 +427,7 @@ class ActivitySelector:
         This is mostly for debugging/logging: "You can next run DrawActivity in 1.5 hours", etc.
         We now use the activity's decorator-based cooldown.
         """
-        current_time = datetime.now()
+        current_time = self.clock.now()
         next_available = []
 
         all_activities = self.activity_loader.get_all_activities()
@@ -134,26 +468,23 @@ class ActivitySelector:
 
     def _get_available_activities(self) -> List[Any]:
         """
-        Return a list of *activity instances* that:
+        Return a list of *activity classes* that:
           1) Are loaded by the ActivityLoader
           2) Are "enabled" in the config
           3) Are not on cooldown (based on the activity's own decorator-based cooldown)
         Then the caller can further filter them for energy or skill requirements.
         """
         available = []
-        current_time = datetime.now()
+        current_time = self.clock.now()
 
-        all_activities = self.activity_loader.get_all_activities()
-        activities_config = self.constraints.get("activities_config", {})
-
-        for module_name, activity_class in all_activities.items():
+        # Only activities the scheduler has due are considered
+        for activity_class in self.scheduler.due_classes():
             base_name = activity_class.__name__
 
             # 1) skip if disabled
-            if base_name in activities_config:
-                if activities_config[base_name].get("enabled", True) is False:
-                    logger.debug(f"Skipping disabled activity: {base_name}")
-                    continue
+            if not self._is_enabled(base_name):
+                logger.debug(f"Skipping disabled activity: {base_name}")
+                continue
 
             # 2) check if it's on cooldown
             cooldown = getattr(activity_class, "cooldown", 0)
@@ -164,20 +495,36 @@ class ActivitySelector:
                     logger.debug(
                         f"{base_name} still on cooldown for {cooldown - time_since_last:.1f}s more."
                     )
+                    self.scheduler.defer(base_name, cooldown - time_since_last)
+                    continue
+
+            # 3) check its cron / time-window schedule
+            schedule = self.schedules.get(base_name)
+            if schedule is not None:
+                allowed = schedule.next_allowed(current_time, last_time, current_time)
+                if allowed is None or allowed > current_time:
+                    logger.debug(
+                        f"{base_name} is outside its schedule until {allowed}."
+                    )
+                    self.scheduler.defer(
+                        base_name,
+                        (allowed - current_time).total_seconds()
+                        if allowed
+                        else MAX_IDLE_SECONDS,
+                    )
                     continue
 
             # If we get here, the activity is enabled & not on cooldown
-            try:
-                instance = activity_class()
-                logger.debug(f"Created instance of {base_name} successfully.")
-                available.append(instance)
-            except Exception as e:
-                logger.error(
-                    f"Failed to create instance of {base_name}: {e}", exc_info=True
-                )
+            available.append(activity_class)
 
         return available
 
+    def _is_enabled(self, activity_name: str) -> bool:
+        activities_config = self.constraints.get("activities_config", {})
+        return (
+            activities_config.get(activity_name, {}).get("enabled", True) is not False
+        )
+
     def _check_activity_requirements(self, activity_name: str) -> bool:
         """
         Check constraints['activity_requirements'][activity_name] if you need logic
@@ -189,42 +536,39 @@ class ActivitySelector:
         logger.debug(f"Checking requirements for {activity_name}: {requirements}")
         return True
 
-    def _check_energy_requirements(self, activity) -> bool:
+    def _check_energy_requirements(
+        self, activity_class, current_energy: Optional[float] = None
+    ) -> bool:
         """
-        Check if the being has enough energy for the activity (activity.energy_cost).
+        Check if the being has enough energy for the activity class (energy_cost).
         """
-        current_energy = self.state.get_current_state().get("energy", 1.0)
-        required_energy = getattr(activity, "energy_cost", 0.2)
+        if current_energy is None:
+            current_energy = self._available_energy()
+        required_energy = getattr(activity_class, "energy_cost", 0.2)
         has_energy = current_energy >= required_energy
 
         if not has_energy:
             logger.debug(
-                f"Insufficient energy for {activity.__class__.__name__} "
+                f"Insufficient energy for {activity_class.__name__} "
                 f"(required={required_energy}, current={current_energy})."
             )
         return has_energy
 
+    def _available_energy(self) -> float:
+        """Current energy minus what running activities have reserved."""
+        if self.state is None:
+            return 1.0
+        if hasattr(self.state, "get_available_energy"):
+            return self.state.get_available_energy()
+        return self.state.get_current_state().get("energy", 1.0)
+
     def _select_based_on_personality(
         self, activities: List[Any], personality: Dict[str, float]
     ) -> Optional[Any]:
         """
-        Given a list of candidate activity instances, choose one with a weighted random approach.
+        Given a list of candidate activity classes, let the selection policy
+        choose one (weighted random by personality unless a bandit policy is set).
         """
         if not activities:
             return None
-
-        weights = []
-        for activity in activities:
-            weight = 1.0
-            if hasattr(activity, "creativity_factor"):
-                weight *= (
-                    1 + personality.get("creativity", 0.5) * activity.creativity_factor
-                )
-            if hasattr(activity, "social_factor"):
-                weight *= (
-                    1 + personality.get("friendliness", 0.5) * activity.social_factor
-                )
-            weights.append(weight)
-
-        chosen = random.choices(activities, weights=weights, k=1)[0]
-        return chosen
+        return self.policy.choose(activities, personality)
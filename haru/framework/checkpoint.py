@@ -0,0 +1,105 @@
+"""Checkpoints of runtime scheduling state for warm restarts."""
+
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class RuntimeCheckpoint:
+    """
+    Saves state that otherwise only lives in RAM (selector run times,
+    SharedData, in-flight tasks) to storage/runtime_checkpoint.json, so a
+    restarted being resumes with cooldowns intact.
+
+    Components register an export callable (run on the event loop, must
+    return JSON-serializable data that is not shared with live state) and a
+    restore callable. save() goes through the write-behind persister like
+    Memory and State, so checkpoints are coalesced and written off the loop.
+    """
+
+    def __init__(self, storage_path: str = "./storage"):
+        self.storage_path = Path(storage_path)
+        self.storage_path.mkdir(exist_ok=True)
+        self.checkpoint_file = self.storage_path / "runtime_checkpoint.json"
+        self._sections: Dict[str, Tuple[Callable[[], Any], Callable[[Any], None]]] = {}
+        self._persister = None
+
+    def register(
+        self, name: str, export: Callable[[], Any], restore: Callable[[Any], None]
+    ):
+        """Register a section of the checkpoint."""
+        self._sections[name] = (export, restore)
+
+    def attach_persister(self, persister):
+        """Route saves through a WriteBehindPersister instead of writing inline."""
+        self._persister = persister
+        persister.register("runtime", self._snapshot, self._write)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """Taken on the event loop."""
+        snapshot = {
+            "version": CHECKPOINT_VERSION,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+        }
+        for name, (export, _) in self._sections.items():
+            try:
+                snapshot[name] = export()
+            except Exception as e:
+                logger.error(f"Failed to export {name} for checkpoint: {e}")
+        return snapshot
+
+    def _write(self, snapshot: Dict[str, Any]):
+        """Atomically write a checkpoint (runs in a worker thread)."""
+        try:
+            temp_file = self.checkpoint_file.with_suffix(".json.tmp")
+            with open(temp_file, "w") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            temp_file.replace(self.checkpoint_file)
+        except Exception as e:
+            logger.error(f"Failed to write runtime checkpoint: {e}")
+
+    def save(self):
+        """
+        Checkpoint now. With a write-behind persister attached, this only
+        marks the checkpoint dirty.
+        """
+        if self._persister:
+            self._persister.mark_dirty("runtime")
+            return
+        self._write(self._snapshot())
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """The last checkpoint, or None if there is none usable."""
+        if not self.checkpoint_file.exists():
+            return None
+        try:
+            with open(self.checkpoint_file, "r") as f:
+                data = json.load(f)
+            if data.get("version") != CHECKPOINT_VERSION:
+                logger.warning("Ignoring runtime checkpoint from another version")
+                return None
+            return data
+        except Exception as e:
+            logger.error(f"Failed to load runtime checkpoint: {e}")
+            return None
+
+    def restore(self) -> bool:
+        """Hand each registered section its checkpointed data; False if there was none."""
+        data = self.load()
+        if data is None:
+            return False
+        for name, (_, restore) in self._sections.items():
+            if name not in data:
+                continue
+            try:
+                restore(data[name])
+            except Exception as e:
+                logger.error(f"Failed to restore {name} from checkpoint: {e}")
+        logger.info(f"Restored runtime checkpoint saved at {data.get('saved_at')}")
+        return True
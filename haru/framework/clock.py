@@ -0,0 +1,34 @@
+"""Clocks for the activity loop: the system clock, or a virtual one for simulation."""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class SystemClock:
+    """Wall-clock time (the default everywhere)."""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def time(self) -> float:
+        return self.now().timestamp()
+
+
+class VirtualClock(SystemClock):
+    """
+    A clock that only moves when advance() is called, so the selector,
+    cooldowns and energy regeneration can be fast-forwarded over days.
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        self._now = start or datetime.now()
+
+    def now(self) -> datetime:
+        return self._now
+
+    def advance(self, seconds: float):
+        if seconds > 0:
+            self._now += timedelta(seconds=seconds)
+
+
+SYSTEM_CLOCK = SystemClock()
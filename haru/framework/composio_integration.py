@@ -17,6 +17,7 @@ from typing import Dict, Any, List
 
 import requests  # Used for the direct Composio API call
 
+from .deadline import remaining_time
 from .secret_storage import secret_manager
 from composio_openai import ComposioToolSet
 
@@ -265,7 +266,9 @@ class ComposioManager:
         params = {"apps": app_name.lower()}  # Composio expects lowercased
 
         try:
-            resp = requests.get(base_url, headers=headers, params=params, timeout=10)
+            resp = requests.get(
+                base_url, headers=headers, params=params, timeout=remaining_time(10)
+            )
             if resp.status_code == 200:
                 data_json = resp.json()
                 items = data_json.get("items", [])
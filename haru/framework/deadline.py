@@ -0,0 +1,47 @@
+"""The deadline of the running activity, visible to the skills it calls."""
+
+import contextlib
+import time
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# time.monotonic() deadline of the current activity, or None if unbounded.
+# Context variables follow asyncio tasks and asyncio.to_thread() calls, so
+# skills see the deadline of the activity that (indirectly) called them.
+_deadline: ContextVar[Optional[float]] = ContextVar("activity_deadline", default=None)
+
+# Never hand out a network timeout shorter than this, even past the deadline;
+# the activity is cancelled at the deadline anyway
+MIN_TIMEOUT = 1.0
+
+
+@contextlib.contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Run the enclosed code under a deadline `seconds` from now (None = none)."""
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    # A nested scope can only tighten the deadline
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left before the current activity's deadline, capped at default.
+    Skills use it to size their own network timeouts:
+
+        requests.get(url, timeout=remaining_time(10))
+
+    Returns default when no deadline is set.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    remaining = max(MIN_TIMEOUT, deadline - time.monotonic())
+    return remaining if default is None else min(default, remaining)
@@ -0,0 +1,124 @@
+"""Concurrent activity execution with an energy budget and per-skill limits."""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrentExecutor:
+    """
+    Runs several activities at once, so a long I/O wait in one activity
+    (e.g. polling an image generation job) does not hold back the others.
+
+    fill() starts activities until a limit is reached:
+      - max_concurrent activities in flight in total;
+      - each activity class at most once at a time (instances are pooled);
+      - at most skill_concurrency[skill] running activities that require a
+        given skill, or default_skill_concurrency for skills not listed
+        (None = unlimited);
+      - the activity's energy_cost, reserved from State up front, must fit
+        in the energy not already reserved by running activities.
+
+    Each activity runs through DigitalBeing.execute_activity(), so its
+    result is stored in Memory as soon as it completes. On completion the
+    reservation and skill slots are released and the selector's scheduler
+    is woken, so the run loop refills the freed slot.
+    """
+
+    def __init__(self, being, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.being = being
+        self.enabled = config.get("mode", "sequential") == "concurrent"
+        self.max_concurrent = max(1, config.get("max_concurrent", 4))
+        self.skill_concurrency: Dict[str, int] = dict(
+            config.get("skill_concurrency", {})
+        )
+        self.default_skill_concurrency: Optional[int] = config.get(
+            "default_skill_concurrency"
+        )
+        self.running: Dict[str, asyncio.Task] = {}
+        self._skills_in_use: Counter = Counter()
+
+    def _skill_limit(self, skill: str) -> Optional[int]:
+        return self.skill_concurrency.get(skill, self.default_skill_concurrency)
+
+    def can_run(self, activity_class) -> bool:
+        """Whether an activity class fits the current concurrency limits."""
+        if activity_class.__name__ in self.running:
+            return False
+        if len(self.running) >= self.max_concurrent:
+            return False
+        for skill in getattr(activity_class, "required_skills", None) or []:
+            limit = self._skill_limit(skill)
+            if limit is not None and self._skills_in_use[skill] >= limit:
+                return False
+        return True
+
+    def fill(
+        self,
+        on_complete: Optional[Callable[[Any, Any], Awaitable[None]]] = None,
+    ) -> List[Any]:
+        """
+        Start as many selected activities as the limits allow; returns the
+        activities started. on_complete(activity, result) is awaited after
+        each one finishes.
+        """
+        started = []
+        selector = self.being.activity_selector
+        while len(self.running) < self.max_concurrent:
+            activity = selector.select_next_activity(can_run=self.can_run)
+            if activity is None:
+                break
+
+            name = activity.__class__.__name__
+            energy_cost = getattr(activity, "energy_cost", 0.2)
+            if not self.being.state.reserve_energy(energy_cost):
+                logger.debug(f"Could not reserve energy for {name}")
+                # It did not run, so it must not go on cooldown
+                selector.cancel_selection(activity)
+                break
+
+            skills = list(getattr(activity, "required_skills", None) or [])
+            self._skills_in_use.update(skills)
+            logger.info(f"Starting activity {name} ({len(self.running) + 1} running)")
+            self.running[name] = asyncio.create_task(
+                self._run(activity, energy_cost, skills, on_complete)
+            )
+            started.append(activity)
+        return started
+
+    async def _run(self, activity, energy_cost: float, skills: List[str], on_complete):
+        name = activity.__class__.__name__
+        result = None
+        try:
+            result = await self.being.execute_activity(activity)
+        finally:
+            self.running.pop(name, None)
+            self._skills_in_use.subtract(skills)
+            self._skills_in_use += Counter()  # Drop counts that reached zero
+            self.being.state.release_energy(energy_cost)
+            self.being.activity_selector.scheduler.wake()
+
+        if on_complete is not None:
+            try:
+                await on_complete(activity, result)
+            except Exception as e:
+                logger.error(f"Completion callback for {name} failed: {e}")
+        return result
+
+    async def wait_all(self):
+        """Wait for every running activity to finish."""
+        if self.running:
+            await asyncio.gather(*self.running.values(), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "concurrent" if self.enabled else "sequential",
+            "running": sorted(self.running),
+            "max_concurrent": self.max_concurrent,
+            "skills_in_use": dict(self._skills_in_use),
+            "reserved_energy": self.being.state.get_reserved_energy(),
+        }
@@ -3,18 +3,34 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
 import asyncio
+import time
 from datetime import datetime
 
-from .memory import Memory
+from .memory import create_memory
 from .state import State
 from .activity_selector import ActivitySelector
 from .activity_loader import ActivityLoader
 from .shared_data import SharedData
 from .activity_decorator import ActivityResult
+from .persistence import WriteBehindPersister
+from .checkpoint import RuntimeCheckpoint
+from .executor import ConcurrentExecutor
+from .selection_policy import create_selection_policy
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The first being initialized in this process (the server's). Activities and
+# skills reach memory and configs through it instead of loading their own.
+_current_being: Optional["DigitalBeing"] = None
+
+
+def get_current_being() -> "DigitalBeing":
+    """The running being; outside the server (e.g. scripts) one is created and initialized."""
+    if _current_being is None:
+        DigitalBeing().initialize()
+    return _current_being
+
 
 class DigitalBeing:
     def __init__(self, config_path: Optional[str] = None):
@@ -23,13 +39,52 @@ class DigitalBeing:
             config_path = str(Path(__file__).parent.parent / "config")
         self.config_path = Path(config_path)
         self.configs = self._load_configs()
-        self.shared_data = SharedData()
-        self.memory = Memory()
+        self.shared_data = SharedData(
+            self.configs.get("activity_constraints", {}).get("shared_data_config", {})
+        )
+        memory_config = self.configs.get("activity_constraints", {}).get(
+            "memory_config", {}
+        )
+        self.memory = create_memory(memory_config)
         self.state = State()
+        # Memory and State saves are coalesced and written off the event loop
+        # once start_persistence() runs inside the loop
+        self.persister = WriteBehindPersister(
+            flush_interval_ms=memory_config.get("flush_interval_ms", 500)
+        )
+        self.memory.attach_persister(self.persister)
+        self.state.attach_persister(self.persister)
         self.activity_loader = ActivityLoader()
         self.activity_selector = ActivitySelector(
             self.configs.get("activity_constraints", {}), self.state
         )
+        # Runs several activities at once when execution_config.mode is "concurrent"
+        self.executor = ConcurrentExecutor(
+            self,
+            self.configs.get("activity_constraints", {}).get("execution_config", {}),
+        )
+        # Selector run times, SharedData and in-flight tasks survive restarts
+        self.checkpoint = RuntimeCheckpoint()
+        self._interrupted_tasks = []
+        self.checkpoint.attach_persister(self.persister)
+        self.checkpoint.register(
+            "selector",
+            self.activity_selector.export_state,
+            self.activity_selector.restore_state,
+        )
+        self.checkpoint.register(
+            "shared_data", self.shared_data.export_state, self.shared_data.restore_state
+        )
+        self.checkpoint.register(
+            "selection_policy",
+            lambda: self.activity_selector.policy.export_state(),
+            lambda data: self.activity_selector.policy.restore_state(data),
+        )
+        self.checkpoint.register(
+            "active_tasks",
+            lambda: list(self.state.current_state.get("active_tasks", [])),
+            self._restore_active_tasks,
+        )
 
     def _load_configs(self) -> Dict[str, Any]:
         """Load all configuration files."""
@@ -86,12 +141,65 @@ class DigitalBeing:
         # Load activities
         self.activity_loader.load_activities()
         self.shared_data.initialize()
+        self.shared_data.set_policies(
+            self.configs.get("activity_constraints", {}).get("shared_data_config", {})
+        )
+        # Activities look memory up here rather than constructing a being
+        self.shared_data.set("system", "memory_ref", self.memory)
 
         # Set loader in selector
         self.activity_selector.set_activity_loader(self.activity_loader)
+        # Bandit policies start from the outcomes already in memory
+        self.activity_selector.set_selection_policy(
+            create_selection_policy(
+                self.configs.get("activity_constraints", {}).get("selection_config", {}),
+                self.memory,
+            )
+        )
+
+        # Resume cooldowns and shared data from before the last shutdown
+        self.checkpoint.restore()
+
+        global _current_being
+        if _current_being is None:
+            _current_being = self
 
         logger.info("Digital being initialization complete")
 
+    def _restore_active_tasks(self, tasks):
+        self._interrupted_tasks = list(tasks)
+
+    def _record_interrupted_tasks(self):
+        """
+        Activities that were still running when the process stopped cannot be
+        resumed; record each as an interrupted run and clear it.
+        """
+        interrupted = dict.fromkeys(
+            self._interrupted_tasks + self.state.current_state.get("active_tasks", [])
+        )
+        self._interrupted_tasks = []
+        for task_id in interrupted:
+            logger.warning(f"Activity {task_id} was interrupted by a restart")
+            self.memory.store_activity_result(
+                {
+                    "activity_type": task_id,
+                    "result": ActivityResult(
+                        success=False, error="Interrupted by restart"
+                    ).to_dict(),
+                }
+            )
+            self.state.remove_active_task(task_id)
+
+    def start_persistence(self):
+        """
+        Start the write-behind flush task (requires a running event loop).
+        Only the being that runs activities calls this, so it is also where
+        runs cut short by the previous shutdown are settled; temporary
+        beings created by activities leave them alone.
+        """
+        self._record_interrupted_tasks()
+        self.persister.start()
+
     def is_configured(self) -> bool:
         """
         Check if being is 'configured'.
@@ -106,16 +214,30 @@ class DigitalBeing:
         (but keep looping so the server can remain up).
         """
         logger.info("Starting digital being main loop...")
+        self.start_persistence()
 
         try:
             while True:
                 # If not configured, skip picking an activity
                 if not self.is_configured():
                     logger.warning("Digital Being NOT configured. Skipping activity execution.")
-                    await asyncio.sleep(60)  # Changed to 60 seconds
+                    await self.activity_selector.scheduler.wait_for_wake(60)
+                    continue
+
+                if self.executor.enabled:
+                    started = self.executor.fill()
+                    self.checkpoint.save()
+                    self.state.update()
+                    self.memory.persist()
+                    logger.info(
+                        f"Cycle summary: started {len(started)} activities, "
+                        f"{len(self.executor.running)} running"
+                    )
+                    await self.activity_selector.scheduler.wait()
                     continue
 
                 current_activity = self.activity_selector.select_next_activity()
+                self.checkpoint.save()
                 activity_summary = "No activity selected"
                 
                 if current_activity:
@@ -135,8 +257,8 @@ class DigitalBeing:
                 # Log a summary of this cycle's actions
                 logger.info(f"Cycle summary: {activity_summary}")
                 
-                # Sleep for 60 seconds before the next cycle
-                await asyncio.sleep(60)
+                # Sleep until the next activity comes off cooldown
+                await self.activity_selector.scheduler.wait()
 
         except KeyboardInterrupt:
             logger.info("Shutting down digital being...")
@@ -144,6 +266,8 @@ class DigitalBeing:
 
     async def execute_activity(self, activity) -> ActivityResult:
         """Execute a selected activity."""
+        start_time = time.monotonic()
+        self.state.add_active_task(activity.__class__.__name__)
         try:
             logger.debug(
                 f"Starting execution of activity: {activity.__class__.__name__}"
@@ -165,8 +289,13 @@ class DigitalBeing:
                 "timestamp": datetime.now().isoformat(),
                 "activity_type": activity.__class__.__name__,
                 "result": result.to_dict(),
+                "duration": time.monotonic() - start_time,
+                "energy_cost": getattr(activity, "energy_cost", None),
             }
             self.memory.store_activity_result(activity_record)
+            self.activity_selector.record_outcome(
+                activity.__class__.__name__, result.success, activity_record["duration"]
+            )
 
             if result.success:
                 logger.debug(f"Successfully executed: {activity.__class__.__name__}")
@@ -183,20 +312,33 @@ class DigitalBeing:
             logger.error(error_msg)
 
             error_result = ActivityResult(success=False, error=str(e))
+            duration = time.monotonic() - start_time
             self.memory.store_activity_result(
                 {
                     "timestamp": datetime.now().isoformat(),
                     "activity_type": activity.__class__.__name__,
                     "result": error_result.to_dict(),
+                    "duration": duration,
+                    "energy_cost": getattr(activity, "energy_cost", None),
                 }
             )
+            self.activity_selector.record_outcome(
+                activity.__class__.__name__, False, duration
+            )
 
             return error_result
 
+        finally:
+            self.state.remove_active_task(activity.__class__.__name__)
+            self.checkpoint.save()
+
     def cleanup(self):
         """Cleanup resources before shutdown."""
-        self.memory.persist()
+        self.activity_selector.close()
+        self.memory.close()
         self.state.save()
+        self.checkpoint.save()
+        self.persister.stop()
         logger.info("Cleanup completed")
 
 
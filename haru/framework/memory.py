@@ -1,44 +1,275 @@
 """Memory management system for storing and retrieving activity history."""
 
+import base64
+import heapq
 import json
 import logging
+import threading
+from bisect import bisect_left, insort
+from collections import deque
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any
-from datetime import datetime, timezone
+from typing import Deque, Dict, Iterator, List, Any, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
+
+from .memory_archive import MemoryArchive
+from .memory_blobs import BlobStore
+from .memory_entry import ARTIFACT_KINDS, MemoryEntry, entry_to_json
+from .memory_export import read_records, record_id, write_records
+from .memory_index import (
+    InvertedIndex,
+    append_index_log,
+    entry_text,
+    index_document,
+    read_index_log_tail,
+    reset_index_log,
+    write_index,
+)
+from .memory_rollups import RESOLUTIONS, MemoryRollups
+from .memory_journal import MemoryJournal
+from .memory_segments import LongTermStore
+from .memory_stats import MemoryStats
+from .memory_vectors import HashingEmbedder, VectorStore
 
 logger = logging.getLogger(__name__)
 
+STORAGE_MODES = ("json", "wal")
+
+# Number of most recent activities kept in short-term memory
+SHORT_TERM_CAPACITY = 100
+
+# Entries indexed between appends to the search index log. Below the
+# short-term capacity, so after a crash the unsaved tail is re-indexed from
+# short-term memory instead of rebuilding the index from all history.
+INDEX_SAVE_INTERVAL = 50
+
+# The index log is folded into the gzipped base once it holds this many
+# entries and at least as many as the base, so each entry is rewritten
+# O(1) times on average
+INDEX_COMPACT_MIN_ENTRIES = 1000
+
+# Long-term appends per activity type between retention checks
+RETENTION_CHECK_INTERVAL = 100
+
+# Records imported between checkpoints of an NDJSON import
+IMPORT_BATCH_SIZE = 5000
+
+# Version of the memory.json layout. Files without one were written before
+# every entry carried a unique seq and are renumbered once on load.
+MEMORY_FORMAT_VERSION = 2
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(timestamp_str: str) -> str:
+    """Format ISO timestamp to human-readable format (cached per timestamp)."""
+    try:
+        dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+        return dt.strftime("%Y-%m-%d %H:%M:%S %Z")
+    except Exception:
+        return timestamp_str
+
+
+def encode_cursor(timestamp: str, seq: int) -> str:
+    """Opaque history cursor for the position of one entry."""
+    payload = json.dumps([timestamp, seq], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of encode_cursor(); raises ValueError for a malformed cursor."""
+    try:
+        timestamp, seq = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid history cursor: {cursor!r}") from e
+    if not isinstance(timestamp, str) or not isinstance(seq, int):
+        raise ValueError(f"Invalid history cursor: {cursor!r}")  # noqa: TRY004
+    return timestamp, seq
+
 
 class Memory:
-    def __init__(self, storage_path: str = "./storage"):
+    def __init__(
+        self,
+        storage_path: str = "./storage",
+        storage_mode: str = "json",
+        compaction_threshold: int = 1000,
+        max_resident_segments: int = 8,
+        retention: Optional[Dict[str, Dict[str, Any]]] = None,
+        archive_compression: str = "gzip",
+        embedding_dim: int = 256,
+        blob_threshold: int = 1024,
+        rollup_hourly_days: int = 90,
+    ):
+        """
+        :param storage_path: Directory holding memory.json (and the journal in WAL mode).
+        :param storage_mode: "json" rewrites memory.json on every store,
+            "wal" appends each record to memory.wal.jsonl and periodically
+            compacts the journal into memory.json in a background thread.
+        :param compaction_threshold: Journal records to accumulate before compacting.
+        :param max_resident_segments: Long-term activity-type segments kept in RAM.
+        :param retention: Per-activity-type limits for long-term memory, e.g.
+            {"default": {"max_entries": 5000}, "DrawActivity": {"max_age_days": 30}}.
+            Supported keys: max_entries, max_bytes, max_age_days. Entries past
+            a limit are moved to compressed archives under storage/archive/.
+        :param archive_compression: "gzip" or "zstd" (needs the zstandard package).
+        :param embedding_dim: Size of the hashed n-gram vectors used by recall().
+        :param blob_threshold: data/metadata fields larger than this many bytes
+            are stored once in storage/blobs/ and referenced from the entry
+            (0 disables this).
+        :param rollup_hourly_days: How long hourly rollup buckets are kept
+            (daily buckets are kept indefinitely).
+        """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(exist_ok=True)
-        self.short_term_memory: List[Dict[str, Any]] = []
-        self.long_term_memory: Dict[str, Any] = {}
+        # Entries are appended in time order, newest last
+        self.short_term_memory: Deque[MemoryEntry] = deque()
+        # Long-term memory lives in per-activity-type segment files that are
+        # only read when asked for
+        self.long_term_memory = LongTermStore(
+            self.storage_path / "long_term", max_resident=max_resident_segments
+        )
         self.memory_file = self.storage_path / "memory.json"
+        self.stats = MemoryStats()
+        self.rollups = MemoryRollups(rollup_hourly_days)
+        self.retention = retention or {}
+        self.archive = MemoryArchive(
+            self.storage_path / "archive", compression=archive_compression
+        )
+        self._appends_since_retention: Dict[str, int] = {}
+        # Full-text index over every entry, including archived ones. On disk
+        # it is a gzipped base plus a log of the entries indexed since.
+        self.index = InvertedIndex()
+        self.index_file = self.storage_path / "memory_index.json.gz"
+        self.index_log_file = self.storage_path / "memory_index.log.jsonl"
+        self._index_unsaved = 0
+        self._index_pending: List[List[Any]] = []
+        self._index_logged_seq = 0
+        self._index_base_entries = 0
+        self._index_log_entries = 0
+        self._index_loaded = False
+        self._index_needs_rebuild = False
+        # Large payload fields, deduplicated by content hash
+        self.blobs = BlobStore(self.storage_path / "blobs")
+        self.blob_threshold = blob_threshold
+        # One embedding per entry for semantic recall
+        self.embedder = HashingEmbedder(embedding_dim)
+        self.vectors = VectorStore(self.storage_path / "vectors", dim=embedding_dim)
+        self._vectors_need_rebuild = False
+
+        if storage_mode not in STORAGE_MODES:
+            logger.warning(
+                f"Unknown memory storage mode '{storage_mode}', using 'json'"
+            )
+            storage_mode = "json"
+        self.storage_mode = storage_mode
+        self.compaction_threshold = compaction_threshold
+        self._last_seq = 0
+        self._journal: Optional[MemoryJournal] = None
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._compacted_seq = 0
+        self._write_lock = threading.RLock()
+        self._persister = None
+        self._index_stale = False
+        if storage_mode == "wal":
+            self._journal = MemoryJournal(self.storage_path / "memory.wal.jsonl")
+
         self.initialize()
 
     def initialize(self):
         """Initialize memory system."""
         self._load_memory()
 
+    def attach_persister(self, persister):
+        """Route saves through a WriteBehindPersister instead of writing inline."""
+        self._persister = persister
+        persister.register(
+            "memory", self._persistence_snapshot, self._persistence_write
+        )
+        persister.register(
+            "memory_index", self._index_log_snapshot, self._write_index_log
+        )
+
+    def _persistence_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Taken on the event loop; WAL mode only needs one when compaction is due."""
+        if self._journal:
+            if self._journal.record_count >= self.compaction_threshold:
+                return self._snapshot_data()
+            return None
+        return self._snapshot_data()
+
+    def _persistence_write(self, snapshot: Optional[Dict[str, Any]]):
+        """Runs in a worker thread."""
+        if self._journal:
+            self._journal.sync()
+            if snapshot is not None:
+                self._run_compaction(snapshot)
+        else:
+            self._write_snapshot(snapshot)
+
     def _load_memory(self):
-        """Load memory from persistent storage."""
+        """Load memory from persistent storage, then replay any journaled records."""
+        self._last_seq = 0
+        self.stats = MemoryStats()
+        self.rollups = MemoryRollups(self.rollups.hourly_retention_days)
+        self.long_term_memory.open()
+        needs_seqs = False
         try:
             if self.memory_file.exists():
                 with open(self.memory_file, "r") as f:
                     try:
                         data = json.load(f)
                         if isinstance(data, dict):
-                            self.long_term_memory = data.get("long_term", {})
-                            self.short_term_memory = data.get("short_term", [])
+                            needs_seqs = (
+                                data.get("format_version", 1) < MEMORY_FORMAT_VERSION
+                            )
+                            # Files written before segments existed embed the
+                            # whole long-term dict; move it out once
+                            legacy_long_term = data.get("long_term", {})
+                            for activities in legacy_long_term.values():
+                                for entry in activities:
+                                    self.long_term_memory.append(entry)
+                            # Restore the time-ordering invariant once at load
+                            self.short_term_memory = deque(
+                                sorted(
+                                    map(
+                                        MemoryEntry.from_dict,
+                                        data.get("short_term", []),
+                                    ),
+                                    key=lambda x: x.timestamp,
+                                )
+                            )
+                            self._consolidate_memory()
+                            self._last_seq = data.get("last_seq", 0)
+                            if "stats" in data:
+                                self.stats = MemoryStats.from_dict(data["stats"])
+                            else:
+                                self.stats.rebuild(self._iter_entries())
+                            if "rollups" in data:
+                                self.rollups = MemoryRollups.from_dict(
+                                    data["rollups"], self.rollups.hourly_retention_days
+                                )
+                            else:
+                                self.rollups.rebuild(
+                                    self._iter_entries(include_archive=True)
+                                )
+                            if legacy_long_term:
+                                logger.info(
+                                    "Migrated long-term memory to segment files"
+                                )
+                                # Stays at the old format version until the
+                                # entries have been given seqs below
+                                snapshot = self._snapshot_data()
+                                snapshot["format_version"] = data.get(
+                                    "format_version", 1
+                                )
+                                self._write_snapshot(snapshot)
                         else:
                             logger.warning(
                                 "Invalid memory file format, resetting memory"
                             )
-                            self.long_term_memory = {}
-                            self.short_term_memory = []
-                            self.persist()  # Reset the file with proper format
+                            self.short_term_memory = deque()
+                            # Reset the file with proper format
+                            self._write_snapshot(self._snapshot_data())
                     except json.JSONDecodeError as je:
                         logger.error(f"Failed to parse memory file: {je}")
                         # Backup corrupted file
@@ -46,13 +277,225 @@ class Memory:
                         self.memory_file.rename(backup_path)
                         logger.info(f"Backed up corrupted memory file to {backup_path}")
                         # Reset memory
-                        self.long_term_memory = {}
-                        self.short_term_memory = []
-                        self.persist()  # Create new file with proper format
+                        self.short_term_memory = deque()
+                        # Create new file with proper format
+                        self._write_snapshot(self._snapshot_data())
         except Exception as e:
             logger.error(f"Failed to load memory: {e}")
-            self.long_term_memory = {}
-            self.short_term_memory = []
+            self.short_term_memory = deque()
+
+        if self._journal:
+            self._replay_journal()
+
+        if needs_seqs:
+            try:
+                self._assign_seqs()
+            except Exception as e:
+                logger.error(f"Failed to assign memory entry seqs: {e}")
+
+        self._open_index()
+        self._open_vectors()
+
+    def _replay_journal(self):
+        """Re-apply journaled records newer than the snapshot (crash recovery)."""
+        try:
+            replayed = 0
+            for record in self._journal.replay(after_seq=self._last_seq):
+                record = MemoryEntry.from_dict(record)
+                self.short_term_memory.append(record)
+                self._consolidate_memory()
+                self.stats.record(record)
+                self.rollups.record(record)
+                self._last_seq = max(self._last_seq, record.get("seq", 0))
+                replayed += 1
+            if replayed:
+                logger.info(f"Replayed {replayed} memory records from journal")
+        except Exception as e:
+            logger.error(f"Failed to replay memory journal: {e}")
+
+    def _assign_seqs(self):
+        """
+        Give every entry (archived, long-term and short-term) a fresh seq in
+        time order, above any seq already in use, and write the result back.
+
+        Entries from files written before entries carried a seq all read as
+        seq 0, so every lookup by seq would land on the same entry.
+        Renumbering all entries, rather than only those without a seq, keeps
+        each segment sorted by seq. The saved index and embeddings refer to
+        the old seqs and are rebuilt.
+        """
+        streams: List[Tuple[str, Optional[str]]] = [
+            ("archive", activity_type)
+            for activity_type in self.archive.activity_types()
+        ]
+        streams.extend(
+            ("long_term", activity_type)
+            for activity_type in self.long_term_memory.types()
+        )
+        streams.append(("short_term", None))
+
+        def read(stream: Tuple[str, Optional[str]]) -> Iterator[Dict[str, Any]]:
+            source, activity_type = stream
+            if source == "archive":
+                return self.archive.read(activity_type)
+            if source == "long_term":
+                return self.long_term_memory.iter_type(activity_type)
+            return iter(list(self.short_term_memory))
+
+        def keyed(index: int):
+            for entry in read(streams[index]):
+                yield (entry.get("timestamp", ""), entry.get("seq", 0)), index
+
+        # First pass: each entry's position in the merged history, per stream
+        positions: List[List[int]] = [[] for _ in streams]
+        floor = self._last_seq
+        merged = heapq.merge(*(keyed(index) for index in range(len(streams))))
+        for position, ((_, seq), index) in enumerate(merged):
+            positions[index].append(position)
+            floor = max(floor, seq)
+
+        # Second pass: rewrite each stream with its new seqs
+        for stream, stream_positions in zip(streams, positions):
+            source, activity_type = stream
+            if source == "short_term":
+                entries = list(self.short_term_memory)
+            else:
+                entries = [MemoryEntry.from_dict(entry) for entry in read(stream)]
+            for entry, position in zip(entries, stream_positions):
+                entry["seq"] = floor + position + 1
+            if source == "archive":
+                self.archive.rewrite(activity_type, entries)
+            elif source == "long_term":
+                self.long_term_memory.rewrite(activity_type, entries)
+
+        self._last_seq = floor + sum(map(len, positions))
+        self._clear_index()
+        self.vectors.clear()
+        self._checkpoint()
+        logger.info(f"Assigned seqs to {sum(map(len, positions))} memory entries")
+
+    def _short_term_floor(self) -> int:
+        """Highest seq older than all of short-term memory."""
+        if self.short_term_memory:
+            return self.short_term_memory[0].get("seq", 0) - 1
+        return self._last_seq
+
+    def _open_index(self):
+        """
+        Check the saved search index from the header and tail of its log and
+        queue the short-term entries stored since it was written. The index
+        itself is read on first use (see _ensure_index), so startup does not
+        depend on how much history there is. If it is missing or older than
+        short-term memory reaches back (e.g. after a crash), it is rebuilt
+        from all history on first use instead.
+        """
+        self.index.clear()
+        self._index_loaded = False
+        self._index_pending = []
+        self._index_unsaved = 0
+        self._index_log_entries = 0
+        tail = read_index_log_tail(self.index_log_file)
+        if tail is None and self._short_term_floor() == 0:
+            # Nothing saved, but short-term memory holds all of history
+            self._clear_index()
+            tail = (0, 0)
+        if tail is None or not (self._short_term_floor() <= tail[0] <= self._last_seq):
+            self._index_needs_rebuild = True
+            return
+
+        self._index_needs_rebuild = False
+        self._index_logged_seq, self._index_base_entries = tail
+        for entry in self.short_term_memory:
+            if entry.get("seq", 0) > self._index_logged_seq:
+                self._index_entry(self._resolve_payloads(entry))
+
+    def _ensure_index(self):
+        """Load the saved search index (base and log), or rebuild it, on first use."""
+        if self._index_loaded:
+            return
+        with self._write_lock:
+            self._index_loaded = True
+            if not self._index_needs_rebuild:
+                log_entries = None
+                if self.index.load(self.index_file):
+                    self._index_base_entries = len(self.index)
+                    log_entries = self.index.load_log(self.index_log_file)
+                if log_entries is not None:
+                    self._index_log_entries = log_entries
+                    for document in self._index_pending:
+                        if document[0] > self.index.max_seq:
+                            self.index.add_document(document)
+                    return
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        try:
+            self.index.rebuild(
+                map(self._resolve_payloads, self._iter_entries(include_archive=True))
+            )
+            logger.info(f"Rebuilt memory search index ({len(self.index)} entries)")
+            self._index_needs_rebuild = False
+            self.compact_index()
+        except Exception as e:
+            logger.error(f"Failed to rebuild memory search index: {e}")
+
+    def _open_vectors(self):
+        """
+        Map the stored embeddings and catch them up from short-term memory.
+        If they are missing or stale, the rebuild from all history waits
+        until recall() first needs them.
+        """
+        if not self.vectors.open():
+            self.vectors.clear()
+        if self._short_term_floor() <= self.vectors.max_seq <= self._last_seq:
+            self._vectors_need_rebuild = False
+            for entry in self.short_term_memory:
+                if entry.get("seq", 0) > self.vectors.max_seq:
+                    self._embed_entry(self._resolve_payloads(entry))
+            return
+        self.vectors.reset()
+        self._vectors_need_rebuild = True
+
+    def _ensure_vectors(self):
+        """Rebuild the embeddings from all history if they were stale at startup."""
+        if not self._vectors_need_rebuild:
+            return
+        self._vectors_need_rebuild = False
+        try:
+            self.vectors.clear()
+            batch: List[Dict[str, Any]] = []
+            for entry in self._iter_entries(include_archive=True):
+                batch.append(self._resolve_payloads(entry))
+                if len(batch) >= 1000:
+                    self._embed_entries(batch)
+                    batch = []
+            if batch:
+                self._embed_entries(batch)
+            self.vectors.flush()
+            logger.info(f"Rebuilt memory embeddings ({len(self.vectors)} entries)")
+        except Exception as e:
+            logger.error(f"Failed to rebuild memory embeddings: {e}")
+
+    def _embedding_text(self, entry: Dict[str, Any]) -> str:
+        return f"{entry.get('activity_type', '')} {entry_text(entry)}"
+
+    def _embed_entry(self, entry: Dict[str, Any]):
+        if self._vectors_need_rebuild:
+            return  # Covered by the rebuild
+        self.vectors.add(
+            entry.get("seq", 0),
+            entry.get("activity_type", "Unknown"),
+            self.embedder.embed(self._embedding_text(entry)),
+        )
+
+    def _embed_entries(self, entries: List[Dict[str, Any]]):
+        if self._vectors_need_rebuild:
+            return  # Covered by the rebuild
+        self.vectors.add_batch(
+            [entry.get("seq", 0) for entry in entries],
+            [entry.get("activity_type", "Unknown") for entry in entries],
+            self.embedder.embed_batch(self._embedding_text(e) for e in entries),
+        )
 
     def store_activity_result(self, activity_record: Dict[str, Any]):
         """Store the result of an activity in memory."""
@@ -66,17 +509,17 @@ class Memory:
             result = activity_record.get("result", {})
             if isinstance(result, dict):
                 # Store standardized activity record with UTC timestamp
-                memory_entry = {
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "activity_type": activity_record.get("activity_type", "Unknown"),
-                    "success": result.get("success", False),
-                    "error": result.get("error"),
-                    "data": result.get("data"),
-                    "metadata": result.get("metadata", {}),
-                }
-                self.short_term_memory.append(memory_entry)
-                self._consolidate_memory()
-                self.persist()  # Persist after each update
+                memory_entry = MemoryEntry(
+                    timestamp=datetime.now(timezone.utc).isoformat(),
+                    activity_type=activity_record.get("activity_type", "Unknown"),
+                    success=result.get("success", False),
+                    error=result.get("error"),
+                    data=result.get("data"),
+                    metadata=result.get("metadata", {}),
+                    duration=activity_record.get("duration"),
+                    energy=activity_record.get("energy_cost"),
+                )
+                self._append_entry(memory_entry)
                 logger.info(
                     f"Stored activity result for {memory_entry['activity_type']}"
                 )
@@ -86,96 +529,802 @@ class Memory:
         except Exception as e:
             logger.error(f"Failed to store activity result: {e}")
 
+    def _append_entry(self, memory_entry: MemoryEntry):
+        """Assign the next seq to a new entry, add it and persist it."""
+        self._last_seq += 1
+        memory_entry["seq"] = self._last_seq
+        self.stats.record(memory_entry)
+        self.rollups.record(memory_entry)
+        self._index_entry(memory_entry)
+        if self._index_unsaved >= INDEX_SAVE_INTERVAL:
+            self.save_index()
+        self._embed_entry(memory_entry)
+        # Only references to large payloads stay in the hot record
+        self._externalize_payloads(memory_entry)
+        self.short_term_memory.append(memory_entry)
+        self._consolidate_memory()
+        if self._journal:
+            self._journal.append(memory_entry)
+            if self._journal.record_count >= self.compaction_threshold:
+                self.compact()
+        else:
+            self.persist()  # Persist after each update
+
+    def _index_entry(self, entry: Dict[str, Any]):
+        """Add an entry to the search index (once loaded) and queue it for the index log."""
+        if self._index_needs_rebuild:
+            return  # Covered by the rebuild
+        document = index_document(entry)
+        if self._index_loaded:
+            self.index.add_document(document)
+        self._index_pending.append(document)
+        self._index_unsaved += 1
+
+    def _externalize_payloads(self, memory_entry: MemoryEntry):
+        """Move large data/metadata fields into the blob store, in place."""
+        if self.blob_threshold <= 0:
+            return
+        try:
+            for field in ("data", "metadata"):
+                memory_entry[field] = self.blobs.externalize(
+                    memory_entry.get(field), self.blob_threshold
+                )
+        except Exception as e:
+            logger.error(f"Failed to store memory payload blobs: {e}")
+
+    def _resolve_payloads(self, memory_entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of an entry with any blob references replaced by their values."""
+        resolved = None
+        for field in ("data", "metadata"):
+            value = memory_entry.get(field)
+            loaded = self.blobs.resolve(value)
+            if loaded is not value:
+                if resolved is None:
+                    resolved = dict(memory_entry)
+                resolved[field] = loaded
+        return memory_entry if resolved is None else resolved
+
     def _consolidate_memory(self):
-        """Consolidate short-term memory into long-term memory."""
-        if len(self.short_term_memory) > 100:  # Keep last 100 activities in short-term
-            older_memories = self.short_term_memory[
-                :-50
-            ]  # Move older ones to long-term
-            self.short_term_memory = self.short_term_memory[-50:]
-
-            for memory in older_memories:
-                activity_type = memory["activity_type"]
-                if activity_type not in self.long_term_memory:
-                    self.long_term_memory[activity_type] = []
-                self.long_term_memory[activity_type].append(memory)
+        """Move the oldest short-term entries into long-term memory once over capacity."""
+        while len(self.short_term_memory) > SHORT_TERM_CAPACITY:
+            memory = self.short_term_memory.popleft()
+            self.long_term_memory.append(memory)
+
+            activity_type = memory["activity_type"]
+            if self._retention_policy(activity_type):
+                count = self._appends_since_retention.get(activity_type, 0) + 1
+                self._appends_since_retention[activity_type] = count
+                if count >= RETENTION_CHECK_INTERVAL:
+                    self.apply_retention(activity_type)
+
+    def _retention_policy(self, activity_type: str) -> Dict[str, Any]:
+        return self.retention.get(activity_type, self.retention.get("default", {}))
+
+    def apply_retention(self, activity_type: Optional[str] = None) -> int:
+        """
+        Move long-term entries past their retention limits into the archive.
+        Applies to one activity type, or all of them when None. The newest
+        entry of a type always stays in long-term memory. Returns the number
+        of entries archived.
+        """
+        activity_types = (
+            [activity_type] if activity_type else self.long_term_memory.types()
+        )
+        archived = 0
+        for name in activity_types:
+            self._appends_since_retention[name] = 0
+            policy = self._retention_policy(name)
+            if not policy:
+                continue
+            entries = self.long_term_memory.get(name, [])
+            cut = self._retention_cut(entries, policy, name)
+            if cut <= 0:
+                continue
+            try:
+                self.archive.write(entries[:cut])
+                self.long_term_memory.rewrite(name, entries[cut:])
+                archived += cut
+                logger.info(f"Archived {cut} long-term {name} entries")
+            except Exception as e:
+                logger.error(f"Failed to archive {name} entries: {e}")
+        return archived
+
+    def _retention_cut(
+        self, entries: List[Dict[str, Any]], policy: Dict[str, Any], activity_type: str
+    ) -> int:
+        """Number of oldest entries that fall outside the policy."""
+        if len(entries) <= 1:
+            return 0
+        cut = 0
+
+        max_entries = policy.get("max_entries")
+        if max_entries is not None and len(entries) > max_entries:
+            cut = max(cut, len(entries) - max_entries)
+
+        max_age_days = policy.get("max_age_days")
+        if max_age_days is not None:
+            cutoff = (
+                datetime.now(timezone.utc) - timedelta(days=max_age_days)
+            ).isoformat()
+            aged = 0
+            while aged < len(entries) and entries[aged]["timestamp"] < cutoff:
+                aged += 1
+            cut = max(cut, aged)
+
+        max_bytes = policy.get("max_bytes")
+        if (
+            max_bytes is not None
+            and self.long_term_memory.size_bytes(activity_type) > max_bytes
+        ):
+            kept_bytes = 0
+            keep_from = len(entries)
+            while keep_from > 0:
+                size = len(entry_to_json(entries[keep_from - 1])) + 1
+                if kept_bytes + size > max_bytes:
+                    break
+                kept_bytes += size
+                keep_from -= 1
+            cut = max(cut, keep_from)
+
+        return min(cut, len(entries) - 1)
 
     def get_recent_activities(
         self, limit: int = 10, offset: int = 0
     ) -> List[Dict[str, Any]]:
         """Get recent activities from memory with success/failure status."""
-        # Sort all activities by timestamp in descending order (most recent first)
-        all_activities = sorted(
-            self.short_term_memory, key=lambda x: x["timestamp"], reverse=True
+        # Short-term memory is kept in time order, so walking it backwards
+        # yields the most recent first without sorting or copying.
+        paginated_activities = islice(
+            reversed(self.short_term_memory), offset, offset + limit
         )
 
-        # Apply pagination
-        paginated_activities = all_activities[offset : offset + limit]
+        return [self._format_activity(activity) for activity in paginated_activities]
 
-        # Format timestamps for display
+    def _format_activity(self, activity: Dict[str, Any]) -> Dict[str, Any]:
+        """Display form of an entry, with a human-readable timestamp."""
+        activity = self._resolve_payloads(activity)
+        return {
+            "timestamp": self._format_timestamp(activity["timestamp"]),
+            "activity_type": activity["activity_type"],
+            "success": activity["success"],
+            "error": activity.get("error"),
+            "data": activity.get("data"),
+            "metadata": activity.get("metadata", {}),
+            "duration": activity.get("duration"),
+            "artifacts": activity.get("artifacts", {}),
+        }
+
+    def _format_timestamp(self, timestamp_str: str) -> str:
+        """Format ISO timestamp to human-readable format."""
+        return format_timestamp(timestamp_str)
+
+    def get_activity_history(
+        self,
+        activity_type: str,
+        include_archive: bool = False,
+        since: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get history of specific activity type from long-term memory.
+        include_archive also reads archived entries (only the monthly
+        partitions at or after 'since', an ISO timestamp, are opened).
+        """
+        activities = self.long_term_memory.get(activity_type, [])
+        if since:
+            activities = [a for a in activities if a["timestamp"] >= since]
+        if include_archive:
+            archived = list(self.archive.read(activity_type, since=since))
+            activities = archived + activities
         return [
             {
+                **self._resolve_payloads(activity),
                 "timestamp": self._format_timestamp(activity["timestamp"]),
-                "activity_type": activity["activity_type"],
-                "success": activity["success"],
-                "error": activity.get("error"),
-                "data": activity.get("data"),
-                "metadata": activity.get("metadata", {}),
             }
-            for activity in paginated_activities
+            for activity in activities
         ]
 
-    def _format_timestamp(self, timestamp_str: str) -> str:
-        """Format ISO timestamp to human-readable format."""
-        try:
-            dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            return dt.strftime("%Y-%m-%d %H:%M:%S %Z")
-        except Exception:
-            return timestamp_str
+    def get_history_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        activity_type: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of the full history (short-term, long-term and archived),
+        newest first, optionally filtered by activity type, success and an
+        ISO timestamp range [since, until).
 
-    def get_activity_history(self, activity_type: str) -> List[Dict[str, Any]]:
-        """Get history of specific activity type."""
-        activities = self.long_term_memory.get(activity_type, [])
+        Pass the returned 'next_cursor' back as 'cursor' to get the following
+        page; it is None once there is nothing older. Pages are located
+        through the search index, so each one costs O(limit) whatever its
+        depth (plus reading the archive partitions it reaches into).
+        Raises ValueError for a malformed cursor.
+        """
+        before = decode_cursor(cursor) if cursor else None
+        self._ensure_index()
+        hits = self.index.page(
+            before=before,
+            activity_type=activity_type,
+            success=success,
+            since=since,
+            until=until,
+            limit=limit + 1,
+        )
+        found = self._find_entries(hits[:limit])
+        entries = [found[seq] for seq, _, _ in hits[:limit] if seq in found]
+        return self._history_page(entries, has_more=len(hits) > limit)
+
+    def _history_page(
+        self, entries: List[Dict[str, Any]], has_more: bool
+    ) -> Dict[str, Any]:
+        next_cursor = None
+        if has_more and entries:
+            next_cursor = encode_cursor(entries[-1]["timestamp"], entries[-1]["seq"])
+        return {
+            "activities": [
+                {**self._format_activity(entry), "seq": entry["seq"]}
+                for entry in entries
+            ],
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+        }
+
+    def count_activities(
+        self, activity_type: Optional[str] = None, success: Optional[bool] = None
+    ) -> int:
+        """Number of stored entries of a type and/or outcome, from the running stats."""
+        if activity_type is not None:
+            stats = self.stats.by_type.get(activity_type)
+            by_type = [stats] if stats else []
+        else:
+            by_type = list(self.stats.by_type.values())
+        if success is None:
+            return sum(stats.count for stats in by_type)
+        if success:
+            return sum(stats.success_count for stats in by_type)
+        return sum(stats.failure_count for stats in by_type)
+
+    def search(
+        self,
+        query: str,
+        activity_type: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find entries whose data/metadata contain every word of the query,
+        newest first, across short-term, long-term and archived memory.
+        'since' is an ISO timestamp. Each result carries its 'seq'.
+        """
+        self._ensure_index()
+        results = []
+        for seq, timestamp, entry_type in self.index.search(
+            query, activity_type=activity_type, since=since, limit=limit
+        ):
+            entry = self._find_entry(seq, entry_type, timestamp)
+            if entry is None:
+                continue
+            results.append({**self._format_activity(entry), "seq": seq})
+        return results
+
+    def recall(
+        self, text: str, k: int = 5, activity_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The k entries most similar in meaning to 'text' (cosine similarity of
+        hashed n-gram embeddings), best first, from all of history. Each
+        result carries its 'seq' and similarity 'score'.
+        """
+        query = self.embedder.embed(text)
+        if not query.any():
+            return []
+        self._ensure_vectors()
+        results = []
+        for seq, entry_type, score in self.vectors.search(
+            query, k=k, activity_type=activity_type
+        ):
+            entry = self._find_entry(seq, entry_type)
+            if entry is None:
+                continue
+            results.append({**self._format_activity(entry), "seq": seq, "score": score})
+        return results
+
+    def get_artifacts(
+        self,
+        kind: str,
+        activity_type: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Artifacts of one kind ("media_urls", "tweet_ids", "commit_shas" or
+        "generation_ids") recorded across all history, newest first, straight
+        from the index. Timestamps are ISO strings, like 'since'.
+        """
+        if kind not in ARTIFACT_KINDS:
+            logger.warning(f"Unknown artifact kind: {kind}")
+            return []
+        self._ensure_index()
         return [
-            {**activity, "timestamp": self._format_timestamp(activity["timestamp"])}
-            for activity in activities
+            {
+                "value": value,
+                "seq": seq,
+                "timestamp": timestamp,
+                "activity_type": entry_type,
+            }
+            for value, seq, timestamp, entry_type in self.index.find_artifacts(
+                kind, activity_type=activity_type, since=since, limit=limit
+            )
         ]
 
+    def _find_entry(
+        self, seq: int, activity_type: str, timestamp: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Look up one entry by seq, reading only the segment or partition that holds it."""
+        if self.short_term_memory and seq >= self.short_term_memory[0].get("seq", 0):
+            for entry in reversed(self.short_term_memory):
+                if entry.get("seq") == seq:
+                    return entry
+
+        entries = self.long_term_memory.get(activity_type, [])
+        position = bisect_left(entries, seq, key=lambda e: e.get("seq", 0))
+        if position < len(entries) and entries[position].get("seq") == seq:
+            return entries[position]
+
+        for entry in self.archive.read(activity_type, since=timestamp):
+            if entry.get("seq") == seq:
+                return entry
+            if timestamp and entry["timestamp"] > timestamp:
+                break
+        return None
+
+    def _find_entries(
+        self, hits: List[Tuple[int, str, str]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Look up several (seq, timestamp, activity_type) hits at once, by seq.
+        Archived hits are read with one pass over each type's partitions.
+        """
+        found: Dict[int, Dict[str, Any]] = {}
+        recent = {entry.get("seq"): entry for entry in self.short_term_memory}
+        archived: Dict[str, Dict[int, str]] = {}
+        for seq, timestamp, activity_type in hits:
+            entry = recent.get(seq)
+            if entry is None:
+                entries = self.long_term_memory.get(activity_type, [])
+                position = bisect_left(entries, seq, key=lambda e: e.get("seq", 0))
+                if position < len(entries) and entries[position].get("seq") == seq:
+                    entry = entries[position]
+            if entry is None:
+                archived.setdefault(activity_type, {})[seq] = timestamp
+            else:
+                found[seq] = entry
+
+        for activity_type, wanted in archived.items():
+            latest = max(wanted.values())
+            for entry in self.archive.read(activity_type, since=min(wanted.values())):
+                if entry["timestamp"] > latest:
+                    break
+                if wanted.pop(entry.get("seq"), None) is not None:
+                    found[entry["seq"]] = entry
+                    if not wanted:
+                        break
+        return found
+
     def persist(self):
-        """Persist memory to storage."""
-        try:
-            memory_data = {
-                "short_term": self.short_term_memory,
-                "long_term": self.long_term_memory,
-            }
+        """
+        Persist memory to storage.
+        In WAL mode records are already journaled, so this only syncs the
+        journal and compacts it once it has grown past the threshold.
+        With a write-behind persister attached, this only marks memory dirty.
+        """
+        if self._persister:
+            self._persister.mark_dirty("memory")
+            return
+
+        if self._journal:
+            try:
+                self._journal.sync()
+                if self._journal.record_count >= self.compaction_threshold:
+                    self.compact()
+            except Exception as e:
+                logger.error(f"Failed to sync memory journal: {e}")
+            return
 
-            # Write to a temporary file first
-            temp_file = self.memory_file.with_suffix(".json.tmp")
-            with open(temp_file, "w") as f:
-                json.dump(memory_data, f, indent=2)
+        self._write_snapshot(self._snapshot_data())
 
-            # Rename temporary file to actual file (atomic operation)
-            temp_file.replace(self.memory_file)
+    def _snapshot_data(self) -> Dict[str, Any]:
+        """Shallow copy of the current memory, safe to serialize off-thread."""
+        return {
+            "format_version": MEMORY_FORMAT_VERSION,
+            "last_seq": self._last_seq,
+            "short_term": [entry.to_dict() for entry in self.short_term_memory],
+            "stats": self.stats.to_dict(),
+            "rollups": self.rollups.to_dict(),
+        }
+
+    def _write_snapshot(self, memory_data: Dict[str, Any]) -> bool:
+        """Atomically write a full snapshot to memory.json."""
+        try:
+            with self._write_lock:
+                # Write to a temporary file first
+                temp_file = self.memory_file.with_suffix(".json.tmp")
+                with open(temp_file, "w") as f:
+                    json.dump(memory_data, f, indent=2)
+
+                # Rename temporary file to actual file (atomic operation)
+                temp_file.replace(self.memory_file)
+            return True
 
         except Exception as e:
             logger.error(f"Failed to persist memory: {e}")
+            return False
+
+    def compact(self, wait: bool = False):
+        """
+        Fold the journal into memory.json (WAL mode only).
+        The snapshot is written by a background thread; records stored while
+        it runs stay in the journal and are picked up by the next compaction.
+        """
+        if not self._journal:
+            return
+
+        if self._persister and not wait:
+            self._persister.mark_dirty("memory")
+            return
+
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            if not wait:
+                return
+            self._compaction_thread.join()
+
+        snapshot = self._snapshot_data()
+        self._compaction_thread = threading.Thread(
+            target=self._run_compaction,
+            args=(snapshot,),
+            name="memory-compaction",
+            daemon=True,
+        )
+        self._compaction_thread.start()
+        if wait:
+            self._compaction_thread.join()
+
+    def _run_compaction(self, snapshot: Dict[str, Any]):
+        """Write the snapshot, then trim the journal records it now contains."""
+        try:
+            with self._write_lock:
+                # Never let an older snapshot overwrite a newer one
+                if snapshot["last_seq"] < self._compacted_seq:
+                    return
+                if self._write_snapshot(snapshot):
+                    self._journal.truncate_through(snapshot["last_seq"])
+                    self._compacted_seq = snapshot["last_seq"]
+                    logger.info(
+                        f"Compacted memory journal through seq {snapshot['last_seq']}"
+                    )
+        except Exception as e:
+            logger.error(f"Failed to compact memory journal: {e}")
+
+    def close(self):
+        """Flush everything to disk; in WAL mode compact and close the journal."""
+        if self._journal:
+            self.compact(wait=True)
+            self._journal.close()
+        else:
+            self.persist()
+        self.save_index(wait=True)
+        self.vectors.flush()
+
+    def save_index(self, wait: bool = False):
+        """
+        Append the entries indexed since the last save to the index log;
+        through the write-behind persister when one is attached, unless
+        wait is set. Only the new entries are written, not the whole index.
+        """
+        self._index_unsaved = 0
+        if self._persister and not wait:
+            self._persister.mark_dirty("memory_index")
+        else:
+            self._write_index_log(self._index_log_snapshot())
+
+    def _index_log_snapshot(self) -> List[List[Any]]:
+        """Taken on the event loop: index documents not yet in the log."""
+        logged_seq = self._index_logged_seq
+        self._index_pending = [d for d in self._index_pending if d[0] > logged_seq]
+        return list(self._index_pending)
+
+    def _write_index_log(self, documents: List[List[Any]]):
+        """
+        Runs in a worker thread. Appends documents to the index log, and
+        folds the log into the base once it has outgrown it.
+        """
+        with self._write_lock:
+            documents = [d for d in documents if d[0] > self._index_logged_seq]
+            if documents and append_index_log(self.index_log_file, documents):
+                self._index_logged_seq = documents[-1][0]
+                self._index_log_entries += len(documents)
+            if self._index_log_entries >= max(
+                INDEX_COMPACT_MIN_ENTRIES, self._index_base_entries
+            ):
+                self._fold_index_log()
+
+    def _fold_index_log(self):
+        """Merge the saved base and log into a new base, without the live index."""
+        saved = InvertedIndex()
+        if (
+            not saved.load(self.index_file)
+            or saved.load_log(self.index_log_file) is None
+        ):
+            logger.error("Could not read the saved memory index to compact it")
+            return
+        if write_index(self.index_file, saved.snapshot()) and reset_index_log(
+            self.index_log_file, saved.max_seq, len(saved)
+        ):
+            self._index_base_entries = len(saved)
+            self._index_log_entries = 0
+            logger.info(f"Compacted memory search index ({len(saved)} entries)")
+
+    def compact_index(self):
+        """Write the whole live index as the new base and empty the log."""
+        with self._write_lock:
+            if write_index(self.index_file, self.index.snapshot()) and reset_index_log(
+                self.index_log_file, self.index.max_seq, len(self.index)
+            ):
+                self._index_pending = []
+                self._index_unsaved = 0
+                self._index_logged_seq = self.index.max_seq
+                self._index_base_entries = len(self.index)
+                self._index_log_entries = 0
+
+    def _clear_index(self):
+        """Empty the search index and save it empty."""
+        with self._write_lock:
+            self.index.clear()
+            self._index_loaded = True
+            self._index_needs_rebuild = False
+            self.compact_index()
 
     def clear(self):
         """Clear all memory."""
-        self.short_term_memory = []
-        self.long_term_memory = {}
-        self.persist()
+        self.short_term_memory = deque()
+        self.long_term_memory.clear()
+        self.archive.clear()
+        self.stats = MemoryStats()
+        self.rollups = MemoryRollups(self.rollups.hourly_retention_days)
+        self._clear_index()
+        self.vectors.clear()
+        self._vectors_need_rebuild = False
+        self.blobs.clear()
+        if self._journal:
+            if self._compaction_thread and self._compaction_thread.is_alive():
+                self._compaction_thread.join()
+            if self._write_snapshot(self._snapshot_data()):
+                self._journal.truncate_through(self._last_seq)
+        else:
+            self.persist()
 
     def get_activity_count(self) -> int:
         """Get total number of activities in memory."""
-        return len(self.short_term_memory) + sum(
-            len(activities) for activities in self.long_term_memory.values()
+        return self.stats.total_count
+
+    def get_activity_stats(self, activity_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Running aggregates (count, success/failure, last timestamp,
+        mean/p95 duration, payload bytes) for one activity type, or for
+        every type keyed by name when activity_type is None.
+        """
+        return self.stats.summary(activity_type)
+
+    def get_activity_timeseries(
+        self,
+        resolution: str = "hour",
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        activity_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Hourly or daily buckets (count, success rate, energy spent, durations)
+        between the ISO timestamps since/until, oldest first.
+        """
+        if resolution not in RESOLUTIONS:
+            logger.warning(f"Unknown timeseries resolution: {resolution}")
+            return []
+        return self.rollups.timeseries(
+            resolution, since=since, until=until, activity_type=activity_type
+        )
+
+    def export_ndjson(self, path: str) -> Optional[int]:
+        """
+        Stream all history (archive included), oldest first, to an NDJSON
+        file: a header line with the schema version, then one entry per line
+        with its payloads inlined. A .gz or .zst suffix compresses the file.
+        Returns the number of entries written, or None on failure.
+        """
+        try:
+            count = write_records(
+                Path(path),
+                (dict(self._resolve_payloads(entry)) for entry in self._iter_history()),
+            )
+            logger.info(f"Exported {count} memory entries to {path}")
+            return count
+        except Exception as e:
+            logger.error(f"Failed to export memory to {path}: {e}")
+            return None
+
+    def import_ndjson(self, path: str) -> Dict[str, int]:
+        """
+        Stream entries from a file written by export_ndjson() (or older
+        schema versions of it) into this memory, in batches. Entries already
+        present, or repeated in the file, are skipped by record id. Imported
+        entries get new seqs. Returns the imported and duplicate counts.
+        """
+        known = self._record_ids()
+        counts = {"imported": 0, "duplicates": 0}
+        batch: List[MemoryEntry] = []
+        try:
+            for record in read_records(Path(path)):
+                identity = record.pop("id")
+                if identity in known:
+                    counts["duplicates"] += 1
+                    continue
+                known.add(identity)
+                record["seq"] = 0
+                batch.append(MemoryEntry.from_dict(record))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    self._import_batch(batch)
+                    counts["imported"] += len(batch)
+                    batch = []
+            if batch:
+                self._import_batch(batch)
+                counts["imported"] += len(batch)
+        except Exception as e:
+            logger.error(f"Failed to import memory from {path}: {e}")
+        finally:
+            self._finish_import()
+        logger.info(
+            f"Imported {counts['imported']} memory entries from {path} "
+            f"({counts['duplicates']} duplicates skipped)"
         )
+        return counts
+
+    def _record_ids(self) -> Set[str]:
+        """Record ids of every stored entry, for de-duplicating imports."""
+        self._ensure_index()
+        return {
+            record_id(timestamp, activity_type)
+            for timestamp, activity_type in zip(
+                self.index.doc_timestamps, self.index.doc_types
+            )
+        }
+
+    def _import_batch(self, entries: List[MemoryEntry]):
+        """
+        Add imported entries and checkpoint. Entries older than short-term
+        memory go straight to their long-term segments; retention runs once
+        per batch rather than every RETENTION_CHECK_INTERVAL appends.
+        """
+        entries.sort(key=lambda e: e.timestamp)
+        for entry in entries:
+            self._last_seq += 1
+            entry.seq = self._last_seq
+            self.stats.record(entry)
+            self.rollups.record(entry)
+            # The index is append-only in time order; an import reaching
+            # back before its newest entry is indexed by one rebuild at the end
+            if not self._index_stale and (
+                not self.index.doc_timestamps
+                or entry.timestamp >= self.index.doc_timestamps[-1]
+            ):
+                self._index_entry(entry)
+            else:
+                self._index_stale = True
+        self._embed_entries(entries)
+
+        touched = set()
+        for entry in entries:
+            self._externalize_payloads(entry)
+            short_term = self.short_term_memory
+            if short_term and entry.timestamp < short_term[0].timestamp:
+                self.long_term_memory.append(entry)
+                touched.add(entry.activity_type)
+            else:
+                insort(self.short_term_memory, entry, key=lambda e: e.timestamp)
+                while len(self.short_term_memory) > SHORT_TERM_CAPACITY:
+                    oldest = self.short_term_memory.popleft()
+                    self.long_term_memory.append(oldest)
+                    touched.add(oldest.activity_type)
+        for activity_type in touched:
+            if self._retention_policy(activity_type):
+                self.apply_retention(activity_type)
+        self._checkpoint()
+
+    def _finish_import(self):
+        if self._index_stale:
+            self._index_stale = False
+            try:
+                self.index.rebuild(
+                    map(
+                        self._resolve_payloads, self._iter_entries(include_archive=True)
+                    )
+                )
+                self.compact_index()
+            except Exception as e:
+                logger.error(f"Failed to rebuild memory search index: {e}")
+        self.save_index(wait=True)
+        self.vectors.flush()
+
+    def _checkpoint(self):
+        """Write a snapshot now, folding in (and trimming) the journal in WAL mode."""
+        snapshot = self._snapshot_data()
+        if self._journal:
+            if self._compaction_thread and self._compaction_thread.is_alive():
+                self._compaction_thread.join()
+            self._run_compaction(snapshot)
+        else:
+            self._write_snapshot(snapshot)
+
+    def _iter_history(self) -> Iterator[Dict[str, Any]]:
+        """Every entry, archive included, oldest first, streamed type by type and merged."""
+        streams = [
+            self.archive.read(activity_type)
+            for activity_type in self.archive.activity_types()
+        ]
+        streams.extend(
+            self.long_term_memory.iter_type(activity_type)
+            for activity_type in self.long_term_memory.types()
+        )
+        streams.append(iter(list(self.short_term_memory)))
+        return heapq.merge(
+            *streams, key=lambda e: (e.get("timestamp", ""), e.get("seq", 0))
+        )
+
+    def _iter_entries(self, include_archive: bool = False):
+        """Iterate over every entry in long-term and short-term (and optionally archived) memory."""
+        if include_archive:
+            for activity_type in self.archive.activity_types():
+                yield from self.archive.read(activity_type)
+        yield from self.long_term_memory.iter_entries()
+        yield from self.short_term_memory
 
     def get_last_activity_timestamp(self) -> str:
         """Get formatted timestamp of the last activity."""
         if not self.short_term_memory:
             return "No activities recorded"
 
-        last_activity = max(self.short_term_memory, key=lambda x: x["timestamp"])
-        return self._format_timestamp(last_activity["timestamp"])
+        return self._format_timestamp(self.short_term_memory[-1]["timestamp"])
+
+
+def create_memory(
+    memory_config: Optional[Dict[str, Any]] = None, storage_path: str = "./storage"
+) -> Memory:
+    """
+    Build the Memory implementation selected by memory_config['storage_mode']:
+    "json" (default), "wal" or "sqlite".
+    """
+    memory_config = memory_config or {}
+    storage_mode = memory_config.get("storage_mode", "json")
+    if storage_mode == "sqlite":
+        from .memory_sqlite import SQLiteMemory  # Avoid circular import
+
+        return SQLiteMemory(
+            storage_path,
+            embedding_dim=memory_config.get("embedding_dim", 256),
+            blob_threshold=memory_config.get("blob_threshold_bytes", 1024),
+            retention=memory_config.get("retention"),
+            rollup_hourly_days=memory_config.get("rollup_hourly_days", 90),
+        )
+
+    return Memory(
+        storage_path,
+        storage_mode=storage_mode,
+        compaction_threshold=memory_config.get("compaction_threshold", 1000),
+        max_resident_segments=memory_config.get("max_resident_segments", 8),
+        retention=memory_config.get("retention"),
+        archive_compression=memory_config.get("archive_compression", "gzip"),
+        embedding_dim=memory_config.get("embedding_dim", 256),
+        blob_threshold=memory_config.get("blob_threshold_bytes", 1024),
+        rollup_hourly_days=memory_config.get("rollup_hourly_days", 90),
+    )
@@ -0,0 +1,162 @@
+"""Compressed, time-partitioned archive for memory entries aged out of long-term memory."""
+
+import gzip
+import io
+import json
+import logging
+import re
+import shutil
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .memory_entry import entry_to_json
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+def _type_dir_name(activity_type: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", activity_type)
+
+
+def _partition_key(timestamp: str) -> str:
+    """Monthly partition ('YYYY-MM') for an ISO timestamp."""
+    return timestamp[:7] if len(timestamp) >= 7 else "unknown"
+
+
+class MemoryArchive:
+    """
+    Cold storage under storage/archive/<ActivityType>/<YYYY-MM>.jsonl.gz.
+
+    Each partition is a sequence of compressed members appended over time,
+    so archiving never rewrites existing data. Readers decompress partitions
+    in order and can skip whole months outside the requested range.
+    zstd is used when requested and the optional 'zstandard' package is
+    installed; otherwise gzip.
+    """
+
+    def __init__(self, archive_path: Path, compression: str = "gzip"):
+        self.archive_path = Path(archive_path)
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                logger.warning("zstandard not installed, archiving with gzip instead")
+                compression = "gzip"
+        elif compression not in EXTENSIONS:
+            logger.warning(f"Unknown archive compression '{compression}', using gzip")
+            compression = "gzip"
+        self.compression = compression
+
+    def write(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Append entries to their activity-type/month partitions."""
+        grouped: Dict[Path, List[str]] = defaultdict(list)
+        for entry in entries:
+            type_dir = self.archive_path / _type_dir_name(entry["activity_type"])
+            partition = type_dir / (
+                _partition_key(entry.get("timestamp", ""))
+                + EXTENSIONS[self.compression]
+            )
+            grouped[partition].append(entry_to_json(entry))
+
+        written = 0
+        for partition, lines in grouped.items():
+            partition.parent.mkdir(parents=True, exist_ok=True)
+            payload = ("\n".join(lines) + "\n").encode("utf-8")
+            with open(partition, "ab") as f:
+                f.write(self._compress(payload))
+            written += len(lines)
+        return written
+
+    def _compress(self, payload: bytes) -> bytes:
+        if self.compression == "zstd":
+            import zstandard
+
+            return zstandard.ZstdCompressor().compress(payload)
+        return gzip.compress(payload)
+
+    @staticmethod
+    def _open_partition(partition: Path):
+        if partition.name.endswith(EXTENSIONS["zstd"]):
+            import zstandard
+
+            raw = open(partition, "rb")  # noqa: SIM115
+            reader = zstandard.ZstdDecompressor().stream_reader(
+                raw, read_across_frames=True, closefd=True
+            )
+            return io.TextIOWrapper(reader, encoding="utf-8")
+        return gzip.open(partition, "rt", encoding="utf-8")
+
+    def partitions(self, activity_type: str) -> List[Path]:
+        """Partition files for one activity type, oldest month first."""
+        type_dir = self.archive_path / _type_dir_name(activity_type)
+        if not type_dir.exists():
+            return []
+        files = [
+            p
+            for p in type_dir.iterdir()
+            if any(p.name.endswith(ext) for ext in EXTENSIONS.values())
+        ]
+        return sorted(files, key=lambda p: p.name)
+
+    def activity_types(self) -> List[str]:
+        if not self.archive_path.exists():
+            return []
+        return sorted(p.name for p in self.archive_path.iterdir() if p.is_dir())
+
+    def read(
+        self,
+        activity_type: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream archived entries of one type, oldest first, within [since, until)."""
+        for partition in self.partitions(activity_type):
+            month = partition.name[:7]
+            if since and month < since[:7]:
+                continue
+            if until and month > until[:7]:
+                break
+            try:
+                with self._open_partition(partition) as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        entry = json.loads(line)
+                        timestamp = entry.get("timestamp", "")
+                        if since and timestamp < since:
+                            continue
+                        if until and timestamp >= until:
+                            continue
+                        yield entry
+            except (OSError, EOFError, json.JSONDecodeError) as e:
+                logger.error(f"Failed to read archive partition {partition}: {e}")
+
+    def rewrite(self, activity_type: str, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Replace every partition of one activity type with 'entries' (used when
+        entries are renumbered). The new partitions are written aside first,
+        then swapped in.
+        """
+        type_dir = self.archive_path / _type_dir_name(activity_type)
+        staging = MemoryArchive(
+            self.archive_path.with_name(self.archive_path.name + ".tmp"),
+            compression=self.compression,
+        )
+        staging.clear()
+        written = staging.write(entries)
+        staged_dir = staging.archive_path / _type_dir_name(activity_type)
+        if type_dir.exists():
+            type_dir.rename(staging.archive_path / (type_dir.name + ".old"))
+        if staged_dir.exists():
+            staged_dir.rename(type_dir)
+        staging.clear()
+        return written
+
+    def clear(self):
+        """Delete every archive partition."""
+        if self.archive_path.exists():
+            shutil.rmtree(self.archive_path)
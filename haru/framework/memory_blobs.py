@@ -0,0 +1,126 @@
+"""Content-addressed store for large memory payload fields."""
+
+import gzip
+import hashlib
+import json
+import logging
+import shutil
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BLOB_KEY = "$blob"
+
+# Decompressed blobs kept in RAM; repeated payloads (the same prompt on
+# every run) are read from disk once
+CACHE_SIZE = 128
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and BLOB_KEY in value and len(value) <= 2
+
+
+class BlobStore:
+    """
+    Gzipped JSON values under storage/blobs/<xx>/<sha256>.json.gz, keyed by
+    the SHA-256 of their canonical JSON form. Identical payloads are stored
+    once. Memory entries hold {"$blob": <hash>, "bytes": <size>} references
+    in place of the values.
+    """
+
+    def __init__(self, blobs_path: Path):
+        self.blobs_path = Path(blobs_path)
+        self._cache: OrderedDict[str, str] = OrderedDict()
+
+    def _blob_file(self, digest: str) -> Path:
+        return self.blobs_path / digest[:2] / f"{digest}.json.gz"
+
+    def put(self, value: Any) -> Dict[str, Any]:
+        """Store a value (if not already present) and return its reference."""
+        encoded = json.dumps(value, sort_keys=True, separators=(",", ":"))
+        payload = encoded.encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        blob_file = self._blob_file(digest)
+        if not blob_file.exists():
+            blob_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = blob_file.with_suffix(".tmp")
+            with open(temp_file, "wb") as f:
+                f.write(gzip.compress(payload))
+            temp_file.replace(blob_file)
+        self._remember(digest, encoded)
+        return {BLOB_KEY: digest, "bytes": len(payload)}
+
+    def get(self, digest: str) -> Any:
+        """Load a value by hash; raises FileNotFoundError if it is missing."""
+        encoded = self._cache.get(digest)
+        if encoded is None:
+            with gzip.open(self._blob_file(digest), "rt", encoding="utf-8") as f:
+                encoded = f.read()
+            self._remember(digest, encoded)
+        else:
+            self._cache.move_to_end(digest)
+        # Decode per call so callers never share (and mutate) one object
+        return json.loads(encoded)
+
+    def _remember(self, digest: str, encoded: str):
+        self._cache[digest] = encoded
+        self._cache.move_to_end(digest)
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def externalize(self, value: Any, threshold: int) -> Any:
+        """
+        Replace the fields of a data/metadata dict (or the value itself, if
+        it is a string) whose serialized size exceeds threshold bytes with
+        blob references. Returns a new dict; the input is not modified.
+        """
+        if isinstance(value, str):
+            if len(value.encode("utf-8")) > threshold:
+                return self.put(value)
+            return value
+        if not isinstance(value, dict):
+            return value
+
+        externalized: Optional[Dict[str, Any]] = None
+        for key, item in value.items():
+            if (
+                is_blob_ref(item)
+                or item is None
+                or isinstance(item, (bool, int, float))
+            ):
+                continue
+            try:
+                size = len(json.dumps(item, separators=(",", ":")).encode("utf-8"))
+            except (TypeError, ValueError):
+                continue
+            if size > threshold:
+                if externalized is None:
+                    externalized = dict(value)
+                externalized[key] = self.put(item)
+        return value if externalized is None else externalized
+
+    def resolve(self, value: Any) -> Any:
+        """Inverse of externalize(): load any referenced blobs."""
+        if is_blob_ref(value):
+            return self._load(value)
+        if isinstance(value, dict) and any(is_blob_ref(v) for v in value.values()):
+            return {
+                key: self._load(item) if is_blob_ref(item) else item
+                for key, item in value.items()
+            }
+        return value
+
+    def _load(self, ref: Dict[str, Any]) -> Any:
+        try:
+            return self.get(ref[BLOB_KEY])
+        except (OSError, EOFError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load memory blob {ref[BLOB_KEY]}: {e}")
+            return None
+
+    def clear(self):
+        """Delete every blob."""
+        self._cache.clear()
+        if self.blobs_path.exists():
+            shutil.rmtree(self.blobs_path)
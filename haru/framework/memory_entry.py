@@ -0,0 +1,213 @@
+"""Compact, typed memory entry records."""
+
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Artifact kinds extracted from entries and indexed by Memory
+ARTIFACT_KINDS = ("media_urls", "tweet_ids", "commit_shas", "generation_ids")
+
+# data/metadata keys whose values are artifacts, by kind
+_ARTIFACT_KEYS = {
+    "media_urls": ("media_urls", "image_urls", "media_url", "image_url"),
+    "tweet_ids": ("tweet_id", "tweet_ids"),
+    "commit_shas": ("commits_analyzed", "commit_sha", "commit_shas", "sha"),
+    "generation_ids": ("generation_id", "generation_ids"),
+}
+_KIND_BY_KEY = {key: kind for kind, keys in _ARTIFACT_KEYS.items() for key in keys}
+
+# metadata["outcome"] of a run cancelled at its @activity timeout
+OUTCOME_TIMEOUT = "timeout"
+
+
+def entry_outcome(entry: Any) -> str:
+    """ "success", "failure", or "timeout" for a stored entry."""
+    metadata = entry.get("metadata")
+    if isinstance(metadata, dict) and metadata.get("outcome") == OUTCOME_TIMEOUT:
+        return OUTCOME_TIMEOUT
+    return "success" if entry.get("success") else "failure"
+
+
+# Objects whose "url" is a media URL (e.g. DrawActivity's image_data)
+_MEDIA_CONTAINERS = ("image_data", "media", "image")
+
+_MAX_DEPTH = 4
+
+
+def _collect(
+    value: Any, parent: Optional[str], found: Dict[str, List[str]], depth: int
+):
+    if depth > _MAX_DEPTH or not isinstance(value, dict) or "$blob" in value:
+        return
+    for key, item in value.items():
+        kind = _KIND_BY_KEY.get(key)
+        if kind is None and key == "url" and parent in _MEDIA_CONTAINERS:
+            kind = "media_urls"
+        if kind is not None:
+            items = item if isinstance(item, (list, tuple)) else [item]
+            for artifact in items:
+                if isinstance(artifact, (str, int)) and not isinstance(artifact, bool):
+                    artifact = str(artifact)
+                    if artifact and artifact not in found[kind]:
+                        found[kind].append(artifact)
+        elif isinstance(item, dict):
+            _collect(item, key, found, depth + 1)
+
+
+def extract_artifacts(data: Any, metadata: Any) -> Dict[str, List[str]]:
+    """
+    Media URLs, tweet ids, commit SHAs and generation ids mentioned in an
+    entry's data/metadata, keyed by kind (kinds with none are omitted).
+    """
+    found: Dict[str, List[str]] = {kind: [] for kind in ARTIFACT_KINDS}
+    _collect(data, None, found, 0)
+    _collect(metadata, None, found, 0)
+    return {kind: values for kind, values in found.items() if values}
+
+
+class MemoryEntry:
+    """
+    One stored activity result.
+
+    Uses __slots__ instead of a per-entry dict, interns activity_type, and
+    keeps extracted artifacts (exposed as the media_urls, tweet_ids,
+    commit_shas and generation_ids tuples) in a single slot that is None for
+    the many entries without any. It also behaves like the dicts
+    memory entries used to be (entry["timestamp"], entry.get("data"),
+    dict(entry), {**entry}), so existing callers keep working.
+    """
+
+    FIELDS = (
+        "seq",
+        "timestamp",
+        "activity_type",
+        "success",
+        "error",
+        "data",
+        "metadata",
+        "duration",
+        "energy",
+    )
+
+    __slots__ = FIELDS + ("_artifacts",)
+
+    def __init__(
+        self,
+        timestamp: str,
+        activity_type: str,
+        success: bool = False,
+        error: Optional[str] = None,
+        data: Any = None,
+        metadata: Any = None,
+        duration: Optional[float] = None,
+        energy: Optional[float] = None,
+        seq: int = 0,
+        artifacts: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.activity_type = sys.intern(activity_type)
+        self.success = success
+        self.error = error
+        self.data = data
+        self.metadata = {} if metadata is None else metadata
+        self.duration = duration
+        self.energy = energy
+        if artifacts is None:
+            artifacts = extract_artifacts(data, metadata)
+        self._artifacts: Optional[Dict[str, Tuple[str, ...]]] = {
+            kind: tuple(values) for kind, values in artifacts.items() if values
+        } or None
+
+    @classmethod
+    def from_dict(cls, data: Union[Dict[str, Any], "MemoryEntry"]) -> "MemoryEntry":
+        if isinstance(data, MemoryEntry):
+            return data
+        return cls(
+            timestamp=data.get("timestamp", ""),
+            activity_type=data.get("activity_type", "Unknown"),
+            success=data.get("success", False),
+            error=data.get("error"),
+            data=data.get("data"),
+            metadata=data.get("metadata", {}),
+            duration=data.get("duration"),
+            energy=data.get("energy"),
+            seq=data.get("seq", 0),
+            artifacts=data.get("artifacts"),
+        )
+
+    @property
+    def artifacts(self) -> Dict[str, List[str]]:
+        if not self._artifacts:
+            return {}
+        return {kind: list(values) for kind, values in self._artifacts.items()}
+
+    def _artifact(self, kind: str) -> Tuple[str, ...]:
+        return self._artifacts.get(kind, ()) if self._artifacts else ()
+
+    @property
+    def media_urls(self) -> Tuple[str, ...]:
+        return self._artifact("media_urls")
+
+    @property
+    def tweet_ids(self) -> Tuple[str, ...]:
+        return self._artifact("tweet_ids")
+
+    @property
+    def commit_shas(self) -> Tuple[str, ...]:
+        return self._artifact("commit_shas")
+
+    @property
+    def generation_ids(self) -> Tuple[str, ...]:
+        return self._artifact("generation_ids")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form, as stored in memory.json, segments and archives."""
+        entry = {field: getattr(self, field) for field in self.FIELDS}
+        if self._artifacts:
+            entry["artifacts"] = self.artifacts
+        return entry
+
+    # Mapping-style access, for code written against dict entries
+
+    def keys(self) -> Tuple[str, ...]:
+        if self._artifacts:
+            return self.FIELDS + ("artifacts",)
+        return self.FIELDS
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if key == "artifacts":
+            return self.artifacts
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, sys.intern(value) if key == "activity_type" else value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return (
+            f"MemoryEntry(seq={self.seq}, activity_type={self.activity_type!r}, "
+            f"timestamp={self.timestamp!r}, success={self.success})"
+        )
+
+
+def entry_to_json(entry: Union[Dict[str, Any], MemoryEntry]) -> str:
+    """Compact JSON line for an entry in either representation."""
+    if isinstance(entry, MemoryEntry):
+        entry = entry.to_dict()
+    return json.dumps(entry, separators=(",", ":"))
@@ -0,0 +1,137 @@
+"""Streaming NDJSON export and import format for memory backups and migration."""
+
+import gzip
+import io
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from .memory_entry import entry_to_json
+
+logger = logging.getLogger(__name__)
+
+# Version of the record layout written by export; bump it (and add a
+# migration below) whenever stored entries change shape
+SCHEMA_VERSION = 2
+
+FORMAT_NAME = "memory_export"
+
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+
+def record_id(timestamp: str, activity_type: str) -> str:
+    """
+    Stable identity of an entry across stores. seq is assigned per store, so
+    the id is made of the entry's timestamp (microsecond precision) and
+    activity type instead.
+    """
+    return f"{timestamp}|{activity_type}"
+
+
+def _migrate_v1(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Version 1 records are plain memory.json entries (timestamp,
+    activity_type, success, error, data, metadata): no seq, id, duration,
+    energy or artifacts. Artifacts are re-extracted on import.
+    """
+    record.setdefault("metadata", {})
+    record.setdefault("success", False)
+    record.pop("artifacts", None)
+    return record
+
+
+# from_version -> function upgrading a record to from_version + 1
+MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {1: _migrate_v1}
+
+
+def migrate_record(record: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """Upgrade a record written under an older schema version to the current one."""
+    while version < SCHEMA_VERSION:
+        record = MIGRATIONS[version](record)
+        version += 1
+    record.setdefault(
+        "id",
+        record_id(record.get("timestamp", ""), record.get("activity_type", "Unknown")),
+    )
+    return record
+
+
+def compression_for(path: Path) -> Optional[str]:
+    """Compression implied by a file name: .gz -> gzip, .zst -> zstd, else none."""
+    return COMPRESSIONS.get(Path(path).suffix)
+
+
+def _open(path: Path, mode: str, compression: Optional[str]):
+    """Open an export file as text, (de)compressing as requested."""
+    if compression == "zstd":
+        import zstandard
+
+        if mode == "w":
+            raw = open(path, "wb")  # noqa: SIM115
+            writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+            return io.TextIOWrapper(writer, encoding="utf-8")
+        raw = open(path, "rb")  # noqa: SIM115
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            raw, read_across_frames=True, closefd=True
+        )
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_records(path: Path, records: Iterable[Dict[str, Any]]) -> int:
+    """
+    Write a header line and then one entry per line, streaming. The file is
+    written under a temporary name and renamed once complete. Returns the
+    number of entries written.
+    """
+    path = Path(path)
+    temp_file = path.with_name(path.name + ".tmp")
+    count = 0
+    with _open(temp_file, "w", compression_for(path)) as f:
+        header = {
+            "format": FORMAT_NAME,
+            "schema_version": SCHEMA_VERSION,
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+        }
+        f.write(json.dumps(header) + "\n")
+        for record in records:
+            identity = record_id(record["timestamp"], record["activity_type"])
+            f.write(entry_to_json({**record, "id": identity}) + "\n")
+            count += 1
+    temp_file.replace(path)
+    return count
+
+
+def read_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the entries of an export file, migrated to the current schema.
+    Files without a header line are read as schema version 1. Malformed
+    lines are logged and skipped.
+    """
+    path = Path(path)
+    version = 1
+    with _open(path, "r", compression_for(path)) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping malformed line {line_number} of {path}: {e}")
+                continue
+            if not isinstance(record, dict):
+                continue
+            if line_number == 1 and record.get("format") == FORMAT_NAME:
+                version = record.get("schema_version", 1)
+                if version > SCHEMA_VERSION:
+                    raise ValueError(
+                        f"{path} uses memory export schema {version}, "
+                        f"newer than supported ({SCHEMA_VERSION})"
+                    )
+                continue
+            yield migrate_record(record, version)
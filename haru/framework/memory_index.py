@@ -0,0 +1,452 @@
+"""Incrementally maintained full-text index over memory entries."""
+
+import gzip
+import json
+import logging
+import os
+import re
+import sys
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .memory_entry import extract_artifacts
+from .memory_segments import read_last_line
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 3
+
+TOKEN_PATTERN = re.compile(r"\w+")
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 64
+
+# Fields that echo text stored elsewhere (full prompts, previously recalled
+# memories) and would otherwise make every entry match common words
+SKIPPED_KEYS = frozenset({"prompt_used", "recent_memories_used"})
+
+# Posting-list key prefix for the per-activity-type filter; \x00 cannot
+# appear in a token
+TYPE_KEY_PREFIX = "\x00type:"
+
+# Posting-list keys for the success/failure filter
+SUCCESS_KEYS = {True: "\x00success:1", False: "\x00success:0"}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of a string."""
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if MIN_TOKEN_LENGTH <= len(token) <= MAX_TOKEN_LENGTH
+    ]
+
+
+def _iter_text(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key not in SKIPPED_KEYS:
+                yield from _iter_text(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_text(item)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield str(value)
+
+
+def entry_text(entry: Dict[str, Any]) -> str:
+    """All searchable text of an entry's data and metadata, space-joined."""
+    return " ".join(_iter_text([entry.get("data"), entry.get("metadata")]))
+
+
+def entry_tokens(entry: Dict[str, Any]) -> Set[str]:
+    """Distinct tokens of an entry's data and metadata."""
+    return set(tokenize(entry_text(entry)))
+
+
+def _entry_artifacts(entry: Dict[str, Any]) -> Dict[str, List[str]]:
+    artifacts = entry.get("artifacts")
+    if artifacts is None:
+        # Entries stored before artifacts were extracted
+        artifacts = extract_artifacts(entry.get("data"), entry.get("metadata"))
+    return artifacts
+
+
+def index_document(entry: Dict[str, Any]) -> List[Any]:
+    """
+    What the index keeps of an entry, as written to the index log:
+    [seq, timestamp, activity_type, success, tokens, artifacts].
+    """
+    return [
+        entry.get("seq", 0),
+        entry.get("timestamp", ""),
+        entry.get("activity_type", "Unknown"),
+        bool(entry.get("success")),
+        sorted(entry_tokens(entry)),
+        _entry_artifacts(entry),
+    ]
+
+
+def _contains(postings: List[int], doc: int) -> bool:
+    position = bisect_left(postings, doc)
+    return position < len(postings) and postings[position] == doc
+
+
+class InvertedIndex:
+    """
+    Token -> posting list of document ids, where documents are memory
+    entries numbered in the order they were added (i.e. time order).
+
+    Posting lists are therefore sorted, so adding an entry is an append per
+    token and a query intersects lists by walking the shortest one from
+    its newest end and bisecting into the others. Queries stop as soon as
+    'limit' hits are found or the walk passes 'since', which keeps lookups
+    well under a millisecond regardless of how much history is indexed.
+
+    Artifacts (media URLs, tweet ids, commit SHAs, generation ids) are kept
+    in per-kind lists of (document, value), also in time order.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, List[int]] = {}
+        self.doc_seqs: List[int] = []
+        self.doc_timestamps: List[str] = []
+        self.doc_types: List[str] = []
+        self.artifacts: Dict[str, List[Tuple[int, str]]] = {}
+        self.max_seq = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_seqs)
+
+    def add(self, entry: Dict[str, Any]):
+        """Index one entry; entries must be added oldest first."""
+        self.add_document(index_document(entry))
+
+    def add_document(self, document: List[Any]):
+        """Index one index_document(); documents must be added oldest first."""
+        seq, timestamp, activity_type, success, tokens, artifacts = document
+        self._add(seq, timestamp, sys.intern(activity_type), success, tokens, artifacts)
+
+    def _add(
+        self,
+        seq: int,
+        timestamp: str,
+        activity_type: str,
+        success: bool,
+        tokens: Iterable[str],
+        artifacts: Dict[str, List[str]],
+    ):
+        doc = len(self.doc_seqs)
+        self.doc_seqs.append(seq)
+        self.doc_timestamps.append(timestamp)
+        self.doc_types.append(activity_type)
+        for token in tokens:
+            self.postings.setdefault(token, []).append(doc)
+        self.postings.setdefault(TYPE_KEY_PREFIX + activity_type, []).append(doc)
+        self.postings.setdefault(SUCCESS_KEYS[success], []).append(doc)
+        for kind, values in artifacts.items():
+            self.artifacts.setdefault(kind, []).extend((doc, value) for value in values)
+        self.max_seq = max(self.max_seq, seq)
+
+    def rebuild(self, entries: Iterable[Dict[str, Any]]):
+        """Index entries from scratch; they may arrive in any order."""
+        self.clear()
+        documents = [
+            (
+                entry.get("timestamp", ""),
+                entry.get("seq", 0),
+                entry.get("activity_type", "Unknown"),
+                bool(entry.get("success")),
+                entry_tokens(entry),
+                _entry_artifacts(entry),
+            )
+            for entry in entries
+        ]
+        documents.sort(key=lambda d: (d[0], d[1]))
+        for timestamp, seq, activity_type, success, tokens, artifacts in documents:
+            self._add(seq, timestamp, activity_type, success, tokens, artifacts)
+
+    def search(
+        self,
+        query: str,
+        activity_type: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Tuple[int, str, str]]:
+        """
+        Entries containing every token of the query, newest first, as
+        (seq, timestamp, activity_type) tuples.
+        """
+        keys = set(tokenize(query))
+        if not keys or limit <= 0:
+            return []
+        if activity_type:
+            keys.add(TYPE_KEY_PREFIX + activity_type)
+
+        lists = []
+        for key in keys:
+            postings = self.postings.get(key)
+            if not postings:
+                return []
+            lists.append(postings)
+        lists.sort(key=len)
+        shortest, others = lists[0], lists[1:]
+
+        hits = []
+        for doc in reversed(shortest):
+            if since and self.doc_timestamps[doc] < since:
+                break
+            if all(_contains(postings, doc) for postings in others):
+                hits.append(
+                    (self.doc_seqs[doc], self.doc_timestamps[doc], self.doc_types[doc])
+                )
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def page(
+        self,
+        before: Optional[Tuple[str, int]] = None,
+        activity_type: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Tuple[int, str, str]]:
+        """
+        Up to 'limit' entries strictly older than 'before' (a (timestamp, seq)
+        position), newest first, as (seq, timestamp, activity_type) tuples.
+        Timestamps are kept within [since, until).
+
+        The start position is found by bisection and the walk stops after
+        'limit' hits, so a page costs the same however deep it is.
+        """
+        if limit <= 0:
+            return []
+        docs = range(len(self.doc_seqs))
+        end = len(docs)
+        if before is not None:
+            end = bisect_left(
+                docs,
+                tuple(before),
+                key=lambda d: (self.doc_timestamps[d], self.doc_seqs[d]),
+            )
+        if until:
+            end = min(
+                end, bisect_left(docs, until, key=self.doc_timestamps.__getitem__)
+            )
+
+        lists = []
+        if activity_type:
+            lists.append(self.postings.get(TYPE_KEY_PREFIX + activity_type, []))
+        if success is not None:
+            lists.append(self.postings.get(SUCCESS_KEYS[bool(success)], []))
+        lists.sort(key=len)
+        if lists:
+            shortest, others = lists[0], lists[1:]
+            candidates = (
+                shortest[i] for i in range(bisect_left(shortest, end) - 1, -1, -1)
+            )
+        else:
+            others = []
+            candidates = iter(range(end - 1, -1, -1))
+
+        hits = []
+        for doc in candidates:
+            if since and self.doc_timestamps[doc] < since:
+                break
+            if all(_contains(postings, doc) for postings in others):
+                hits.append(
+                    (self.doc_seqs[doc], self.doc_timestamps[doc], self.doc_types[doc])
+                )
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def find_artifacts(
+        self,
+        kind: str,
+        activity_type: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, int, str, str]]:
+        """Artifacts of one kind, newest first, as (value, seq, timestamp, activity_type)."""
+        found = []
+        for doc, value in reversed(self.artifacts.get(kind, [])):
+            timestamp = self.doc_timestamps[doc]
+            if since and timestamp < since:
+                break
+            if activity_type and self.doc_types[doc] != activity_type:
+                continue
+            found.append((value, self.doc_seqs[doc], timestamp, self.doc_types[doc]))
+            if limit is not None and len(found) >= limit:
+                break
+        return found
+
+    def clear(self):
+        self.postings = {}
+        self.doc_seqs = []
+        self.doc_timestamps = []
+        self.doc_types = []
+        self.artifacts = {}
+        self.max_seq = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the index contents, safe to write from another thread."""
+        return {
+            "version": INDEX_VERSION,
+            "max_seq": self.max_seq,
+            "doc_seqs": list(self.doc_seqs),
+            "doc_timestamps": list(self.doc_timestamps),
+            "doc_types": list(self.doc_types),
+            "postings": {token: list(docs) for token, docs in self.postings.items()},
+            "artifacts": {kind: list(items) for kind, items in self.artifacts.items()},
+        }
+
+    def save(self, index_file: Path) -> bool:
+        """Atomically write the index as gzipped JSON."""
+        return write_index(index_file, self.snapshot())
+
+    def load(self, index_file: Path) -> bool:
+        """Load a saved index; returns False if there is none or it is unusable."""
+        self.clear()
+        index_file = Path(index_file)
+        if not index_file.exists():
+            return False
+        try:
+            with gzip.open(index_file, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return False
+            self.doc_seqs = data["doc_seqs"]
+            self.doc_timestamps = data["doc_timestamps"]
+            self.doc_types = [sys.intern(name) for name in data["doc_types"]]
+            self.postings = data["postings"]
+            self.artifacts = {
+                kind: [tuple(item) for item in items]
+                for kind, items in data["artifacts"].items()
+            }
+            self.max_seq = data["max_seq"]
+            return True
+        except Exception as e:
+            logger.warning(f"Could not load memory index, it will be rebuilt: {e}")
+            self.clear()
+            return False
+
+    def load_log(self, log_file: Path) -> Optional[int]:
+        """
+        Add the documents appended to an index log after the loaded base
+        (those with a seq above its max_seq). Returns how many documents the
+        log holds, or None if it was written by another index version.
+        """
+        log_file = Path(log_file)
+        if not log_file.exists():
+            return 0
+        base_seq = self.max_seq
+        count = 0
+        try:
+            with open(log_file, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("version") != INDEX_VERSION:
+                    return None
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        document = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable line in {log_file}")
+                        continue
+                    count += 1
+                    if document[0] > base_seq:
+                        self.add_document(document)
+            return count
+        except Exception as e:
+            logger.warning(f"Could not read memory index log, it will be rebuilt: {e}")
+            return None
+
+
+def reset_index_log(log_file: Path, max_seq: int, entries: int) -> bool:
+    """
+    Atomically replace an index log with just its header, after a base
+    holding 'entries' entries up to seq 'max_seq' has been written.
+    """
+    try:
+        log_file = Path(log_file)
+        temp_file = log_file.with_suffix(".tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": INDEX_VERSION, "max_seq": max_seq, "entries": entries}, f
+            )
+            f.write("\n")
+        temp_file.replace(log_file)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to reset memory index log: {e}")
+        return False
+
+
+def read_index_log_tail(log_file: Path) -> Optional[Tuple[int, int]]:
+    """
+    (seq of the newest entry saved, number of entries in the base) from an
+    index log's header and final line, without reading the rest. None if
+    the log is missing, unreadable or written by another index version.
+    """
+    try:
+        with open(log_file, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+        if not isinstance(header, dict) or header.get("version") != INDEX_VERSION:
+            return None
+        try:
+            last = json.loads(read_last_line(Path(log_file)) or "{}")
+        except json.JSONDecodeError:
+            # Torn final line from a crash: the line before it is the newest
+            last = header
+            with open(log_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        last = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        max_seq = last[0] if isinstance(last, list) else header["max_seq"]
+        return max_seq, header.get("entries", 0)
+    except (OSError, ValueError, KeyError, IndexError):
+        return None
+
+
+def append_index_log(log_file: Path, documents: List[List[Any]]) -> bool:
+    """Append index_document()s to an index log, one JSON array per line."""
+    try:
+        with open(log_file, "a+b") as f:
+            # A crash can leave a torn final line; terminate it first
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(
+                "".join(
+                    json.dumps(document, separators=(",", ":")) + "\n"
+                    for document in documents
+                ).encode("utf-8")
+            )
+        return True
+    except Exception as e:
+        logger.error(f"Failed to append to memory index log: {e}")
+        return False
+
+
+def write_index(index_file: Path, snapshot: Dict[str, Any]) -> bool:
+    """Atomically write an InvertedIndex.snapshot() as gzipped JSON."""
+    try:
+        index_file = Path(index_file)
+        temp_file = index_file.with_suffix(".tmp")
+        with gzip.open(temp_file, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        temp_file.replace(index_file)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to save memory index: {e}")
+        return False
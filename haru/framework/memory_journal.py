@@ -0,0 +1,118 @@
+"""Append-only journal (write-ahead log) used by the WAL memory storage mode."""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+from .memory_entry import entry_to_json
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryJournal:
+    """
+    JSONL log of memory records, one record per line.
+
+    Appending is O(1) regardless of how much history exists. Every record
+    carries a monotonically increasing 'seq', so after the journal has been
+    folded into the snapshot file, replay can skip anything the snapshot
+    already contains (even if the process died before the journal was trimmed).
+    """
+
+    def __init__(self, journal_path: Path):
+        self.journal_path = Path(journal_path)
+        self.record_count = 0
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """Open the journal for appending (caller must hold the lock)."""
+        if self._file is not None:
+            return
+        # A crash can leave a torn final line; terminate it so the next record
+        # does not get glued onto the garbage.
+        needs_newline = False
+        if self.journal_path.exists() and self.journal_path.stat().st_size > 0:
+            with open(self.journal_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        self._file = open(self.journal_path, "a", encoding="utf-8")  # noqa: SIM115
+        if needs_newline:
+            self._file.write("\n")
+
+    def append(self, record: Dict[str, Any]):
+        """Append a single record and hand it to the OS."""
+        line = entry_to_json(record)
+        with self._lock:
+            self._open()
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.record_count += 1
+
+    def sync(self):
+        """Force appended records to disk."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the underlying file handle."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def replay(self, after_seq: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yield journal records with seq > after_seq, skipping unreadable lines."""
+        if not self.journal_path.exists():
+            self.record_count = 0
+            return
+
+        count = 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(
+                        f"Skipping unreadable journal line {line_no} in {self.journal_path}"
+                    )
+                    continue
+                count += 1
+                if record.get("seq", 0) > after_seq:
+                    yield record
+        self.record_count = count
+
+    def truncate_through(self, seq: int):
+        """Drop every record with seq <= seq (they now live in the snapshot)."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+            remaining = []
+            if self.journal_path.exists():
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            if json.loads(line).get("seq", 0) > seq:
+                                remaining.append(line)
+                        except json.JSONDecodeError:
+                            continue
+
+            temp_file = self.journal_path.with_suffix(".jsonl.tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                for line in remaining:
+                    f.write(line + "\n")
+            temp_file.replace(self.journal_path)
+            self.record_count = len(remaining)
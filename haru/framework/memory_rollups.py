@@ -0,0 +1,158 @@
+"""Hourly and daily rollups of activity history, maintained incrementally."""
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+RESOLUTIONS = {"hour": 13, "day": 10}  # ISO timestamp prefix length per bucket
+
+# Counter layout of one (bucket, activity type) cell
+COUNT, SUCCESS, ENERGY, DURATION_TOTAL, DURATION_COUNT = range(5)
+
+
+def _cell_summary(cell: List[float]) -> Dict[str, Any]:
+    count = int(cell[COUNT])
+    return {
+        "count": count,
+        "success_count": int(cell[SUCCESS]),
+        "success_rate": cell[SUCCESS] / count if count else None,
+        "energy": cell[ENERGY],
+        "duration_total": cell[DURATION_TOTAL],
+        "mean_duration": (
+            cell[DURATION_TOTAL] / cell[DURATION_COUNT]
+            if cell[DURATION_COUNT]
+            else None
+        ),
+    }
+
+
+class MemoryRollups:
+    """
+    Per-bucket, per-activity-type counters (count, successes, energy spent,
+    durations) at hourly and daily resolution.
+
+    Each stored entry updates one hourly and one daily cell in O(1). Bucket
+    keys are ISO timestamp prefixes ("2025-01-07T08", "2025-01-07") kept in a
+    sorted list, so a range query bisects to its first bucket and costs
+    O(buckets returned). Hourly buckets older than hourly_retention_days are
+    dropped; daily buckets are kept indefinitely.
+    """
+
+    def __init__(self, hourly_retention_days: int = 90):
+        self.hourly_retention_days = hourly_retention_days
+        self.buckets: Dict[str, Dict[str, Dict[str, List[float]]]] = {}
+        self._keys: Dict[str, List[str]] = {}
+        self._reset()
+
+    def _reset(self):
+        self.buckets = {resolution: {} for resolution in RESOLUTIONS}
+        self._keys = {resolution: [] for resolution in RESOLUTIONS}
+
+    def record(self, entry: Dict[str, Any]):
+        timestamp = entry.get("timestamp") or ""
+        activity_type = entry.get("activity_type", "Unknown")
+        duration = entry.get("duration")
+        for resolution, length in RESOLUTIONS.items():
+            key = timestamp[:length]
+            buckets = self.buckets[resolution]
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {}
+                keys = self._keys[resolution]
+                if not keys or key > keys[-1]:
+                    keys.append(key)
+                    if resolution == "hour":
+                        self.prune()
+                else:
+                    insort(keys, key)
+            cell = bucket.get(activity_type)
+            if cell is None:
+                cell = bucket[activity_type] = [0, 0, 0.0, 0.0, 0]
+            cell[COUNT] += 1
+            if entry.get("success"):
+                cell[SUCCESS] += 1
+            cell[ENERGY] += entry.get("energy") or 0.0
+            if duration is not None:
+                cell[DURATION_TOTAL] += duration
+                cell[DURATION_COUNT] += 1
+
+    def rebuild(self, entries: Iterable[Dict[str, Any]]):
+        """Recompute from scratch (used when a snapshot has no rollups yet)."""
+        self._reset()
+        for entry in entries:
+            self.record(entry)
+        self.prune()
+
+    def prune(self):
+        """Drop hourly buckets past the retention window."""
+        cutoff = (
+            datetime.now(timezone.utc) - timedelta(days=self.hourly_retention_days)
+        ).isoformat()[: RESOLUTIONS["hour"]]
+        keys = self._keys["hour"]
+        stale = bisect_left(keys, cutoff)
+        for key in keys[:stale]:
+            del self.buckets["hour"][key]
+        del keys[:stale]
+
+    def timeseries(
+        self,
+        resolution: str = "hour",
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        activity_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Buckets between the ISO timestamps 'since' and 'until' (inclusive of
+        the buckets they fall in), oldest first. Each bucket has totals plus
+        a per-type breakdown, or only that type's numbers if activity_type
+        is given.
+        """
+        length = RESOLUTIONS[resolution]
+        keys = self._keys[resolution]
+        start = bisect_left(keys, since[:length]) if since else 0
+        end = bisect_right(keys, until[:length]) if until else len(keys)
+
+        series = []
+        for key in keys[start:end]:
+            bucket = self.buckets[resolution][key]
+            if activity_type is not None:
+                cell = bucket.get(activity_type)
+                if cell is None:
+                    continue
+                series.append({"bucket": key, **_cell_summary(cell)})
+                continue
+            total = [0, 0, 0.0, 0.0, 0]
+            for cell in bucket.values():
+                for i, value in enumerate(cell):
+                    total[i] += value
+            series.append(
+                {
+                    "bucket": key,
+                    **_cell_summary(total),
+                    "by_type": {
+                        name: _cell_summary(cell) for name, cell in bucket.items()
+                    },
+                }
+            )
+        return series
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copy of the counters, safe to serialize off-thread."""
+        return {
+            resolution: {
+                key: {name: list(cell) for name, cell in bucket.items()}
+                for key, bucket in buckets.items()
+            }
+            for resolution, buckets in self.buckets.items()
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: Dict[str, Any], hourly_retention_days: int = 90
+    ) -> "MemoryRollups":
+        rollups = cls(hourly_retention_days)
+        for resolution in RESOLUTIONS:
+            rollups.buckets[resolution] = data.get(resolution, {})
+            rollups._keys[resolution] = sorted(rollups.buckets[resolution])
+        rollups.prune()
+        return rollups
@@ -0,0 +1,191 @@
+"""Per-activity-type long-term memory segments, loaded lazily with an LRU bound."""
+
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .memory_entry import MemoryEntry, entry_to_json
+
+logger = logging.getLogger(__name__)
+
+
+def _segment_name(activity_type: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", activity_type) + ".jsonl"
+
+
+def read_last_line(path: Path) -> Optional[str]:
+    """Read the final non-empty line of a file without scanning it all."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        block = b""
+        position = end
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            block = f.read(step) + block
+            lines = block.rstrip(b"\n").split(b"\n")
+            if len(lines) > 1 or position == 0:
+                last = lines[-1].strip()
+                return last.decode("utf-8") if last else None
+    return None
+
+
+def _iter_segment_file(segment_file: Path) -> Iterator[Dict[str, Any]]:
+    with open(segment_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable line in {segment_file}")
+
+
+class LongTermStore:
+    """
+    Long-term memory split into one append-only JSONL segment per activity
+    type under storage/long_term/.
+
+    Startup only builds a small manifest (activity type -> segment file and
+    last seq, read from each segment's final line). A segment's entries are
+    read the first time they are asked for, and at most max_resident
+    segments stay in RAM; the least recently used one is dropped first.
+    """
+
+    def __init__(self, segments_path: Path, max_resident: int = 8):
+        self.segments_path = Path(segments_path)
+        self.max_resident = max(1, max_resident)
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        self._resident: OrderedDict[str, List[Dict[str, Any]]] = OrderedDict()
+
+    def open(self):
+        """Build the manifest from the segment files on disk."""
+        self.segments_path.mkdir(exist_ok=True)
+        self.manifest = {}
+        self._resident.clear()
+        for segment_file in self.segments_path.glob("*.jsonl"):
+            try:
+                last_line = read_last_line(segment_file)
+                if not last_line:
+                    continue
+                last_entry = json.loads(last_line)
+            except json.JSONDecodeError:
+                # Torn final line from a crash: terminate it and fall back
+                # to scanning the segment for its last readable entry
+                logger.warning(f"Repairing torn final line in {segment_file}")
+                with open(segment_file, "a", encoding="utf-8") as f:
+                    f.write("\n")
+                last_entry = None
+                for last_entry in _iter_segment_file(segment_file):
+                    pass
+                if last_entry is None:
+                    continue
+            except OSError as e:
+                logger.warning(f"Could not read tail of {segment_file}: {e}")
+                continue
+            activity_type = last_entry.get("activity_type", segment_file.stem)
+            self.manifest[activity_type] = {
+                "file": segment_file.name,
+                "last_seq": last_entry.get("seq", 0),
+            }
+
+    def types(self) -> List[str]:
+        return list(self.manifest)
+
+    def append(self, entry: Dict[str, Any]):
+        """Append one entry to its segment (skipping entries it already holds)."""
+        activity_type = entry["activity_type"]
+        info = self.manifest.get(activity_type)
+        seq = entry.get("seq", 0)
+        if info and seq and seq <= info["last_seq"]:
+            return  # Already written before a crash/replay
+
+        if info is None:
+            info = self.manifest[activity_type] = {
+                "file": _segment_name(activity_type),
+                "last_seq": 0,
+            }
+        with open(self.segments_path / info["file"], "a", encoding="utf-8") as f:
+            f.write(entry_to_json(entry) + "\n")
+        info["last_seq"] = max(info["last_seq"], seq)
+
+        if activity_type in self._resident:
+            self._resident[activity_type].append(MemoryEntry.from_dict(entry))
+
+    def get(self, activity_type: str, default: Any = None) -> Any:
+        """Entries for one activity type, loading the segment on first access."""
+        if activity_type not in self.manifest:
+            return default
+        if activity_type in self._resident:
+            self._resident.move_to_end(activity_type)
+            return self._resident[activity_type]
+
+        entries = [MemoryEntry.from_dict(e) for e in self._read_segment(activity_type)]
+        self._resident[activity_type] = entries
+        while len(self._resident) > self.max_resident:
+            evicted, _ = self._resident.popitem(last=False)
+            logger.debug(f"Evicted long-term segment {evicted} from memory")
+        return entries
+
+    def _read_segment(self, activity_type: str) -> Iterator[Dict[str, Any]]:
+        segment_file = self.segments_path / self.manifest[activity_type]["file"]
+        if segment_file.exists():
+            yield from _iter_segment_file(segment_file)
+
+    def size_bytes(self, activity_type: str) -> int:
+        """Current on-disk size of a segment."""
+        info = self.manifest.get(activity_type)
+        if not info:
+            return 0
+        try:
+            return (self.segments_path / info["file"]).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def rewrite(self, activity_type: str, entries: List[Dict[str, Any]]):
+        """
+        Atomically replace a segment's contents (used when trimming to archive
+        and when entries are renumbered).
+        """
+        info = self.manifest[activity_type]
+        segment_file = self.segments_path / info["file"]
+        temp_file = segment_file.with_suffix(".jsonl.tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            f.writelines(entry_to_json(entry) + "\n" for entry in entries)
+        temp_file.replace(segment_file)
+        if entries:
+            info["last_seq"] = entries[-1].get("seq", 0)
+        if activity_type in self._resident:
+            self._resident[activity_type] = list(entries)
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Stream every long-term entry without keeping segments resident."""
+        for activity_type in self.types():
+            yield from self.iter_type(activity_type)
+
+    def iter_type(self, activity_type: str) -> Iterator[Dict[str, Any]]:
+        """Stream one activity type's entries without making its segment resident."""
+        if activity_type in self._resident:
+            yield from self._resident[activity_type]
+        elif activity_type in self.manifest:
+            yield from self._read_segment(activity_type)
+
+    def resident_types(self) -> List[str]:
+        return list(self._resident)
+
+    def clear(self):
+        """Delete all segments."""
+        for info in self.manifest.values():
+            try:
+                (self.segments_path / info["file"]).unlink()
+            except FileNotFoundError:
+                pass
+        self.manifest = {}
+        self._resident.clear()
@@ -0,0 +1,642 @@
+"""SQLite-backed Memory store (storage_mode "sqlite")."""
+
+import json
+import logging
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from .memory import Memory, decode_cursor
+from .memory_entry import (
+    ARTIFACT_KINDS,
+    OUTCOME_TIMEOUT,
+    MemoryEntry,
+    extract_artifacts,
+)
+from .memory_export import record_id
+from .memory_index import entry_tokens, tokenize
+from .memory_rollups import RESOLUTIONS, MemoryRollups
+from .memory_segments import LongTermStore
+from .memory_stats import DURATION_WINDOW, ActivityStats, MemoryStats
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    activity_type TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    error TEXT,
+    data TEXT,
+    metadata TEXT,
+    duration REAL,
+    artifacts TEXT,
+    energy REAL
+);
+CREATE INDEX IF NOT EXISTS idx_memories_type_ts ON memories (activity_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_memories_success ON memories (success);
+CREATE INDEX IF NOT EXISTS idx_memories_ts ON memories (timestamp);
+"""
+
+COLUMNS = (
+    "seq, timestamp, activity_type, success, error, data, metadata, duration, "
+    "artifacts, energy"
+)
+INSERT_SQL = (
+    "INSERT INTO memories (timestamp, activity_type, success, error, data, "
+    "metadata, duration, artifacts, energy) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Contentless full-text index keyed by memories.seq; the body is the same
+# token set the in-process index uses
+FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5("
+    "body, content='', tokenize='unicode61 remove_diacritics 0')"
+)
+FTS_INSERT_SQL = "INSERT INTO memories_fts (rowid, body) VALUES (?, ?)"
+
+# Number of most recent entries mirrored in short_term_memory
+SHORT_TERM_WINDOW = 50
+
+# Rows fetched per query when streaming the whole table
+HISTORY_CHUNK_ROWS = 1000
+
+
+class SQLiteMemory(Memory):
+    """
+    Memory with the same public methods, stored in storage/memory.db.
+
+    The database runs in SQLite WAL mode, so other processes (the onboarding
+    CLI, a second being) can read while this one writes. Recent-N and
+    per-type history lookups are served by index seeks instead of sorting
+    Python lists. short_term_memory is kept as a small mirror of the newest
+    rows for callers that read it directly; long_term_memory stays empty.
+    Every row stays in the table, so retention limits are not supported.
+    """
+
+    def __init__(
+        self,
+        storage_path: str = "./storage",
+        embedding_dim: int = 256,
+        blob_threshold: int = 1024,
+        retention: Optional[Dict[str, Dict[str, Any]]] = None,
+        rollup_hourly_days: int = 90,
+    ):
+        if retention:
+            raise ValueError(
+                "Memory retention is not supported with storage_mode 'sqlite'; "
+                "remove memory_config['retention'] or use 'json' or 'wal'"
+            )
+        self.db_file = Path(storage_path) / "memory.db"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._fts = True
+        super().__init__(
+            storage_path,
+            embedding_dim=embedding_dim,
+            blob_threshold=blob_threshold,
+            rollup_hourly_days=rollup_hourly_days,
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.db_file, timeout=10, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(memories)")
+            }
+            if "duration" not in columns:
+                # Databases created before durations were recorded
+                self._conn.execute("ALTER TABLE memories ADD COLUMN duration REAL")
+            if "artifacts" not in columns:
+                # Databases created before artifacts were extracted
+                self._conn.execute("ALTER TABLE memories ADD COLUMN artifacts TEXT")
+            if "energy" not in columns:
+                # Databases created before energy spent was recorded
+                self._conn.execute("ALTER TABLE memories ADD COLUMN energy REAL")
+            try:
+                self._conn.execute(FTS_SCHEMA)
+            except sqlite3.OperationalError as e:
+                logger.warning(f"SQLite FTS5 unavailable, memory search will scan: {e}")
+                self._fts = False
+        return self._conn
+
+    def _load_memory(self):
+        """Open the database, import memory.json once, and load the recent window."""
+        try:
+            with self._db_lock:
+                conn = self._connect()
+                (count,) = conn.execute("SELECT COUNT(*) FROM memories").fetchone()
+                if count == 0 and self.memory_file.exists():
+                    self._import_json_file(conn)
+                self._backfill_fts(conn)
+                self._backfill_vectors(conn)
+                self.stats = self._load_stats(conn)
+                self.rollups = self._load_rollups(
+                    conn, self.rollups.hourly_retention_days
+                )
+
+            self._load_recent()
+            self.long_term_memory = {}
+        except Exception as e:
+            logger.error(f"Failed to load memory database: {e}")
+            self.short_term_memory = deque(maxlen=SHORT_TERM_WINDOW)
+            self.long_term_memory = {}
+
+    def _load_recent(self):
+        """Mirror the most recent entries (by timestamp) in short_term_memory."""
+        rows = self._query(
+            f"SELECT {COLUMNS} FROM memories ORDER BY timestamp DESC, seq DESC LIMIT ?",
+            (SHORT_TERM_WINDOW,),
+        )
+        self.short_term_memory = deque(
+            (MemoryEntry.from_dict(self._row_to_entry(row)) for row in reversed(rows)),
+            maxlen=SHORT_TERM_WINDOW,
+        )
+        self._last_seq = self._query("SELECT COALESCE(MAX(seq), 0) FROM memories")[0][0]
+
+    def _import_json_file(self, conn: sqlite3.Connection):
+        """One-time migration of an existing memory.json into the database."""
+        try:
+            with open(self.memory_file, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Could not import {self.memory_file}: {e}")
+            return
+        if not isinstance(data, dict):
+            return
+
+        entries = [
+            entry
+            for activities in data.get("long_term", {}).values()
+            for entry in activities
+        ]
+        segments = LongTermStore(self.storage_path / "long_term")
+        segments.open()
+        entries.extend(segments.iter_entries())
+        entries.extend(data.get("short_term", []))
+        entries.sort(key=lambda x: x.get("timestamp", ""))
+
+        with conn:
+            conn.executemany(
+                INSERT_SQL,
+                [self._entry_params(entry) for entry in entries],
+            )
+        logger.info(f"Imported {len(entries)} entries from {self.memory_file}")
+
+    def _backfill_fts(self, conn: sqlite3.Connection):
+        """Index rows added since the full-text index was last updated."""
+        if not self._fts:
+            return
+        (indexed_seq,) = conn.execute("SELECT MAX(rowid) FROM memories_fts").fetchone()
+        rows = conn.execute(
+            f"SELECT {COLUMNS} FROM memories WHERE seq > ? ORDER BY seq",
+            (indexed_seq or 0,),
+        ).fetchall()
+        if not rows:
+            return
+        with conn:
+            conn.executemany(
+                FTS_INSERT_SQL,
+                [
+                    self._fts_params(self._resolve_payloads(self._row_to_entry(row)))
+                    for row in rows
+                ],
+            )
+        logger.info(f"Indexed {len(rows)} memory rows for search")
+
+    def _backfill_vectors(self, conn: sqlite3.Connection):
+        """Embed rows added since the vector store was last flushed."""
+        (last_seq,) = conn.execute("SELECT MAX(seq) FROM memories").fetchone()
+        if not self.vectors.open() or self.vectors.max_seq > (last_seq or 0):
+            # Missing, or written for another store in the same directory
+            self.vectors.clear()
+        cursor = conn.execute(
+            f"SELECT {COLUMNS} FROM memories WHERE seq > ? ORDER BY seq",
+            (self.vectors.max_seq,),
+        )
+        added = 0
+        while rows := cursor.fetchmany(1000):
+            self._embed_entries(
+                [self._resolve_payloads(self._row_to_entry(row)) for row in rows]
+            )
+            added += len(rows)
+        if added:
+            self.vectors.flush()
+            logger.info(f"Embedded {added} memory rows for recall")
+
+    @staticmethod
+    def _fts_params(entry: Dict[str, Any]) -> tuple:
+        return (entry["seq"], " ".join(sorted(entry_tokens(entry))))
+
+    @staticmethod
+    def _entry_params(entry: Dict[str, Any]) -> tuple:
+        artifacts = entry.get("artifacts")
+        if artifacts is None:
+            artifacts = extract_artifacts(entry.get("data"), entry.get("metadata"))
+        return (
+            entry.get("timestamp", ""),
+            entry.get("activity_type", "Unknown"),
+            1 if entry.get("success") else 0,
+            entry.get("error"),
+            json.dumps(entry.get("data")),
+            json.dumps(entry.get("metadata", {})),
+            entry.get("duration"),
+            json.dumps(artifacts) if artifacts else None,
+            entry.get("energy"),
+        )
+
+    @staticmethod
+    def _row_to_entry(row: tuple) -> Dict[str, Any]:
+        (
+            seq,
+            timestamp,
+            activity_type,
+            success,
+            error,
+            data,
+            metadata,
+            duration,
+            artifacts,
+            energy,
+        ) = row
+        return {
+            "seq": seq,
+            "timestamp": timestamp,
+            "activity_type": activity_type,
+            "success": bool(success),
+            "error": error,
+            "data": json.loads(data) if data else None,
+            "metadata": json.loads(metadata) if metadata else {},
+            "duration": duration,
+            "artifacts": json.loads(artifacts) if artifacts else {},
+            "energy": energy,
+        }
+
+    @staticmethod
+    def _load_stats(conn: sqlite3.Connection) -> MemoryStats:
+        """Seed the running aggregates with one grouped scan of the table."""
+        stats = MemoryStats()
+        rows = conn.execute(
+            "SELECT activity_type, COUNT(*), SUM(success), MAX(timestamp), "
+            "TOTAL(duration), COUNT(duration), "
+            "TOTAL(LENGTH(CAST(data AS BLOB)) + LENGTH(CAST(metadata AS BLOB)) + 3), "
+            "SUM(NOT success AND json_extract(metadata, '$.outcome') = ?) "
+            "FROM memories GROUP BY activity_type",
+            (OUTCOME_TIMEOUT,),
+        ).fetchall()
+        for (
+            activity_type,
+            count,
+            successes,
+            last_ts,
+            dur_total,
+            dur_count,
+            size,
+            timeouts,
+        ) in rows:
+            durations = conn.execute(
+                "SELECT duration FROM memories WHERE activity_type = ? "
+                "AND duration IS NOT NULL ORDER BY timestamp DESC LIMIT ?",
+                (activity_type, DURATION_WINDOW),
+            ).fetchall()
+            stats.by_type[activity_type] = ActivityStats.from_dict(
+                {
+                    "count": count,
+                    "success_count": successes or 0,
+                    "failure_count": count - (successes or 0),
+                    "timeout_count": timeouts or 0,
+                    "last_timestamp": last_ts,
+                    "duration_total": dur_total,
+                    "duration_count": dur_count,
+                    "recent_durations": [d for (d,) in reversed(durations)],
+                    "payload_bytes": int(size),
+                }
+            )
+            stats.total_count += count
+        return stats
+
+    @staticmethod
+    def _load_rollups(
+        conn: sqlite3.Connection, hourly_retention_days: int
+    ) -> MemoryRollups:
+        """Seed the hourly/daily rollups with one grouped scan per resolution."""
+        data: Dict[str, Any] = {}
+        for resolution, length in RESOLUTIONS.items():
+            buckets = data[resolution] = {}
+            rows = conn.execute(
+                f"SELECT SUBSTR(timestamp, 1, {length}) AS bucket, activity_type, "
+                "COUNT(*), SUM(success), TOTAL(energy), TOTAL(duration), COUNT(duration) "
+                "FROM memories GROUP BY bucket, activity_type"
+            ).fetchall()
+            # Columns are in the rollup cell layout: count, successes,
+            # energy, duration total, duration count
+            for bucket, activity_type, *counters in rows:
+                cell = [value or 0 for value in counters]
+                buckets.setdefault(bucket, {})[activity_type] = cell
+        return MemoryRollups.from_dict(data, hourly_retention_days)
+
+    def _append_entry(self, memory_entry: Dict[str, Any]):
+        """Insert a new entry; the database assigns its seq."""
+        original = dict(memory_entry)
+        self._externalize_payloads(memory_entry)
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(INSERT_SQL, self._entry_params(memory_entry))
+                memory_entry["seq"] = original["seq"] = cursor.lastrowid
+                if self._fts:
+                    conn.execute(FTS_INSERT_SQL, self._fts_params(original))
+        self._last_seq = cursor.lastrowid
+        self.short_term_memory.append(memory_entry)
+        self.stats.record(original)
+        self.rollups.record(original)
+        self._embed_entry(original)
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._db_lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def get_recent_activities(
+        self, limit: int = 10, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Get recent activities (newest first) across the whole history."""
+        rows = self._query(
+            f"SELECT {COLUMNS} FROM memories ORDER BY timestamp DESC, seq DESC "
+            "LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+        activities = []
+        for row in rows:
+            entry = self._resolve_payloads(self._row_to_entry(row))
+            del entry["seq"]
+            entry["timestamp"] = self._format_timestamp(entry["timestamp"])
+            activities.append(entry)
+        return activities
+
+    def get_activity_history(
+        self,
+        activity_type: str,
+        include_archive: bool = False,
+        since: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get history of specific activity type (oldest first).
+        Everything lives in the database, so include_archive has no effect.
+        """
+        rows = self._query(
+            f"SELECT {COLUMNS} FROM memories WHERE activity_type = ? AND timestamp >= ? "
+            "ORDER BY timestamp",
+            (activity_type, since or ""),
+        )
+        return [
+            {**entry, "timestamp": self._format_timestamp(entry["timestamp"])}
+            for entry in map(self._resolve_payloads, map(self._row_to_entry, rows))
+        ]
+
+    def get_history_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        activity_type: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """One page of history, newest first (see Memory.get_history_page)."""
+        sql = f"SELECT {COLUMNS} FROM memories WHERE 1"
+        params: list = []
+        if cursor:
+            timestamp, seq = decode_cursor(cursor)
+            sql += " AND (timestamp < ? OR (timestamp = ? AND seq < ?))"
+            params += [timestamp, timestamp, seq]
+        if activity_type:
+            sql += " AND activity_type = ?"
+            params.append(activity_type)
+        if success is not None:
+            sql += " AND success = ?"
+            params.append(int(bool(success)))
+        if since:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        if until:
+            sql += " AND timestamp < ?"
+            params.append(until)
+        sql += " ORDER BY timestamp DESC, seq DESC LIMIT ?"
+        params.append(limit + 1)
+
+        rows = self._query(sql, tuple(params))
+        entries = [self._row_to_entry(row) for row in rows[:limit]]
+        return self._history_page(entries, has_more=len(rows) > limit)
+
+    def count_activities(
+        self, activity_type: Optional[str] = None, success: Optional[bool] = None
+    ) -> int:
+        """Number of stored entries of a type and/or outcome (including other writers)."""
+        sql = "SELECT COUNT(*) FROM memories WHERE 1"
+        params: list = []
+        if activity_type is not None:
+            sql += " AND activity_type = ?"
+            params.append(activity_type)
+        if success is not None:
+            sql += " AND success = ?"
+            params.append(int(bool(success)))
+        return self._query(sql, tuple(params))[0][0]
+
+    def search(
+        self,
+        query: str,
+        activity_type: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Find entries containing every word of the query, newest first."""
+        tokens = sorted(set(tokenize(query)))
+        if not tokens or limit <= 0:
+            return []
+
+        if self._fts:
+            sql = (
+                f"SELECT {', '.join('m.' + c for c in COLUMNS.split(', '))} "
+                "FROM memories_fts JOIN memories m ON m.seq = memories_fts.rowid "
+                "WHERE memories_fts MATCH ?"
+            )
+            params: list = [" ".join(f'"{token}"' for token in tokens)]
+        else:
+            sql = f"SELECT {COLUMNS} FROM memories m WHERE 1"
+            params = []
+            for token in tokens:
+                sql += " AND (LOWER(m.data) LIKE ? OR LOWER(m.metadata) LIKE ?)"
+                params += [f"%{token}%", f"%{token}%"]
+        if activity_type:
+            sql += " AND m.activity_type = ?"
+            params.append(activity_type)
+        if since:
+            sql += " AND m.timestamp >= ?"
+            params.append(since)
+        sql += " ORDER BY m.seq DESC LIMIT ?"
+        params.append(limit)
+
+        return [
+            {**entry, "timestamp": self._format_timestamp(entry["timestamp"])}
+            for entry in map(
+                self._resolve_payloads,
+                map(self._row_to_entry, self._query(sql, tuple(params))),
+            )
+        ]
+
+    def _find_entry(
+        self, seq: int, activity_type: str, timestamp: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        rows = self._query(f"SELECT {COLUMNS} FROM memories WHERE seq = ?", (seq,))
+        return self._row_to_entry(rows[0]) if rows else None
+
+    def get_artifacts(
+        self,
+        kind: str,
+        activity_type: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Artifacts of one kind across all history, newest first."""
+        if kind not in ARTIFACT_KINDS:
+            logger.warning(f"Unknown artifact kind: {kind}")
+            return []
+        sql = (
+            "SELECT seq, timestamp, activity_type, artifacts FROM memories "
+            "WHERE artifacts IS NOT NULL AND timestamp >= ?"
+        )
+        params: list = [since or ""]
+        if activity_type:
+            sql += " AND activity_type = ?"
+            params.append(activity_type)
+        sql += " ORDER BY seq DESC"
+
+        found = []
+        with self._db_lock:
+            cursor = self._connect().execute(sql, tuple(params))
+            for seq, timestamp, entry_type, artifacts in cursor:
+                for value in reversed(json.loads(artifacts).get(kind, [])):
+                    found.append(
+                        {
+                            "value": value,
+                            "seq": seq,
+                            "timestamp": timestamp,
+                            "activity_type": entry_type,
+                        }
+                    )
+                    if len(found) >= limit:
+                        return found
+        return found
+
+    def _record_ids(self) -> Set[str]:
+        return {
+            record_id(timestamp, activity_type)
+            for timestamp, activity_type in self._query(
+                "SELECT timestamp, activity_type FROM memories"
+            )
+        }
+
+    def _import_batch(self, entries: List[MemoryEntry]):
+        """Insert imported entries in one transaction; the database assigns seqs."""
+        entries.sort(key=lambda e: e.timestamp)
+        originals = [dict(entry) for entry in entries]
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                for entry, original in zip(entries, originals):
+                    self._externalize_payloads(entry)
+                    cursor = conn.execute(INSERT_SQL, self._entry_params(entry))
+                    entry.seq = original["seq"] = cursor.lastrowid
+                    if self._fts:
+                        conn.execute(FTS_INSERT_SQL, self._fts_params(original))
+        for original in originals:
+            self.stats.record(original)
+            self.rollups.record(original)
+        self._embed_entries(originals)
+
+    def _finish_import(self):
+        self._load_recent()
+        self.vectors.flush()
+
+    def apply_retention(self, activity_type: Optional[str] = None) -> int:
+        raise NotImplementedError(
+            "Memory retention is not supported with storage_mode 'sqlite'"
+        )
+
+    def _iter_entries(self, include_archive: bool = False):
+        """Every row, oldest first; nothing is archived in this mode."""
+        return self._iter_history()
+
+    def _iter_history(self) -> Iterator[Dict[str, Any]]:
+        """Every entry oldest first, read in keyset-paginated chunks."""
+        timestamp, seq = "", 0
+        while True:
+            rows = self._query(
+                f"SELECT {COLUMNS} FROM memories "
+                "WHERE timestamp > ? OR (timestamp = ? AND seq > ?) "
+                "ORDER BY timestamp, seq LIMIT ?",
+                (timestamp, timestamp, seq, HISTORY_CHUNK_ROWS),
+            )
+            yield from map(self._row_to_entry, rows)
+            if len(rows) < HISTORY_CHUNK_ROWS:
+                return
+            seq, timestamp = rows[-1][0], rows[-1][1]
+
+    def get_activity_count(self) -> int:
+        """Get total number of activities in memory (including other writers)."""
+        return self._query("SELECT COUNT(*) FROM memories")[0][0]
+
+    def get_last_activity_timestamp(self) -> str:
+        """Get formatted timestamp of the last activity."""
+        (timestamp,) = self._query("SELECT MAX(timestamp) FROM memories")[0]
+        if timestamp is None:
+            return "No activities recorded"
+        return self._format_timestamp(timestamp)
+
+    def persist(self):
+        """Every insert is committed immediately; nothing to flush."""
+
+    def attach_persister(self, persister):
+        """Inserts are committed as they happen, so there is nothing to write behind."""
+
+    def compact(self, wait: bool = False):
+        """Checkpoint the SQLite WAL back into the main database file."""
+        try:
+            with self._db_lock:
+                self._connect().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception as e:
+            logger.error(f"Failed to checkpoint memory database: {e}")
+
+    def close(self):
+        """Checkpoint and close the database connection."""
+        self.compact()
+        self.vectors.flush()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def clear(self):
+        """Clear all memory."""
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM memories")
+                if self._fts:
+                    conn.execute(
+                        "INSERT INTO memories_fts (memories_fts) VALUES ('delete-all')"
+                    )
+        self.short_term_memory = deque(maxlen=SHORT_TERM_WINDOW)
+        self.long_term_memory = {}
+        self.stats = MemoryStats()
+        self.rollups = MemoryRollups(self.rollups.hourly_retention_days)
+        self.vectors.clear()
+        self.blobs.clear()
@@ -0,0 +1,159 @@
+"""Running per-activity-type aggregates maintained by Memory."""
+
+import json
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional
+
+from .memory_entry import OUTCOME_TIMEOUT, entry_outcome
+
+# How many recent durations per activity type feed the p95 estimate
+DURATION_WINDOW = 100
+
+
+class ActivityStats:
+    """Aggregates for a single activity type, updated in O(1) per record."""
+
+    def __init__(self):
+        self.count = 0
+        self.success_count = 0
+        self.failure_count = 0
+        self.timeout_count = 0  # Included in failure_count
+        self.last_timestamp: Optional[str] = None
+        self.duration_total = 0.0
+        self.duration_count = 0
+        self.recent_durations: Deque[float] = deque(maxlen=DURATION_WINDOW)
+        self.payload_bytes = 0
+        self._p95_cache: Optional[float] = None
+
+    def record(self, entry: Dict[str, Any]):
+        self.count += 1
+        if entry.get("success"):
+            self.success_count += 1
+        else:
+            self.failure_count += 1
+            if entry_outcome(entry) == OUTCOME_TIMEOUT:
+                self.timeout_count += 1
+
+        timestamp = entry.get("timestamp")
+        if timestamp and (
+            self.last_timestamp is None or timestamp > self.last_timestamp
+        ):
+            self.last_timestamp = timestamp
+
+        duration = entry.get("duration")
+        if duration is not None:
+            self.duration_total += duration
+            self.duration_count += 1
+            self.recent_durations.append(duration)
+            self._p95_cache = None
+
+        self.payload_bytes += payload_size(entry)
+
+    @property
+    def p95_duration(self) -> Optional[float]:
+        if not self.recent_durations:
+            return None
+        if self._p95_cache is None:
+            ordered = sorted(self.recent_durations)
+            index = max(0, math.ceil(0.95 * len(ordered)) - 1)
+            self._p95_cache = ordered[index]
+        return self._p95_cache
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form, including the raw counters needed to resume."""
+        return {
+            "count": self.count,
+            "success_count": self.success_count,
+            "failure_count": self.failure_count,
+            "timeout_count": self.timeout_count,
+            "last_timestamp": self.last_timestamp,
+            "duration_total": self.duration_total,
+            "duration_count": self.duration_count,
+            "recent_durations": list(self.recent_durations),
+            "payload_bytes": self.payload_bytes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ActivityStats":
+        stats = cls()
+        stats.count = data.get("count", 0)
+        stats.success_count = data.get("success_count", 0)
+        stats.failure_count = data.get("failure_count", 0)
+        stats.timeout_count = data.get("timeout_count", 0)
+        stats.last_timestamp = data.get("last_timestamp")
+        stats.duration_total = data.get("duration_total", 0.0)
+        stats.duration_count = data.get("duration_count", 0)
+        stats.recent_durations.extend(data.get("recent_durations", []))
+        stats.payload_bytes = data.get("payload_bytes", 0)
+        return stats
+
+    def summary(self) -> Dict[str, Any]:
+        """Read-only view for the UI and the selector."""
+        return {
+            "count": self.count,
+            "success_count": self.success_count,
+            "failure_count": self.failure_count,
+            "timeout_count": self.timeout_count,
+            "success_rate": (self.success_count / self.count) if self.count else None,
+            "last_timestamp": self.last_timestamp,
+            "mean_duration": (
+                self.duration_total / self.duration_count
+                if self.duration_count
+                else None
+            ),
+            "p95_duration": self.p95_duration,
+            "payload_bytes": self.payload_bytes,
+        }
+
+
+class MemoryStats:
+    """Per-activity-type aggregates plus a running total."""
+
+    def __init__(self):
+        self.by_type: Dict[str, ActivityStats] = {}
+        self.total_count = 0
+
+    def record(self, entry: Dict[str, Any]):
+        activity_type = entry.get("activity_type", "Unknown")
+        stats = self.by_type.get(activity_type)
+        if stats is None:
+            stats = self.by_type[activity_type] = ActivityStats()
+        stats.record(entry)
+        self.total_count += 1
+
+    def rebuild(self, entries: Iterable[Dict[str, Any]]):
+        """Recompute from scratch (used for memory files written before stats existed)."""
+        self.by_type = {}
+        self.total_count = 0
+        for entry in entries:
+            self.record(entry)
+
+    def summary(self, activity_type: Optional[str] = None) -> Dict[str, Any]:
+        if activity_type is not None:
+            stats = self.by_type.get(activity_type)
+            return stats.summary() if stats else ActivityStats().summary()
+        return {name: stats.summary() for name, stats in self.by_type.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: stats.to_dict() for name, stats in self.by_type.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MemoryStats":
+        memory_stats = cls()
+        for name, stats in data.items():
+            memory_stats.by_type[name] = ActivityStats.from_dict(stats)
+        memory_stats.total_count = sum(s.count for s in memory_stats.by_type.values())
+        return memory_stats
+
+
+def payload_size(entry: Dict[str, Any]) -> int:
+    """Approximate serialized size in bytes of an entry's data and metadata."""
+    try:
+        return len(
+            json.dumps(
+                [entry.get("data"), entry.get("metadata")], separators=(",", ":")
+            ).encode("utf-8")
+        )
+    except (TypeError, ValueError):
+        return 0
@@ -0,0 +1,262 @@
+"""Local embeddings and a memory-mapped vector store for semantic recall."""
+
+import json
+import logging
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .memory_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+VECTORS_VERSION = 1
+
+# Rows added between flushes of the row count to disk. Kept at or below the
+# short-term capacity so that after a crash the missing rows can always be
+# re-embedded from short-term memory instead of rebuilding everything.
+FLUSH_INTERVAL = 100
+
+INITIAL_CAPACITY = 1024
+
+# Rows scored per matrix product in search(), bounding temporary memory
+SEARCH_BATCH_ROWS = 65536
+
+
+class HashingEmbedder:
+    """
+    Dependency-free text embedder: word unigrams and character trigrams are
+    hashed (crc32, stable across processes) into a fixed number of signed
+    buckets, and the resulting vector is L2-normalized so that a dot
+    product is the cosine similarity.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[bytes]:
+        features = []
+        for token in tokenize(text):
+            features.append(token.encode("utf-8"))
+            padded = f"<{token}>"
+            features.extend(
+                ("#" + padded[i : i + 3]).encode("utf-8")
+                for i in range(len(padded) - 2)
+            )
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        features = self._features(text)
+        if not features:
+            return np.zeros(self.dim, dtype=np.float32)
+        hashes = np.fromiter(
+            (zlib.crc32(f) for f in features), dtype=np.uint32, count=len(features)
+        )
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+        vector = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.astype(np.float32)
+
+    def embed_batch(self, texts: Iterable[str]) -> np.ndarray:
+        return np.vstack([self.embed(text) for text in texts])
+
+
+class VectorStore:
+    """
+    One embedding per memory entry, in a contiguous float32 matrix backed by
+    a memory-mapped file (storage/vectors/vectors.f32), with parallel seq and
+    activity-type-code arrays. The files grow by doubling; vectors.json
+    records how many rows are valid, so rows written after the last flush
+    are simply ignored after a crash.
+    """
+
+    def __init__(self, vectors_path: Path, dim: int = 256):
+        self.vectors_path = Path(vectors_path)
+        self.dim = dim
+        self.meta_file = self.vectors_path / "vectors.json"
+        self.count = 0
+        self.capacity = 0
+        self.max_seq = 0
+        self.type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._seqs: Optional[np.memmap] = None
+        self._types: Optional[np.memmap] = None
+        self._unflushed = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _files(self) -> Tuple[Path, Path, Path]:
+        return (
+            self.vectors_path / "vectors.f32",
+            self.vectors_path / "seqs.i64",
+            self.vectors_path / "types.i32",
+        )
+
+    def _map(self, capacity: int):
+        """(Re)map the backing files at the given row capacity."""
+        self.vectors_path.mkdir(parents=True, exist_ok=True)
+        self._close_maps()
+        layout = zip(
+            self._files(),
+            (np.float32, np.int64, np.int32),
+            ((capacity, self.dim), (capacity,), (capacity,)),
+        )
+        maps = []
+        for path, dtype, shape in layout:
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            with open(path, "ab") as f:
+                if f.tell() < size:
+                    f.truncate(size)
+            maps.append(np.memmap(path, dtype=dtype, mode="r+", shape=shape))
+        self._vectors, self._seqs, self._types = maps
+        self.capacity = capacity
+
+    def _close_maps(self):
+        for array in (self._vectors, self._seqs, self._types):
+            if array is not None:
+                array.flush()
+        self._vectors = self._seqs = self._types = None
+
+    def open(self) -> bool:
+        """Map the stored vectors; returns False if there are none usable."""
+        self.reset()
+        if not self.meta_file.exists():
+            return False
+        try:
+            with open(self.meta_file, "r") as f:
+                meta = json.load(f)
+            if meta.get("version") != VECTORS_VERSION or meta.get("dim") != self.dim:
+                return False
+            self._map(max(meta["capacity"], INITIAL_CAPACITY))
+            self.count = meta["count"]
+            self.max_seq = meta["max_seq"]
+            self.type_names = meta["types"]
+            self._type_codes = {name: i for i, name in enumerate(self.type_names)}
+            return True
+        except Exception as e:
+            logger.warning(f"Could not open memory vectors, they will be rebuilt: {e}")
+            self.reset()
+            return False
+
+    def _type_code(self, activity_type: str) -> int:
+        code = self._type_codes.get(activity_type)
+        if code is None:
+            code = self._type_codes[activity_type] = len(self.type_names)
+            self.type_names.append(activity_type)
+        return code
+
+    def add(self, seq: int, activity_type: str, vector: np.ndarray):
+        self.add_batch([seq], [activity_type], vector.reshape(1, -1))
+
+    def add_batch(
+        self, seqs: List[int], activity_types: List[str], vectors: np.ndarray
+    ):
+        """Append rows, growing the backing files as needed."""
+        needed = self.count + len(seqs)
+        if needed > self.capacity:
+            capacity = max(self.capacity, INITIAL_CAPACITY)
+            while capacity < needed:
+                capacity *= 2
+            self._map(capacity)
+
+        end = self.count + len(seqs)
+        self._vectors[self.count : end] = vectors
+        self._seqs[self.count : end] = seqs
+        self._types[self.count : end] = [self._type_code(t) for t in activity_types]
+        self.count = end
+        self.max_seq = max(self.max_seq, max(seqs))
+
+        self._unflushed += len(seqs)
+        if self._unflushed >= FLUSH_INTERVAL:
+            self.flush()
+
+    def search(
+        self, query: np.ndarray, k: int = 5, activity_type: Optional[str] = None
+    ) -> List[Tuple[int, str, float]]:
+        """
+        Top-k (seq, activity type, cosine score) by a matrix product over
+        the stored rows, in fixed-size batches so memory use stays flat for
+        very large stores.
+        """
+        if self.count == 0 or k <= 0:
+            return []
+        type_code = None
+        if activity_type is not None:
+            type_code = self._type_codes.get(activity_type)
+            if type_code is None:
+                return []
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, self.count, SEARCH_BATCH_ROWS):
+            end = min(start + SEARCH_BATCH_ROWS, self.count)
+            scores = self._vectors[start:end] @ query
+            rows = np.arange(start, end)
+            if type_code is not None:
+                keep = self._types[start:end] == type_code
+                scores, rows = scores[keep], rows[keep]
+            scores = np.concatenate([best_scores, scores])
+            rows = np.concatenate([best_rows, rows])
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                scores, rows = scores[top], rows[top]
+            best_scores, best_rows = scores, rows
+
+        order = np.argsort(-best_scores, kind="stable")
+        return [
+            (
+                int(self._seqs[best_rows[i]]),
+                self.type_names[self._types[best_rows[i]]],
+                float(best_scores[i]),
+            )
+            for i in order
+        ]
+
+    def flush(self) -> bool:
+        """Flush the mapped rows, then record how many of them are valid."""
+        if self._vectors is None:
+            return True
+        try:
+            for array in (self._vectors, self._seqs, self._types):
+                array.flush()
+            temp_file = self.meta_file.with_suffix(".json.tmp")
+            with open(temp_file, "w") as f:
+                json.dump(
+                    {
+                        "version": VECTORS_VERSION,
+                        "dim": self.dim,
+                        "count": self.count,
+                        "capacity": self.capacity,
+                        "max_seq": self.max_seq,
+                        "types": self.type_names,
+                    },
+                    f,
+                )
+            temp_file.replace(self.meta_file)
+            self._unflushed = 0
+            return True
+        except Exception as e:
+            logger.error(f"Failed to flush memory vectors: {e}")
+            return False
+
+    def reset(self):
+        """Forget all rows (files are overwritten as new rows are added)."""
+        self._close_maps()
+        self.count = 0
+        self.capacity = 0
+        self.max_seq = 0
+        self.type_names = []
+        self._type_codes = {}
+        self._unflushed = 0
+
+    def clear(self):
+        """Forget all rows and delete the backing files."""
+        self.reset()
+        for path in (*self._files(), self.meta_file):
+            path.unlink(missing_ok=True)
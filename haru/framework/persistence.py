@@ -0,0 +1,129 @@
+"""Write-behind persistence shared by Memory and State."""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindPersister:
+    """
+    Coalesces saves of registered stores and writes them off the event loop.
+
+    Stores call mark_dirty() instead of writing. A background asyncio task
+    wakes on the first mark, waits flush_interval_ms so that further marks
+    collapse into the same write, takes a snapshot of each dirty store on the
+    loop thread, and hands the snapshots to a thread executor for the actual
+    disk I/O. flush() writes everything synchronously (used at shutdown).
+
+    Until start() is called (e.g. a being used outside an event loop),
+    mark_dirty() writes through immediately, as before.
+    """
+
+    def __init__(self, flush_interval_ms: int = 500):
+        self.flush_interval = max(0, flush_interval_ms) / 1000
+        # name -> (snapshot_fn run on the loop thread, write_fn run in a worker)
+        self._stores: Dict[str, Tuple[Callable[[], Any], Callable[[Any], None]]] = {}
+        self._dirty: Set[str] = set()
+        self._generation: Dict[str, int] = {}
+        self._written: Dict[str, int] = {}
+        self._write_lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flush_count = 0
+        self.coalesced_count = 0
+
+    def register(
+        self, name: str, snapshot: Callable[[], Any], write: Callable[[Any], None]
+    ):
+        """Register a store by name with its snapshot and write callables."""
+        self._stores[name] = (snapshot, write)
+        self._generation.setdefault(name, 0)
+        self._written.setdefault(name, 0)
+
+    def mark_dirty(self, name: str):
+        """Schedule a store to be written at the next flush."""
+        if name not in self._stores:
+            logger.warning(f"mark_dirty called for unregistered store: {name}")
+            return
+
+        if self._task is None or self._task.done():
+            self._write_all(self._take_snapshots({name}))
+            return
+
+        if name in self._dirty:
+            self.coalesced_count += 1
+        self._dirty.add(name)
+        self._wakeup.set()
+
+    def start(self):
+        """Start the background flush task on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        if self._dirty:
+            self._wakeup.set()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(
+            f"Write-behind persistence started (flush interval {self.flush_interval:.3f}s)"
+        )
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await self._wakeup.wait()
+                # Let further saves within the window collapse into this flush
+                await asyncio.sleep(self.flush_interval)
+                self._wakeup.clear()
+                pending = self._take_snapshots()
+                if pending:
+                    await loop.run_in_executor(None, self._write_all, pending)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in write-behind flush: {e}")
+
+    def _take_snapshots(
+        self, names: Optional[Set[str]] = None
+    ) -> List[Tuple[str, int, Any]]:
+        """Snapshot dirty stores on the calling (loop) thread."""
+        if names is None:
+            names = set(self._dirty)
+        self._dirty -= names
+
+        pending = []
+        for name in names:
+            snapshot_fn, _ = self._stores[name]
+            try:
+                self._generation[name] += 1
+                pending.append((name, self._generation[name], snapshot_fn()))
+            except Exception as e:
+                logger.error(f"Failed to snapshot {name} for persistence: {e}")
+        return pending
+
+    def _write_all(self, pending: List[Tuple[str, int, Any]]):
+        """Write snapshots, never letting an older one overwrite a newer one."""
+        with self._write_lock:
+            for name, generation, snapshot in pending:
+                if generation <= self._written[name]:
+                    continue
+                try:
+                    self._stores[name][1](snapshot)
+                    self._written[name] = generation
+                    self.flush_count += 1
+                except Exception as e:
+                    logger.error(f"Failed to persist {name}: {e}")
+
+    def flush(self):
+        """Synchronously write every dirty store."""
+        self._write_all(self._take_snapshots())
+
+    def stop(self):
+        """Cancel the background task and write anything still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.flush()
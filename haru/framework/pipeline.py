@@ -0,0 +1,227 @@
+"""Activities as DAGs of stages, with independent stages run concurrently."""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .activity_decorator import ActivityResult
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineError(Exception):
+    """Raised for an invalid pipeline definition (unknown dependency, cycle)."""
+
+
+class Stage:
+    """
+    One step of a pipeline. func receives the outputs of the stages it
+    depends on (and the pipeline's inputs) as keyword arguments named after
+    them, and its return value becomes this stage's output.
+
+    - output: if set, the output must be an instance of this type;
+    - optional: a failing optional stage yields None instead of failing the run;
+    - blocking: func is synchronous I/O (an SDK call, http.client) and is
+      run in a worker thread so it does not stall the event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        depends_on: Iterable[str] = (),
+        output: Optional[type] = None,
+        optional: bool = False,
+        blocking: bool = False,
+    ):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.output = output
+        self.optional = optional
+        self.blocking = blocking
+
+    async def run(self, arguments: Dict[str, Any]) -> Any:
+        if self.blocking:
+            value = await asyncio.to_thread(self.func, **arguments)
+        else:
+            value = self.func(**arguments)
+            if inspect.isawaitable(value):
+                value = await value
+        if self.output is not None and not isinstance(value, self.output):
+            raise TypeError(
+                f"stage {self.name} returned {type(value).__name__}, "
+                f"expected {self.output.__name__}"
+            )
+        return value
+
+
+class PipelineResult:
+    """Outputs and per-stage timings of one pipeline run."""
+
+    def __init__(self):
+        self.outputs: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.success = True
+        self.error: Optional[str] = None
+        self.failed_stage: Optional[str] = None
+        self.total_seconds = 0.0
+
+    def __getitem__(self, stage_name: str) -> Any:
+        return self.outputs.get(stage_name)
+
+    def summary(self) -> Dict[str, Any]:
+        """Timings for ActivityResult metadata."""
+        return {
+            "total_seconds": self.total_seconds,
+            "stage_seconds": {
+                name: t["end"] - t["start"] for name, t in self.timings.items()
+            },
+            "failed_stage": self.failed_stage,
+        }
+
+    def to_activity_result(
+        self, data: Optional[Any] = None, metadata: Optional[Dict[str, Any]] = None
+    ) -> ActivityResult:
+        """An ActivityResult carrying the pipeline's outcome and timings."""
+        metadata = {**(metadata or {}), "pipeline": self.summary()}
+        if not self.success:
+            return ActivityResult.error_result(self.error, metadata=metadata)
+        return ActivityResult.success_result(data=data, metadata=metadata)
+
+
+class Pipeline:
+    """
+    A set of named stages and their data dependencies. run() starts every
+    stage as soon as the stages it depends on have finished, so end-to-end
+    latency is the critical path rather than the sum of all stages.
+
+        pipeline = Pipeline("post_a_tweet")
+
+        @pipeline.stage(depends_on=["memory"])
+        def recent_tweets(memory): ...
+
+        @pipeline.stage(depends_on=["recent_tweets"], output=str, blocking=True)
+        def tweet_text(recent_tweets): ...
+
+        result = await pipeline.run(memory=memory)
+        result["tweet_text"]
+
+    A stage that raises (unless optional) fails the run: stages still in
+    flight are cancelled and the result carries the error.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stages: Dict[str, Stage] = {}
+        self._order: Optional[List[str]] = None
+
+    def add_stage(self, stage: Stage) -> Stage:
+        if stage.name in self.stages:
+            raise PipelineError(f"duplicate stage {stage.name} in {self.name}")
+        self.stages[stage.name] = stage
+        self._order = None
+        return stage
+
+    def stage(
+        self,
+        name: Optional[str] = None,
+        depends_on: Iterable[str] = (),
+        output: Optional[type] = None,
+        optional: bool = False,
+        blocking: bool = False,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator registering a function as a stage (named after it by default)."""
+
+        def decorator(func):
+            self.add_stage(
+                Stage(
+                    name or func.__name__, func, depends_on, output, optional, blocking
+                )
+            )
+            return func
+
+        return decorator
+
+    def validate(self, inputs: Iterable[str] = ()) -> List[str]:
+        """Check dependencies and return a topological order of the stages."""
+        available = set(inputs)
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages and dependency not in available:
+                    raise PipelineError(
+                        f"stage {stage.name} depends on unknown {dependency}"
+                    )
+
+        remaining = {
+            name: {d for d in stage.depends_on if d in self.stages}
+            for name, stage in self.stages.items()
+        }
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise PipelineError(f"cycle between stages {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+                order.append(name)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    async def run(self, **inputs: Any) -> PipelineResult:
+        """Run every stage, passing inputs and upstream outputs by name."""
+        if self._order is None:
+            self._order = self.validate(inputs)
+        result = PipelineResult()
+        values: Dict[str, Any] = dict(inputs)
+        started = time.monotonic()
+        pending = {
+            name: set(self.stages[name].depends_on) - set(inputs)
+            for name in self._order
+        }
+        running: Dict[asyncio.Task, str] = {}
+
+        def start_ready():
+            for name in [n for n, deps in pending.items() if not deps]:
+                del pending[name]
+                stage = self.stages[name]
+                arguments = {d: values.get(d) for d in stage.depends_on}
+                result.timings[name] = {"start": time.monotonic() - started}
+                running[asyncio.ensure_future(stage.run(arguments))] = name
+
+        try:
+            start_ready()
+            while running:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    name = running.pop(task)
+                    result.timings[name]["end"] = time.monotonic() - started
+                    try:
+                        values[name] = task.result()
+                    except Exception as e:
+                        if not self.stages[name].optional:
+                            result.success = False
+                            result.failed_stage = name
+                            result.error = f"{name}: {e}"
+                            logger.error(f"Pipeline {self.name} failed in {name}: {e}")
+                            return result
+                        logger.warning(
+                            f"Optional stage {name} of {self.name} failed: {e}"
+                        )
+                        values[name] = None
+                    result.outputs[name] = values[name]
+                    for deps in pending.values():
+                        deps.discard(name)
+                start_ready()
+            return result
+        finally:
+            for task in running:
+                task.cancel()
+            for name in running.values():
+                result.timings[name].setdefault("end", time.monotonic() - started)
+            result.total_seconds = time.monotonic() - started
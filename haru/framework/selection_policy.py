@@ -0,0 +1,183 @@
+"""Policies the ActivitySelector uses to choose among suitable activities."""
+
+import logging
+import math
+import random
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("personality", "thompson", "ucb")
+
+
+def personality_weights(
+    activities: List[Any], personality: Dict[str, float]
+) -> List[float]:
+    """Static weights from the activities' creativity/social factors."""
+    weights = []
+    for activity in activities:
+        weight = 1.0
+        if hasattr(activity, "creativity_factor"):
+            weight *= (
+                1 + personality.get("creativity", 0.5) * activity.creativity_factor
+            )
+        if hasattr(activity, "social_factor"):
+            weight *= 1 + personality.get("friendliness", 0.5) * activity.social_factor
+        weights.append(weight)
+    return weights
+
+
+class PersonalityPolicy:
+    """Weighted random choice by personality factors (the original behaviour)."""
+
+    name = "personality"
+
+    def choose(self, activities: List[Any], personality: Dict[str, float]) -> Any:
+        weights = personality_weights(activities, personality)
+        return random.choices(activities, weights=weights, k=1)[0]
+
+    def record_outcome(
+        self, activity_name: str, success: bool, duration: Optional[float]
+    ):
+        pass
+
+    def export_state(self) -> Dict[str, Any]:
+        return {}
+
+    def restore_state(self, data: Dict[str, Any]):
+        pass
+
+
+class BanditPolicy:
+    """
+    Treats each activity as an arm whose reward is success, discounted by
+    how long it takes. Per arm it keeps Beta(alpha, beta) pseudo-counts of
+    successes/failures and a running mean duration.
+
+    - "thompson" draws a success probability from each arm's Beta posterior;
+    - "ucb" uses the posterior mean plus an exploration bonus
+      c * sqrt(ln(total pulls) / arm pulls).
+
+    The score is multiplied by 1 / (1 + latency_weight * mean minutes) and by
+    the personality weights, and the highest-scoring candidate wins. All
+    candidates are scored at once with NumPy.
+
+    Counts decay by `decay` on every outcome of that arm, so an activity
+    that failed for a while (e.g. a missing API key) recovers once it starts
+    succeeding. Arms start from Memory's activity stats, scaled down to the
+    decay horizon, and the learned counts are checkpointed across restarts.
+    """
+
+    def __init__(
+        self, algorithm: str = "thompson", config: Optional[Dict[str, Any]] = None
+    ):
+        config = config or {}
+        self.name = algorithm
+        self.prior_alpha = float(config.get("prior_alpha", 1.0))
+        self.prior_beta = float(config.get("prior_beta", 1.0))
+        self.exploration = float(config.get("exploration", 1.0))
+        self.latency_weight = float(config.get("latency_weight", 0.1))
+        self.decay = min(1.0, max(0.0, float(config.get("decay", 0.98))))
+        self._rng = np.random.default_rng(config.get("seed"))
+        # name -> [successes, failures, mean duration (s) or None, durations seen]
+        self.arms: Dict[str, List[Any]] = {}
+
+    def _horizon(self) -> float:
+        """Largest effective pseudo-count a decayed arm can reach."""
+        return 1 / (1 - self.decay) if self.decay < 1 else math.inf
+
+    def seed_from_stats(self, stats: Dict[str, Dict[str, Any]]):
+        """Initialise arms not seen yet from Memory.get_activity_stats()."""
+        horizon = self._horizon()
+        for name, summary in stats.items():
+            if name in self.arms or not summary.get("count"):
+                continue
+            scale = min(1.0, horizon / summary["count"])
+            self.arms[name] = [
+                summary.get("success_count", 0) * scale,
+                summary.get("failure_count", 0) * scale,
+                summary.get("mean_duration"),
+                1 if summary.get("mean_duration") is not None else 0,
+            ]
+
+    def record_outcome(
+        self, activity_name: str, success: bool, duration: Optional[float]
+    ):
+        arm = self.arms.setdefault(activity_name, [0.0, 0.0, None, 0])
+        arm[0] *= self.decay
+        arm[1] *= self.decay
+        if success:
+            arm[0] += 1
+        else:
+            arm[1] += 1
+        if duration is not None:
+            # Exponential mean once enough samples exist, so latency tracks drift
+            arm[3] += 1
+            weight = max(1 - self.decay, 1 / arm[3])
+            arm[2] = (
+                duration if arm[2] is None else arm[2] + weight * (duration - arm[2])
+            )
+
+    def scores(self, names: List[str], personality_factor: np.ndarray) -> np.ndarray:
+        arms = [self.arms.get(name, (0.0, 0.0, None, 0)) for name in names]
+        successes = np.fromiter((arm[0] for arm in arms), float, len(arms))
+        failures = np.fromiter((arm[1] for arm in arms), float, len(arms))
+        latency = np.fromiter(
+            (arm[2] if arm[2] is not None else 0.0 for arm in arms), float, len(arms)
+        )
+        alpha = successes + self.prior_alpha
+        beta = failures + self.prior_beta
+
+        if self.name == "ucb":
+            pulls = successes + failures
+            total = max(pulls.sum(), 1.0)
+            bonus = self.exploration * np.sqrt(
+                np.log(total + 1) / np.maximum(pulls, 1e-9)
+            )
+            estimate = alpha / (alpha + beta) + np.minimum(bonus, 1e6)
+        else:
+            estimate = self._rng.beta(alpha, beta)
+
+        speed = 1 / (1 + self.latency_weight * latency / 60)
+        return estimate * speed * personality_factor
+
+    def choose(self, activities: List[Any], personality: Dict[str, float]) -> Any:
+        names = [activity.__name__ for activity in activities]
+        factor = np.asarray(personality_weights(activities, personality), dtype=float)
+        return activities[int(np.argmax(self.scores(names, factor)))]
+
+    def export_state(self) -> Dict[str, Any]:
+        return {
+            "algorithm": self.name,
+            "arms": {k: list(v) for k, v in self.arms.items()},
+        }
+
+    def restore_state(self, data: Dict[str, Any]):
+        """Adopt checkpointed arms (taking precedence over seeded ones)."""
+        for name, arm in (data or {}).get("arms", {}).items():
+            if isinstance(arm, list) and len(arm) == 4:
+                self.arms[name] = list(arm)
+
+
+def create_selection_policy(config: Optional[Dict[str, Any]] = None, memory=None):
+    """
+    Build the policy named by selection_config["policy"] (personality by
+    default). Bandit policies are seeded from memory's activity stats.
+    """
+    config = config or {}
+    policy_name = config.get("policy", "personality")
+    if policy_name not in POLICIES:
+        logger.warning(f"Unknown selection policy '{policy_name}', using personality")
+        policy_name = "personality"
+    if policy_name == "personality":
+        return PersonalityPolicy()
+
+    policy = BanditPolicy(policy_name, config)
+    if memory is not None:
+        try:
+            policy.seed_from_stats(memory.get_activity_stats())
+        except Exception as e:
+            logger.error(f"Failed to seed selection policy from memory: {e}")
+    return policy
@@ -1,24 +1,182 @@
+import asyncio
+import heapq
+import json
 import logging
-from typing import Dict, Any
-from threading import Lock
+import sys
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+EVICTION_REASONS = ("ttl", "lru", "bytes")
+
+_SIZE_DEPTH = 4
+
+
+def approximate_size(value: Any, depth: int = 0) -> int:
+    """Rough in-memory size of a value, following containers a few levels deep."""
+    size = sys.getsizeof(value)
+    if depth >= _SIZE_DEPTH:
+        return size
+    if isinstance(value, dict):
+        size += sum(
+            approximate_size(k, depth + 1) + approximate_size(v, depth + 1)
+            for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, depth + 1) for item in value)
+    return size
+
 
 class SharedData:
-    """Thread-safe shared data storage for activities and skills."""
+    """
+    Shared data storage for activities and skills, owned by the event loop.
 
-    def __init__(self):
-        self._data: Dict[str, Any] = {}
-        self._locks: Dict[str, Lock] = {}
-        self._global_lock = Lock()
+    Everything runs on one asyncio loop, so there are no locks. Every write
+    stamps the key with a version from a counter that only ever increases,
+    and wakes coroutines waiting in watch() on that key. Category snapshots
+    are built once per change and shared by every reader until the category
+    is written again.
+
+    Categories can have an eviction policy, e.g.
+    {"memory": {"ttl_seconds": 86400, "max_entries": 100, "max_bytes": 1048576}}:
+    keys expire ttl_seconds after their last write, and past max_entries or
+    max_bytes (approximate) the least recently used keys are evicted. The
+    most recently written key is never evicted for size. Evictions count as
+    changes (watchers see the key disappear) and are tallied in get_stats().
+    """
+
+    def __init__(self, policies: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.policies: Dict[str, Dict[str, Any]] = policies or {}
+        self._data: Dict[str, OrderedDict[str, Any]] = {}
+        # Version of each key's last write (deletes included)
+        self._versions: Dict[str, Dict[str, int]] = {}
+        self._clock = 0
+        self._snapshots: Dict[str, Mapping[str, Any]] = {}
+        self._watchers: Dict[Tuple[str, str], List[asyncio.Future]] = {}
+        # Expiry deadlines (time.monotonic()) per key, plus a min-heap of
+        # (deadline, category, key) that may hold superseded deadlines
+        self._expiry: Dict[str, Dict[str, float]] = {}
+        self._expiry_heap: List[Tuple[float, str, str]] = []
+        self._sizes: Dict[str, Dict[str, int]] = {}
+        self._bytes: Dict[str, int] = {}
+        self._evictions: Dict[str, Dict[str, int]] = {}
+        # (category, key) -> (version, JSON-safe copy of the value or None if
+        # it cannot be serialized), so checkpoints only re-encode changed keys
+        self._exported: Dict[Tuple[str, str], Tuple[int, Any]] = {}
 
     def initialize(self):
         """Initialize shared data storage."""
-        with self._global_lock:
-            self._data = {"system": {}, "memory": {}, "state": {}, "temp": {}}
-            for category in self._data:
-                self._locks[category] = Lock()
+        self._data = {
+            category: OrderedDict()
+            for category in ("system", "memory", "state", "temp")
+        }
+        self._versions = {category: {} for category in self._data}
+        self._snapshots = {}
+        self._expiry = {category: {} for category in self._data}
+        self._expiry_heap = []
+        self._sizes = {category: {} for category in self._data}
+        self._bytes = {category: 0 for category in self._data}
+        self._evictions = {
+            category: dict.fromkeys(EVICTION_REASONS, 0) for category in self._data
+        }
+
+    def set_policies(self, policies: Dict[str, Dict[str, Any]]):
+        """Replace the eviction policies and apply them to the current contents."""
+        self.policies = policies or {}
+        for category in self._data:
+            self._sizes[category] = {}
+            self._bytes[category] = 0
+            if self.policies.get(category, {}).get("max_bytes") is not None:
+                for key, value in self._data[category].items():
+                    self._track_size(category, key, value)
+            entries = self._data[category]
+            self._enforce_limits(category, keep=next(reversed(entries), None))
+
+    def _touch(self, category: str, key: str) -> int:
+        """Bump a key's version, drop the category snapshot and wake watchers."""
+        self._clock += 1
+        self._versions[category][key] = self._clock
+        self._snapshots.pop(category, None)
+        for future in self._watchers.pop((category, key), ()):
+            if future.done():
+                continue
+            if future.get_loop() is _running_loop():
+                future.set_result(None)
+            else:
+                future.get_loop().call_soon_threadsafe(_resolve, future)
+        return self._clock
+
+    def _stored(self, category: str, key: str, value: Any, ttl: Optional[float]):
+        """Bookkeeping after a key is written: expiry, size, LRU order, limits."""
+        policy = self.policies.get(category, {})
+        if ttl is None:
+            ttl = policy.get("ttl_seconds")
+        if ttl is not None:
+            deadline = time.monotonic() + ttl
+            self._expiry[category][key] = deadline
+            heapq.heappush(self._expiry_heap, (deadline, category, key))
+            live = sum(len(expiry) for expiry in self._expiry.values())
+            if len(self._expiry_heap) > 2 * live + 64:
+                # Drop deadlines superseded by later writes
+                self._expiry_heap = [
+                    (deadline, name, expiring_key)
+                    for name, expiry in self._expiry.items()
+                    for expiring_key, deadline in expiry.items()
+                ]
+                heapq.heapify(self._expiry_heap)
+        else:
+            self._expiry[category].pop(key, None)
+        if policy.get("max_bytes") is not None:
+            self._track_size(category, key, value)
+        self._data[category].move_to_end(key)
+        self._enforce_limits(category, keep=key)
+
+    def _track_size(self, category: str, key: str, value: Any):
+        size = approximate_size(key) + approximate_size(value)
+        self._bytes[category] += size - self._sizes[category].get(key, 0)
+        self._sizes[category][key] = size
+
+    def _forget(self, category: str, key: str):
+        """Drop a removed key's expiry and size bookkeeping."""
+        self._expiry[category].pop(key, None)
+        self._bytes[category] -= self._sizes[category].pop(key, 0)
+
+    def _evict(self, category: str, key: str, reason: str):
+        del self._data[category][key]
+        self._forget(category, key)
+        self._evictions[category][reason] += 1
+        self._touch(category, key)
+        logger.debug(f"Evicted shared data {category}/{key} ({reason})")
+
+    def _enforce_limits(self, category: str, keep: Optional[str]):
+        """Evict least recently used keys while the category is over its limits."""
+        policy = self.policies.get(category, {})
+        max_entries = policy.get("max_entries")
+        max_bytes = policy.get("max_bytes")
+        entries = self._data[category]
+        while entries:
+            if max_entries is not None and len(entries) > max_entries:
+                reason = "lru"
+            elif max_bytes is not None and self._bytes[category] > max_bytes:
+                reason = "bytes"
+            else:
+                break
+            oldest = next(iter(entries))
+            if oldest == keep:
+                break
+            self._evict(category, oldest, reason)
+
+    def _expire(self):
+        """Evict keys whose TTL has passed (O(1) when none are due)."""
+        heap = self._expiry_heap
+        now = time.monotonic()
+        while heap and heap[0][0] <= now:
+            deadline, category, key = heapq.heappop(heap)
+            if self._expiry.get(category, {}).get(key) == deadline:
+                self._evict(category, key, "ttl")
 
     def get(self, category: str, key: str, default: Any = None) -> Any:
         """Get a value from shared data."""
@@ -26,27 +184,47 @@ class SharedData:
             logger.warning(f"Attempting to access invalid category: {category}")
             return default
 
-        with self._locks[category]:
-            return self._data[category].get(key, default)
+        self._expire()
+        entries = self._data[category]
+        if key not in entries:
+            return default
+        entries.move_to_end(key)
+        return entries[key]
 
-    def set(self, category: str, key: str, value: Any) -> bool:
-        """Set a value in shared data."""
+    def get_version(self, category: str, key: str) -> int:
+        """Version of a key's last change (0 if it has never been written)."""
+        return self._versions.get(category, {}).get(key, 0)
+
+    def set(
+        self, category: str, key: str, value: Any, ttl: Optional[float] = None
+    ) -> bool:
+        """
+        Set a value in shared data. 'ttl' (seconds) overrides the category's
+        ttl_seconds for this write.
+        """
         if category not in self._data:
             logger.warning(f"Attempting to write to invalid category: {category}")
             return False
 
-        with self._locks[category]:
-            self._data[category][key] = value
+        self._expire()
+        self._data[category][key] = value
+        self._touch(category, key)
+        self._stored(category, key, value, ttl)
         return True
 
-    def update(self, category: str, updates: Dict[str, Any]) -> bool:
+    def update(
+        self, category: str, updates: Dict[str, Any], ttl: Optional[float] = None
+    ) -> bool:
         """Update multiple values in a category."""
         if category not in self._data:
             logger.warning(f"Attempting to update invalid category: {category}")
             return False
 
-        with self._locks[category]:
-            self._data[category].update(updates)
+        self._expire()
+        for key, value in updates.items():
+            self._data[category][key] = value
+            self._touch(category, key)
+            self._stored(category, key, value, ttl)
         return True
 
     def delete(self, category: str, key: str) -> bool:
@@ -55,10 +233,12 @@ class SharedData:
             logger.warning(f"Attempting to delete from invalid category: {category}")
             return False
 
-        with self._locks[category]:
-            if key in self._data[category]:
-                del self._data[category][key]
-                return True
+        self._expire()
+        if key in self._data[category]:
+            del self._data[category][key]
+            self._forget(category, key)
+            self._touch(category, key)
+            return True
         return False
 
     def clear_category(self, category: str) -> bool:
@@ -67,23 +247,157 @@ class SharedData:
             logger.warning(f"Attempting to clear invalid category: {category}")
             return False
 
-        with self._locks[category]:
-            self._data[category].clear()
+        keys = list(self._data[category])
+        self._data[category].clear()
+        self._expiry[category].clear()
+        self._sizes[category].clear()
+        self._bytes[category] = 0
+        for key in keys:
+            self._touch(category, key)
         return True
 
-    def get_category_data(self, category: str) -> Dict[str, Any]:
-        """Get all data in a category."""
+    def get_category_data(self, category: str) -> Mapping[str, Any]:
+        """
+        Read-only snapshot of a category. It is copied at most once per
+        change to the category, so repeated reads cost nothing.
+        """
         if category not in self._data:
             logger.warning(f"Attempting to access invalid category: {category}")
             return {}
 
-        with self._locks[category]:
-            return self._data[category].copy()
+        self._expire()
+        snapshot = self._snapshots.get(category)
+        if snapshot is None:
+            snapshot = MappingProxyType(dict(self._data[category]))
+            self._snapshots[category] = snapshot
+        return snapshot
+
+    def export_state(self) -> Dict[str, Dict[str, List[Any]]]:
+        """
+        JSON-serializable contents for a checkpoint, as
+        {category: {key: [value, expires_at]}} where expires_at is a
+        time.time() deadline or None. Values that cannot be serialized
+        (e.g. object references) are left out. Copies are cached per key
+        version, so unchanged keys cost nothing to export again.
+        """
+        self._expire()
+        now_monotonic, now_wall = time.monotonic(), time.time()
+        exported: Dict[str, Dict[str, List[Any]]] = {}
+        live = set()
+        for category, entries in self._data.items():
+            for key, value in entries.items():
+                live.add((category, key))
+                version = self.get_version(category, key)
+                cached = self._exported.get((category, key))
+                if cached is None or cached[0] != version:
+                    try:
+                        copy = json.loads(json.dumps(value))
+                    except (TypeError, ValueError):
+                        copy = None
+                        logger.debug(
+                            f"Not checkpointing unserializable {category}/{key}"
+                        )
+                    cached = self._exported[(category, key)] = (version, copy)
+                if cached[1] is None and value is not None:
+                    continue
+                deadline = self._expiry[category].get(key)
+                expires_at = (
+                    now_wall + deadline - now_monotonic
+                    if deadline is not None
+                    else None
+                )
+                exported.setdefault(category, {})[key] = [cached[1], expires_at]
+        for stale in self._exported.keys() - live:
+            del self._exported[stale]
+        return exported
+
+    def restore_state(self, exported: Dict[str, Dict[str, List[Any]]]):
+        """Load contents written by export_state(); expired keys are skipped."""
+        now = time.time()
+        restored = 0
+        for category, entries in exported.items():
+            if category not in self._data:
+                continue
+            for key, (value, expires_at) in entries.items():
+                ttl = None
+                if expires_at is not None:
+                    ttl = expires_at - now
+                    if ttl <= 0:
+                        continue
+                self.set(category, key, value, ttl=ttl)
+                restored += 1
+        logger.info(f"Restored {restored} shared data keys from checkpoint")
 
     def exists(self, category: str, key: str) -> bool:
         """Check if a key exists in a category."""
         if category not in self._data:
             return False
 
-        with self._locks[category]:
-            return key in self._data[category]
+        self._expire()
+        return key in self._data[category]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-category entry counts, approximate bytes (if bounded) and evictions."""
+        self._expire()
+        return {
+            category: {
+                "entries": len(entries),
+                "approx_bytes": (
+                    self._bytes[category]
+                    if self.policies.get(category, {}).get("max_bytes") is not None
+                    else None
+                ),
+                "evictions": dict(self._evictions[category]),
+                "policy": dict(self.policies.get(category, {})),
+            }
+            for category, entries in self._data.items()
+        }
+
+    async def watch(
+        self,
+        category: str,
+        key: str,
+        since_version: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[Any, int]:
+        """
+        Wait until a key changes after 'since_version' (by default, its
+        version when called) and return its (value, version). Returns at
+        once if it has already changed. A deleted key returns (None,
+        version). Raises asyncio.TimeoutError after 'timeout' seconds.
+
+            value, version = await shared_data.watch("memory", "latest_news")
+            while True:
+                value, version = await shared_data.watch(
+                    "memory", "latest_news", since_version=version
+                )
+        """
+        if category not in self._data:
+            raise KeyError(f"Invalid shared data category: {category}")
+
+        if since_version is None:
+            since_version = self.get_version(category, key)
+        while self.get_version(category, key) <= since_version:
+            future = asyncio.get_running_loop().create_future()
+            watchers = self._watchers.setdefault((category, key), [])
+            watchers.append(future)
+            try:
+                await asyncio.wait_for(future, timeout)
+            finally:
+                if future in watchers:
+                    watchers.remove(future)
+                if not watchers and self._watchers.get((category, key)) is watchers:
+                    del self._watchers[(category, key)]
+        return self._data[category].get(key), self.get_version(category, key)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
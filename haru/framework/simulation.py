@@ -0,0 +1,179 @@
+"""Fast-forward simulation of the activity loop on a virtual clock."""
+
+import logging
+import math
+import random
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .activity_decorator import ActivityBase, ActivityResult, activity
+from .activity_selector import ActivitySelector
+from .clock import VirtualClock
+from .selection_policy import create_selection_policy
+from .state import State
+
+logger = logging.getLogger(__name__)
+
+# Stubbed execution when an activity has no entry in `outcomes`
+DEFAULT_DURATION = 30.0
+DEFAULT_SUCCESS_RATE = 0.9
+
+SYNTHETIC_COOLDOWNS = (300, 1800, 3600, 10000, 86400, 172800, 259200)
+
+
+class SimulatedActivityLoader:
+    """Stands in for ActivityLoader with a fixed set of activity classes."""
+
+    def __init__(self, activities: Dict[str, Any]):
+        self.loaded_activities = dict(activities)
+
+    def get_all_activities(self) -> Dict[str, Any]:
+        return self.loaded_activities.copy()
+
+
+def synthetic_activities(count: int, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    count decorated activity classes with cooldowns drawn from the ranges
+    the shipped activities use, for benchmarking selection at scale.
+    """
+    rng = random.Random(seed)
+    activities = {}
+    for i in range(count):
+        name = f"SyntheticActivity{i}"
+
+        async def execute(self, shared_data) -> ActivityResult:
+            return ActivityResult.success_result()
+
+        cls = type(name, (ActivityBase,), {"execute": execute})
+        cls = activity(
+            name=name,
+            energy_cost=round(rng.uniform(0.05, 0.4), 2),
+            cooldown=rng.choice(SYNTHETIC_COOLDOWNS),
+        )(cls)
+        activities[f"activity_synthetic_{i}"] = cls
+    return activities
+
+
+class Simulation:
+    """
+    Drives an ActivitySelector and State on a VirtualClock. Activities are
+    never executed: each selected run takes outcomes[name]["duration"]
+    simulated seconds and succeeds with probability
+    outcomes[name]["success_rate"]. Between runs the clock jumps straight to
+    the scheduler's next eligible time, so weeks pass in seconds.
+
+    Energy is only consumed if consume_energy is set; the live loop does not
+    consume it either.
+    """
+
+    def __init__(
+        self,
+        activities: Dict[str, Any],
+        constraints: Optional[Dict[str, Any]] = None,
+        outcomes: Optional[Dict[str, Dict[str, float]]] = None,
+        personality: Optional[Dict[str, float]] = None,
+        consume_energy: bool = False,
+        start: Optional[datetime] = None,
+        seed: Optional[int] = None,
+        storage_path: Optional[str] = None,
+    ):
+        constraints = constraints or {}
+        self.outcomes = outcomes or {}
+        self.consume_energy = consume_energy
+        self._rng = random.Random(seed)
+        random.seed(seed)  # PersonalityPolicy draws from the random module
+
+        self.clock = VirtualClock(start)
+        # Kept in memory unless storage_path is given
+        self.state = State(storage_path, clock=self.clock)
+        self.state.current_state["personality"] = personality or {}
+        self.selector = ActivitySelector(constraints, self.state, clock=self.clock)
+        self.selector.set_activity_loader(SimulatedActivityLoader(activities))
+        selection_config = dict(constraints.get("selection_config", {}))
+        if seed is not None:
+            selection_config.setdefault("seed", seed)
+        self.selector.set_selection_policy(create_selection_policy(selection_config))
+
+    def _outcome(self, name: str):
+        outcome = self.outcomes.get(name, {})
+        duration = float(outcome.get("duration", DEFAULT_DURATION))
+        success = self._rng.random() < outcome.get("success_rate", DEFAULT_SUCCESS_RATE)
+        return duration, success
+
+    def run(
+        self, seconds: float, energy_sample_seconds: float = 3600
+    ) -> Dict[str, Any]:
+        """Simulate `seconds` of the loop and return a report."""
+        start = self.clock.time()
+        end = start + seconds
+        runs: Counter = Counter()
+        failures: Counter = Counter()
+        busy = idle = 0.0
+        select_times: List[float] = []
+        energy_curve = []
+        next_sample = start
+        wall_start = time.perf_counter()
+
+        while self.clock.time() < end:
+            now = self.clock.time()
+            if now >= next_sample:
+                energy_curve.append(
+                    (round((now - start) / 3600, 3), self.state.current_state["energy"])
+                )
+                while next_sample <= now:
+                    next_sample += energy_sample_seconds
+
+            t0 = time.perf_counter()
+            chosen = self.selector.select_next_activity()
+            select_times.append(time.perf_counter() - t0)
+
+            if chosen is not None:
+                name = chosen.__class__.__name__
+                duration, success = self._outcome(name)
+                duration = min(duration, end - now)
+                if self.consume_energy:
+                    self.state.consume_energy(getattr(chosen, "energy_cost", 0.2))
+                self.clock.advance(duration)
+                busy += duration
+                runs[name] += 1
+                if success:
+                    self.state.record_activity_completion()
+                else:
+                    failures[name] += 1
+                self.selector.record_outcome(name, success, duration)
+                self.state.update()
+                continue
+
+            self.state.update()
+            delay = self.selector.scheduler.seconds_until_next()
+            if delay is None:
+                delay = end - now
+            # Never stall: something due but unselectable has been deferred
+            delay = min(max(delay, 1.0), end - now)
+            self.clock.advance(delay)
+            idle += delay
+
+        ordered = sorted(select_times)
+        p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)] if ordered else 0.0
+        return {
+            "simulated_seconds": seconds,
+            "wall_seconds": time.perf_counter() - wall_start,
+            "activities": len(self.selector.activity_loader.get_all_activities()),
+            "runs": dict(runs.most_common()),
+            "failures": dict(failures),
+            "total_runs": sum(runs.values()),
+            "busy_seconds": busy,
+            "idle_seconds": idle,
+            "idle_fraction": idle / seconds if seconds else 0.0,
+            "energy_curve": energy_curve,
+            "selection": {
+                "calls": len(select_times),
+                "mean_us": 1e6 * sum(select_times) / len(select_times)
+                if select_times
+                else 0.0,
+                "p95_us": 1e6 * p95,
+                "max_us": 1e6 * ordered[-1] if ordered else 0.0,
+            },
+        }
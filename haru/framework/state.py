@@ -1,17 +1,28 @@
+import copy
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
 
+from .clock import SYSTEM_CLOCK
+
 logger = logging.getLogger(__name__)
 
 
 class State:
-    def __init__(self, state_path: str = "./storage"):
-        self.state_path = Path(state_path)
-        self.state_path.mkdir(exist_ok=True)
-        self.state_file = self.state_path / "state.json"
+    def __init__(self, state_path: Optional[str] = "./storage", clock=None):
+        """state_path None keeps the state in memory only (e.g. for simulations)."""
+        self.state_path = Path(state_path) if state_path is not None else None
+        self.state_file = None
+        if self.state_path is not None:
+            self.state_path.mkdir(exist_ok=True)
+            self.state_file = self.state_path / "state.json"
+        self._persister = None
+        self.clock = clock or SYSTEM_CLOCK
+        self._energy_listeners: List[Callable[[], None]] = []
+        # Energy held by activities in flight (not persisted)
+        self._reserved_energy = 0.0
         self.current_state: Dict[str, Any] = {
             "mood": "neutral",
             "energy": 1.0,
@@ -20,6 +31,27 @@ class State:
             "personality": {},
         }
 
+    def attach_persister(self, persister):
+        """Route saves through a WriteBehindPersister instead of writing inline."""
+        self._persister = persister
+        persister.register(
+            "state", lambda: copy.deepcopy(self.current_state), self._write_state
+        )
+
+    def add_energy_listener(self, callback: Callable[[], None]):
+        """Call callback whenever the energy level changes."""
+        self._energy_listeners.append(callback)
+
+    def _set_energy(self, energy: float):
+        if energy == self.current_state["energy"]:
+            return
+        self.current_state["energy"] = energy
+        for callback in self._energy_listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Energy listener failed: {e}")
+
     def initialize(self, character_config: Dict[str, Any]):
         """Initialize state with character configuration."""
         self._load_state()
@@ -29,7 +61,7 @@ class State:
     def _load_state(self):
         """Load state from persistent storage."""
         try:
-            if self.state_file.exists():
+            if self.state_file is not None and self.state_file.exists():
                 with open(self.state_file, "r") as f:
                     self.current_state = json.load(f)
         except Exception as e:
@@ -37,7 +69,7 @@ class State:
 
     def update(self):
         """Update state based on current conditions."""
-        current_time = datetime.now()
+        current_time = self.clock.now()
 
         # Update energy levels
         if self.current_state["last_activity_timestamp"]:
@@ -45,8 +77,8 @@ class State:
                 self.current_state["last_activity_timestamp"]
             )
             time_diff = (current_time - last_activity).total_seconds()
-            self.current_state["energy"] = min(
-                1.0, self.current_state["energy"] + (time_diff / 3600) * 0.1
+            self._set_energy(
+                min(1.0, self.current_state["energy"] + (time_diff / 3600) * 0.1)
             )
 
         # Only update timestamp if there was a successful activity completion
@@ -67,9 +99,32 @@ class State:
 
     def consume_energy(self, amount: float):
         """Consume energy for an activity."""
-        self.current_state["energy"] = max(0.0, self.current_state["energy"] - amount)
+        self._set_energy(max(0.0, self.current_state["energy"] - amount))
         self.save()
 
+    def get_reserved_energy(self) -> float:
+        return self._reserved_energy
+
+    def get_available_energy(self) -> float:
+        """Energy not reserved by running activities."""
+        return max(0.0, self.current_state["energy"] - self._reserved_energy)
+
+    def reserve_energy(self, amount: float) -> bool:
+        """Hold amount of energy for an activity about to run; False if not available."""
+        if amount > self.get_available_energy():
+            return False
+        self._reserved_energy += amount
+        return True
+
+    def release_energy(self, amount: float):
+        """Return a reservation made by reserve_energy()."""
+        self._reserved_energy = max(0.0, self._reserved_energy - amount)
+        for callback in self._energy_listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Energy listener failed: {e}")
+
     def record_activity_completion(self):
         """Mark that an activity was completed successfully."""
         self._last_completed_activity = True
@@ -88,9 +143,22 @@ class State:
             self.save()
 
     def save(self):
-        """Save current state to persistent storage."""
+        """
+        Save current state to persistent storage.
+        With a write-behind persister attached, this only marks state dirty.
+        """
+        if self._persister:
+            self._persister.mark_dirty("state")
+            return
+        if self.state_file is not None:
+            self._write_state(self.current_state)
+
+    def _write_state(self, state: Dict[str, Any]):
+        """Atomically write a state snapshot to state.json."""
         try:
-            with open(self.state_file, "w") as f:
-                json.dump(self.current_state, f, indent=2)
+            temp_file = self.state_file.with_suffix(".json.tmp")
+            with open(temp_file, "w") as f:
+                json.dump(state, f, indent=2)
+            temp_file.replace(self.state_file)
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
@@ -52,6 +52,7 @@ class DigitalBeingServer:
         """Initialize the digital being and start periodic updates."""
         logger.info("Initializing Digital Being...")
         self.being.initialize()  # load config, etc.
+        self.being.start_persistence()
 
         self.running = True  # default "running"
         asyncio.create_task(self._periodic_state_update())
@@ -61,49 +62,60 @@ class DigitalBeingServer:
         """Main loop that calls the being's activities if running & not paused."""
         while True:
             try:
+                scheduler = self.being.activity_selector.scheduler
                 if not self.running:
-                    await asyncio.sleep(2)
+                    await scheduler.wait_for_wake(2)
                     continue
 
                 if self.paused:
-                    await asyncio.sleep(2)
+                    await scheduler.wait_for_wake(2)
                     continue
 
                 if not self.being.is_configured():
                     # If not configured, do nothing in the main loop
-                    await asyncio.sleep(2)
+                    await scheduler.wait_for_wake(2)
                     continue
 
-                # Single-step approach for selecting an activity
-                current_activity = self.being.activity_selector.select_next_activity()
-                if current_activity:
-                    logger.info(
-                        f"Executing activity: {current_activity.__class__.__name__}"
-                    )
-                    result = await self.being.execute_activity(current_activity)
-                    if result and result.success:
-                        self.being_state["last_activity"] = {
-                            "name": current_activity.__class__.__name__,
-                            "timestamp": datetime.now().isoformat(),
-                            "success": True,
-                        }
-                    else:
-                        self.being_state["last_activity"] = {
-                            "name": current_activity.__class__.__name__,
-                            "timestamp": datetime.now().isoformat(),
-                            "success": False,
-                            "error": (result.error if result else "Unknown error"),
-                        }
-                    await self.broadcast_state()
+                if self.being.executor.enabled:
+                    # Start activities up to the concurrency limits; each
+                    # reports back through _on_activity_complete
+                    self.being.executor.fill(on_complete=self._on_activity_complete)
+                else:
+                    # Single-step approach for selecting an activity
+                    current_activity = self.being.activity_selector.select_next_activity()
+                    if current_activity:
+                        logger.info(
+                            f"Executing activity: {current_activity.__class__.__name__}"
+                        )
+                        result = await self.being.execute_activity(current_activity)
+                        await self._on_activity_complete(current_activity, result)
 
                 self.being.state.update()
                 self.being.memory.persist()
-                await asyncio.sleep(5)
+                # Sleep until the next activity comes off cooldown
+                await scheduler.wait()
 
             except Exception as e:
                 logger.error(f"Error in being loop: {e}")
                 await asyncio.sleep(10)
 
+    async def _on_activity_complete(self, activity, result):
+        """Publish the outcome of a finished activity to connected clients."""
+        if result and result.success:
+            self.being_state["last_activity"] = {
+                "name": activity.__class__.__name__,
+                "timestamp": datetime.now().isoformat(),
+                "success": True,
+            }
+        else:
+            self.being_state["last_activity"] = {
+                "name": activity.__class__.__name__,
+                "timestamp": datetime.now().isoformat(),
+                "success": False,
+                "error": (result.error if result else "Unknown error"),
+            }
+        await self.broadcast_state()
+
     async def _periodic_state_update(self):
         """Periodically update and broadcast the being's state every second."""
         while True:
@@ -334,15 +346,18 @@ class DigitalBeingServer:
         try:
             if command == "pause":
                 self.paused = True
+                self.being.activity_selector.scheduler.wake()
                 return {"success": True, "message": "Digital Being is paused."}
             elif command == "resume":
                 self.paused = False
+                self.being.activity_selector.scheduler.wake()
                 return {"success": True, "message": "Digital Being resumed."}
             elif command == "stop_loop":
                 self.running = False
                 return {"success": True, "message": "Core loop stopped."}
             elif command == "start_loop":
                 self.running = True
+                self.being.activity_selector.scheduler.wake()
                 return {"success": True, "message": "Core loop started."}
 
             elif command == "initiate_oauth":
@@ -393,19 +408,23 @@ class DigitalBeingServer:
                     return {"success": False, "message": str(e)}
 
             elif command == "get_system_status":
+                short_term_count = len(self.being.memory.short_term_memory)
+                total_activities = self.being.memory.get_activity_count()
                 memory_stats = {
-                    "short_term_count": len(self.being.memory.short_term_memory),
-                    "long_term_count": sum(
-                        len(x) for x in self.being.memory.long_term_memory.values()
-                    ),
-                    "total_activities": self.being.memory.get_activity_count(),
+                    "short_term_count": short_term_count,
+                    "long_term_count": total_activities - short_term_count,
+                    "total_activities": total_activities,
+                    "activity_stats": self.being.memory.get_activity_stats(),
                 }
+                shared_data_stats = self.being.shared_data.get_stats()
                 current_state = self.being.state.get_current_state()
                 is_config = self.being.is_configured()
 
                 return {
                     "success": True,
                     "memory": memory_stats,
+                    "shared_data": shared_data_stats,
+                    "execution": self.being.executor.get_stats(),
                     "state": current_state,
                     "is_configured": is_config,
                     "config": self.being.configs,
@@ -513,6 +532,7 @@ class DigitalBeingServer:
 
                 # Update in-memory
                 self.being.configs[section][key] = value
+                self.being.activity_selector.scheduler.wake()
                 logger.info(f"Updated config: [{section}] {key} = {value}")
 
                 return {
@@ -521,16 +541,59 @@ class DigitalBeingServer:
                 }
 
             elif command == "get_activity_history":
-                limit = params.get("limit", 10)
-                offset = params.get("offset", 0)
-                recents = self.being.memory.get_recent_activities(limit=limit, offset=offset)
-                total = self.being.memory.get_activity_count()
-                return {
-                    "success": True,
-                    "activities": recents,
-                    "has_more": total > (offset + limit),
-                    "total": total,
-                }
+                activity_type = params.get("activity_type")
+                succeeded = params.get("success")
+                since = params.get("since")
+                until = params.get("until")
+                try:
+                    page = self.being.memory.get_history_page(
+                        limit=params.get("limit", 10),
+                        cursor=params.get("cursor"),
+                        activity_type=activity_type,
+                        success=succeeded,
+                        since=since,
+                        until=until,
+                    )
+                except ValueError as e:
+                    return {"success": False, "message": str(e)}
+                # Stats cover the type/outcome filters, not a time range
+                total = None
+                if not since and not until:
+                    total = self.being.memory.count_activities(activity_type, succeeded)
+                return {"success": True, **page, "total": total}
+
+            elif command == "search_memory":
+                query = params.get("query", "")
+                if not query.strip():
+                    return {"success": False, "message": "Search query is required"}
+                results = self.being.memory.search(
+                    query,
+                    activity_type=params.get("activity_type"),
+                    since=params.get("since"),
+                    limit=params.get("limit", 10),
+                )
+                return {"success": True, "results": results, "count": len(results)}
+
+            elif command == "get_memory_artifacts":
+                artifacts = self.being.memory.get_artifacts(
+                    params.get("kind", "media_urls"),
+                    activity_type=params.get("activity_type"),
+                    since=params.get("since"),
+                    limit=params.get("limit", 100),
+                )
+                return {"success": True, "artifacts": artifacts}
+
+            elif command == "get_activity_timeseries":
+                resolution = params.get("resolution", "hour")
+                if resolution not in ("hour", "day"):
+                    return {"success": False, "message": f"Unknown resolution: {resolution}"}
+                series = self.being.memory.get_activity_timeseries(
+                    resolution,
+                    since=params.get("since"),
+                    until=params.get("until"),
+                    activity_type=params.get("activity_type"),
+                )
+                return {"success": True, "resolution": resolution, "series": series}
 
             elif command == "get_composio_app_actions":
                 app_name = params.get("app_name")
@@ -581,6 +644,7 @@ class DigitalBeingServer:
                 if not ok:
                     return {"success": False, "message": "Failed to save code"}
                 self.being.activity_loader.reload_activities()
+                self.being.activity_selector.scheduler.wake()
                 return {"success": True, "message": "Code updated and reloaded"}
 
             elif command == "save_onboarding_data":
@@ -651,6 +715,8 @@ class DigitalBeingServer:
                     self.being.configs["character_config"] = existing_char
                     self.being.configs["skills_config"] = existing_skills
                     self.being.configs["activity_constraints"] = existing_actc
+                    self.being.activity_selector.constraints = existing_actc
+                    self.being.activity_selector.scheduler.wake()
 
                     return {"success": True, "message": "Onboarding data saved."}
 
@@ -737,6 +803,8 @@ class DigitalBeingServer:
         except Exception as e:
             logger.error(f"Failed to start server: {e}")
             raise
+        finally:
+            self.being.cleanup()
 
 
 if __name__ == "__main__":
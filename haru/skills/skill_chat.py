@@ -5,12 +5,14 @@ LiteLLM-based Chat Skill that:
  - does NOT set any environment variable
 """
 
+import asyncio
 import logging
 from typing import Optional, Dict, Any
 
 from litellm import completion
 from framework.api_management import api_manager
-from framework.main import DigitalBeing
+from framework.deadline import remaining_time
+from framework.main import get_current_being
 
 logger = logging.getLogger(__name__)
 
@@ -39,8 +41,7 @@ class ChatSkill:
         """
         try:
             # Load the config from the being
-            being = DigitalBeing()
-            being.initialize()
+            being = get_current_being()
             skill_cfg = being.configs.get("skills_config", {}).get("lite_llm", {})
 
             # e.g. "openai/gpt-4", "anthropic/claude-2", etc.
@@ -72,6 +73,8 @@ class ChatSkill:
         """
         Use litellm.completion() with model=self.model_name, 
         and pass api_key=self._provided_api_key if we have it.
+        The call runs in a worker thread, with its timeout bounded by the
+        calling activity's deadline.
         """
         if not self._initialized:
             return {
@@ -87,12 +90,14 @@ class ChatSkill:
             messages.append({"role": "user", "content": prompt})
 
             # Just pass the user-provided key, if any:
-            response = completion(
+            response = await asyncio.to_thread(
+                completion,
                 model=self.model_name,
                 messages=messages,
                 max_tokens=max_tokens,
                 temperature=0.7,
                 api_key=self._provided_api_key,  # <--- important
+                timeout=remaining_time(),
             )
 
             choices = response.get("choices", [])
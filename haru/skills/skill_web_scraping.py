@@ -8,6 +8,7 @@ import logging
 from typing import Optional, List, Dict, Any
 import requests
 from bs4 import BeautifulSoup
+from framework.deadline import remaining_time
 from framework.api_management import (
     api_manager,
 )  # For consistency, though no keys are used
@@ -41,7 +42,7 @@ class WebScrapingSkill:
         """
         try:
             logger.info(f"Scraping URL: {url}")
-            resp = requests.get(url, timeout=10)
+            resp = requests.get(url, timeout=remaining_time(10))
             resp.raise_for_status()
 
             result = {"status_code": resp.status_code, "content": resp.text}
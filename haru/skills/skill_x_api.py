@@ -6,6 +6,7 @@ import aiohttp
 import os
 from typing import Dict, Any, Optional, List
 from framework.composio_integration import composio_manager
+from framework.deadline import remaining_time
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -56,7 +57,8 @@ class XAPISkill:
         local_path = None
         try:
             logger.info(f"Downloading media from URL: {media_url}")
-            async with aiohttp.ClientSession() as session:
+            timeout = aiohttp.ClientTimeout(total=remaining_time(300))
+            async with aiohttp.ClientSession(timeout=timeout) as session:
                 async with session.get(media_url) as response:
                     if response.status != 200:
                         logger.warning(f"Failed to download image from {media_url}: {response.status}")
@@ -7,7 +7,7 @@ let ws = null;
 let reconnectAttempts = 0;
 const maxReconnectAttempts = 5;
 const PAGE_SIZE = 50;
-let currentOffset = 0;
+let historyCursor = null;
 
 // Trackers for config editing, chart data, etc.
 let currentApiKeySetup = null;
@@ -296,21 +296,20 @@ function getConfig() {
 /*******************************************************
  *               Activity History
  *******************************************************/
-function getActivityHistory(offset = 0) {
+function getActivityHistory(cursor = null) {
   if (!ws || ws.readyState !== WebSocket.OPEN) return;
   ws.send(JSON.stringify({
     type: 'command',
     command: 'get_activity_history',
-    params: { offset, limit: PAGE_SIZE }
+    params: { cursor, limit: PAGE_SIZE }
   }));
 }
 function reloadHistory() {
-  currentOffset = 0;
-  getActivityHistory(0);
+  historyCursor = null;
+  getActivityHistory(null);
 }
 function loadMoreActivities() {
-  currentOffset += PAGE_SIZE;
-  getActivityHistory(currentOffset);
+  getActivityHistory(historyCursor);
 }
 
 /*******************************************************
@@ -785,6 +784,7 @@ function displayActivityHistory(data) {
     }).join('');
 
     // Update the "Load More" button visibility
+    historyCursor = data.next_cursor || null;
     loadMoreBtn.style.display = data.has_more ? 'block' : 'none';
 
     // Initialize or update chart
@@ -794,7 +794,7 @@ function displayActivityHistory(data) {
       initializeActivityChart();
     }
   } else {
-    if (currentOffset === 0) {
+    if (!activityData.length) {
       // If no activities at all
       entriesDiv.innerHTML = '<p>No activities recorded yet.</p>';
     }
@@ -0,0 +1,70 @@
+"""
+Export or import the digital being's memory as NDJSON.
+
+    python -m tools.memory_backup export backup.ndjson.gz
+    python -m tools.memory_backup import backup.ndjson.gz
+
+A .gz or .zst suffix compresses the file. Run from the haru directory (the
+same place server.py is started from) so ./storage is the live store.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from framework.memory import create_memory
+
+ACTIVITY_CONSTRAINTS_FILE = (
+    Path(__file__).parent.parent / "config" / "activity_constraints.json"
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_memory_config() -> dict:
+    """memory_config from activity_constraints.json, or defaults if unavailable."""
+    if not ACTIVITY_CONSTRAINTS_FILE.exists():
+        return {}
+    try:
+        with open(ACTIVITY_CONSTRAINTS_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("memory_config", {})
+    except Exception as e:
+        logger.error(f"Failed to load {ACTIVITY_CONSTRAINTS_FILE.name}: {e}")
+        return {}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("path", help="NDJSON file (.gz / .zst for compression)")
+    parser.add_argument(
+        "--storage", default="./storage", help="Memory storage directory"
+    )
+    args = parser.parse_args()
+
+    memory = create_memory(load_memory_config(), storage_path=args.storage)
+    try:
+        if args.action == "export":
+            count = memory.export_ndjson(args.path)
+            if count is None:
+                return 1
+            print(f"Exported {count} entries to {args.path}")
+        else:
+            if not Path(args.path).exists():
+                logger.error(f"{args.path} does not exist")
+                return 1
+            counts = memory.import_ndjson(args.path)
+            print(
+                f"Imported {counts['imported']} entries from {args.path} "
+                f"({counts['duplicates']} duplicates skipped)"
+            )
+    finally:
+        memory.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
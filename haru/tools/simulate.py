@@ -0,0 +1,117 @@
+"""
+Fast-forward the activity loop on a virtual clock and report what it did.
+
+    python -m tools.simulate --days 7
+    python -m tools.simulate --days 30 --synthetic 5000 --json
+
+Uses the activities in activities/ (those that import in this environment)
+and the constraints in config/activity_constraints.json. --synthetic N adds
+N generated activities, which makes the run a benchmark of selection
+overhead. Executions are stubbed; --outcomes points at a JSON file of
+{"ActivityClass": {"duration": seconds, "success_rate": 0..1}}.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from framework.activity_loader import ActivityLoader
+from framework.simulation import Simulation, synthetic_activities
+
+CONFIG_DIR = Path(__file__).parent.parent / "config"
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def load_json(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Failed to load {path.name}: {e}")
+        return {}
+
+
+def print_report(report: dict):
+    days = report["simulated_seconds"] / 86400
+    print(
+        f"Simulated {days:g} days with {report['activities']} activities "
+        f"in {report['wall_seconds']:.2f}s"
+    )
+    print(
+        f"Runs: {report['total_runs']}  busy {report['busy_seconds'] / 3600:.1f}h  "
+        f"idle {report['idle_seconds'] / 3600:.1f}h ({report['idle_fraction']:.0%})"
+    )
+    print("\nRuns per activity:")
+    for name, count in list(report["runs"].items())[:25]:
+        failed = report["failures"].get(name, 0)
+        print(f"  {name:<40} {count:>6}  ({failed} failed)")
+    if len(report["runs"]) > 25:
+        print(f"  ... {len(report['runs']) - 25} more")
+
+    curve = report["energy_curve"]
+    step = max(1, len(curve) // 24)
+    print("\nEnergy (hour: level):")
+    print("  " + "  ".join(f"{h:g}:{e:.2f}" for h, e in curve[::step]))
+
+    selection = report["selection"]
+    print(
+        f"\nSelection: {selection['calls']} calls, mean {selection['mean_us']:.1f}us, "
+        f"p95 {selection['p95_us']:.1f}us, max {selection['max_us']:.1f}us"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=float, default=7, help="Simulated days")
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="Generated activities to add"
+    )
+    parser.add_argument(
+        "--no-real", action="store_true", help="Skip activities/ (synthetic only)"
+    )
+    parser.add_argument(
+        "--outcomes", help="JSON file of stubbed durations / success rates"
+    )
+    parser.add_argument(
+        "--consume-energy", action="store_true", help="Deduct energy_cost per run"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    activities = {}
+    if not args.no_real:
+        loader = ActivityLoader()
+        loader.load_activities()
+        activities.update(loader.get_all_activities())
+    activities.update(synthetic_activities(args.synthetic, seed=args.seed))
+    if not activities:
+        logger.error("No activities to simulate (try --synthetic N)")
+        return 1
+
+    character = load_json(CONFIG_DIR / "character_config.json")
+    simulation = Simulation(
+        activities,
+        constraints=load_json(CONFIG_DIR / "activity_constraints.json"),
+        outcomes=load_json(Path(args.outcomes)) if args.outcomes else None,
+        personality=character.get("personality", {}),
+        consume_energy=args.consume_energy,
+        seed=args.seed,
+    )
+    report = simulation.run(args.days * 86400)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
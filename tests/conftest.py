@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# framework, activities and skills are top-level packages inside haru/, as
+# when server.py is run from there
+sys.path.insert(0, str(Path(__file__).parent.parent / "haru"))
+
+# Use LiteLLM's bundled model cost map instead of fetching it at import time
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+
+@pytest.fixture
+def store_activity():
+    """Function storing one activity result in a Memory, as the executor does."""
+
+    def store(memory, activity_type, data=None, success=True, duration=None):
+        memory.store_activity_result(
+            {
+                "activity_type": activity_type,
+                "result": {"success": success, "data": data},
+                "duration": duration,
+            }
+        )
+
+    return store
+
+
+@pytest.fixture
+def baseline_memory_file(tmp_path):
+    """
+    Write tmp_path/memory.json in the layout of the original memory module:
+    entries without seqs, all but the newest 50 grouped by type under
+    "long_term". Returns a function taking the entry count (plus the
+    activity types, used in turn, and a function giving entry i's data) and
+    returning the entries written, oldest first.
+    """
+
+    def write(
+        count,
+        activity_types=("DrawActivity", "PostTweetActivity"),
+        data=lambda i: {"n": i},
+    ):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        entries = [
+            {
+                "timestamp": (start + timedelta(minutes=i)).isoformat(),
+                "activity_type": activity_types[i % len(activity_types)],
+                "success": True,
+                "error": None,
+                "data": data(i),
+                "metadata": {},
+            }
+            for i in range(count)
+        ]
+        long_term = {}
+        for entry in entries[:-50]:
+            long_term.setdefault(entry["activity_type"], []).append(entry)
+        (tmp_path / "memory.json").write_text(
+            json.dumps({"short_term": entries[-50:], "long_term": long_term})
+        )
+        return entries
+
+    return write
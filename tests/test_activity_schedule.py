@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+from framework.activity_schedule import (
+    ActivitySchedule,
+    CronSchedule,
+    TimeWindow,
+    compile_schedules,
+)
+
+MONDAY = datetime(2026, 1, 5, 12, 0)
+
+
+def test_cron_next_fire():
+    assert CronSchedule("55 23 * * *").next_fire(MONDAY) == datetime(2026, 1, 5, 23, 55)
+    assert CronSchedule("*/15 * * * *").next_fire(MONDAY) == datetime(
+        2026, 1, 5, 12, 15
+    )
+    assert CronSchedule("0 9 * * sat,sun").next_fire(MONDAY) == datetime(
+        2026, 1, 10, 9, 0
+    )
+    assert CronSchedule("0 0 1 feb *").next_fire(MONDAY) == datetime(2026, 2, 1)
+
+
+def test_cron_day_fields_match_either_when_both_restricted():
+    # The 7th (a Wednesday) or any Friday, whichever comes first
+    cron = CronSchedule("0 8 7 * fri")
+    assert cron.next_fire(MONDAY) == datetime(2026, 1, 7, 8, 0)
+    assert cron.next_fire(datetime(2026, 1, 7, 9, 0)) == datetime(2026, 1, 9, 8, 0)
+
+
+def test_cron_that_never_fires():
+    assert CronSchedule("0 0 30 2 *").next_fire(MONDAY) is None
+
+
+@pytest.mark.parametrize(
+    "expression", ["* * * *", "60 * * * *", "* 5-2 * * *", "*/0 * * * *", "x * * * *"]
+)
+def test_invalid_cron_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_time_window_wraps_past_midnight():
+    window = TimeWindow("22:00", "02:00", days=["mon"])
+
+    assert window.next_open(MONDAY) == datetime(2026, 1, 5, 22, 0)
+    late = datetime(2026, 1, 6, 1, 30)
+    assert window.next_open(late) == late
+    assert window.next_open(datetime(2026, 1, 6, 3, 0)) == datetime(2026, 1, 12, 22, 0)
+
+
+def test_missed_cron_fire_runs_within_grace_only():
+    schedule = ActivitySchedule({"cron": "0 * * * *", "cron_grace_seconds": 1800})
+    last_run = datetime(2026, 1, 5, 10, 0)
+
+    # The 11:00 fire was missed by 20 minutes: still run it now
+    now = datetime(2026, 1, 5, 11, 20)
+    assert schedule.next_allowed(now, last_run, now) == now
+    # Missed by 50 minutes: wait for the 12:00 fire
+    now = datetime(2026, 1, 5, 11, 50)
+    assert schedule.next_allowed(now, last_run, now) == datetime(2026, 1, 5, 12, 0)
+
+
+def test_windows_apply_on_top_of_cron():
+    schedule = ActivitySchedule(
+        {
+            "cron": "30 * * * *",
+            "time_windows": [{"start": "14:00", "end": "15:00"}],
+        }
+    )
+
+    assert schedule.next_allowed(MONDAY, MONDAY, MONDAY) == datetime(2026, 1, 5, 14, 0)
+
+
+def test_compile_schedules_skips_invalid_entries():
+    schedules = compile_schedules(
+        {
+            "Draw": {"cron": "0 9 * * *"},
+            "Broken": {"cron": "not cron"},
+            "Plain": {"min_energy": 0.3},
+        }
+    )
+
+    assert list(schedules) == ["Draw"]
@@ -0,0 +1,172 @@
+import asyncio
+
+from framework.activity_decorator import ActivityBase, ActivityResult, activity
+from framework.activity_selector import RETRY_SECONDS, ActivitySelector
+from framework.clock import VirtualClock
+from framework.simulation import SimulatedActivityLoader
+from framework.state import State
+
+
+def _activity_class(name, cooldown=3600, energy_cost=0.1):
+    async def execute(self, shared_data) -> ActivityResult:
+        return ActivityResult.success_result()
+
+    cls = type(name, (ActivityBase,), {"execute": execute})
+    return activity(name=name, energy_cost=energy_cost, cooldown=cooldown)(cls)
+
+
+def _selector(tmp_path, classes, constraints=None):
+    clock = VirtualClock()
+    selector = ActivitySelector(
+        constraints or {}, State(str(tmp_path), clock=clock), clock=clock
+    )
+    selector.set_activity_loader(
+        SimulatedActivityLoader({cls.__name__: cls for cls in classes})
+    )
+    return selector, clock
+
+
+def test_selected_activity_waits_out_its_cooldown(tmp_path):
+    selector, clock = _selector(tmp_path, [_activity_class("Draw", cooldown=600)])
+    scheduler = selector.scheduler
+
+    assert scheduler.seconds_until_next() == 0
+    assert selector.select_next_activity() is not None
+    assert scheduler.due_classes() == []
+    assert scheduler.seconds_until_next() == 600
+
+    clock.advance(600)
+    assert [cls.__name__ for cls in scheduler.due_classes()] == ["Draw"]
+
+
+def test_due_classes_are_ordered_by_due_time(tmp_path):
+    classes = [
+        _activity_class("Draw", cooldown=300),
+        _activity_class("Nap", cooldown=60),
+    ]
+    selector, clock = _selector(tmp_path, classes)
+    selector.last_activity_times = {"Draw": clock.now(), "Nap": clock.now()}
+    selector.scheduler.wake()
+    assert selector.scheduler.seconds_until_next() == 60
+
+    clock.advance(400)
+
+    assert [cls.__name__ for cls in selector.scheduler.due_classes()] == ["Nap", "Draw"]
+
+
+def test_energy_shortfall_delays_the_activity(tmp_path):
+    selector, _ = _selector(tmp_path, [_activity_class("Draw", energy_cost=0.5)])
+    selector.state.current_state["energy"] = 0.4
+
+    assert selector.select_next_activity() is None
+    assert round(selector.scheduler.seconds_until_next()) == 3600
+
+
+def test_disabled_activities_are_not_scheduled(tmp_path):
+    selector, _ = _selector(
+        tmp_path,
+        [_activity_class("Draw")],
+        {"activities_config": {"Draw": {"enabled": False}}},
+    )
+
+    assert selector.scheduler.seconds_until_next() is None
+    assert selector.select_next_activity() is None
+
+
+def test_cancel_selection_restores_the_previous_run(tmp_path):
+    selector, _ = _selector(tmp_path, [_activity_class("Draw")])
+    instance = selector.select_next_activity()
+
+    assert selector.cancel_selection(instance)
+    assert "Draw" not in selector.last_activity_times
+    assert selector.scheduler.seconds_until_next() == RETRY_SECONDS
+    assert not selector.cancel_selection(instance)
+
+
+def test_wait_returns_when_woken():
+    async def scenario(selector):
+        waiter = asyncio.create_task(selector.scheduler.wait())
+        await asyncio.sleep(0)
+        selector.scheduler.wake()
+        return await asyncio.wait_for(waiter, 1)
+
+    selector = ActivitySelector({}, None)
+    assert asyncio.run(scenario(selector)) is True
+
+
+def _pooled_class(name, events, fail_setup=False, cooldown=0):
+    cls = _activity_class(name, cooldown=cooldown)
+
+    def setup(self):
+        events.append(("setup", name))
+        if fail_setup:
+            raise RuntimeError("setup failed")
+
+    def teardown(self):
+        events.append(("teardown", name))
+
+    cls.setup = setup
+    cls.teardown = teardown
+    return cls
+
+
+def test_instances_are_pooled_across_selections(tmp_path):
+    events = []
+    selector, _ = _selector(tmp_path, [_pooled_class("Draw", events)])
+
+    first = selector.select_next_activity()
+    second = selector.select_next_activity()
+
+    assert first is second
+    assert events == [("setup", "Draw")]
+
+
+def test_reloaded_and_disabled_classes_are_released(tmp_path):
+    events = []
+    selector, _ = _selector(tmp_path, [_pooled_class("Draw", events)])
+    first = selector.select_next_activity()
+
+    selector.set_activity_loader(
+        SimulatedActivityLoader({"Draw": _pooled_class("Draw", events)})
+    )
+    second = selector.select_next_activity()
+    assert second is not first
+    assert events == [("setup", "Draw"), ("teardown", "Draw"), ("setup", "Draw")]
+
+    selector.constraints = {"activities_config": {"Draw": {"enabled": False}}}
+    selector.scheduler.wake()
+    selector.scheduler.seconds_until_next()
+    assert events[-1] == ("teardown", "Draw")
+    assert selector._instances == {}
+
+
+def test_failed_setup_falls_back_to_another_activity(tmp_path):
+    events = []
+    classes = [
+        _pooled_class("Broken", events, fail_setup=True),
+        _pooled_class("Draw", events),
+    ]
+    selector, _ = _selector(tmp_path, classes)
+
+    chosen = selector.select_next_activity()
+
+    assert type(chosen).__name__ == "Draw"
+    assert "Broken" not in selector._instances
+
+
+def test_close_tears_down_every_instance(tmp_path):
+    events = []
+    classes = [
+        _pooled_class("Draw", events, cooldown=3600),
+        _pooled_class("Nap", events, cooldown=3600),
+    ]
+    selector, _ = _selector(tmp_path, classes)
+    for _ in classes:
+        selector.select_next_activity()
+
+    selector.close()
+
+    assert sorted(e for e in events if e[0] == "teardown") == [
+        ("teardown", "Draw"),
+        ("teardown", "Nap"),
+    ]
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from framework.activity_decorator import ActivityBase, ActivityResult, activity
+from framework.deadline import MIN_TIMEOUT, deadline_scope, remaining_time
+from framework.memory_entry import OUTCOME_TIMEOUT
+
+
+def _activity(body, timeout=None):
+    @activity(name="test_activity", timeout=timeout)
+    class TestActivity(ActivityBase):
+        async def execute(self, shared_data) -> ActivityResult:
+            return await body()
+
+    return TestActivity()
+
+
+def test_activity_is_cancelled_at_its_timeout():
+    async def body():
+        await asyncio.sleep(10)
+        return ActivityResult.success_result()
+
+    result = asyncio.run(_activity(body, timeout=0.05).execute({}))
+
+    assert not result.success
+    assert result.metadata == {"outcome": OUTCOME_TIMEOUT, "timeout": 0.05}
+
+
+@pytest.mark.parametrize("timeout", [None, 5])
+def test_timeout_error_raised_inside_execute_is_an_ordinary_error(timeout):
+    async def body():
+        raise TimeoutError("read timed out")
+
+    result = asyncio.run(_activity(body, timeout=timeout).execute({}))
+
+    assert not result.success
+    assert result.error == "read timed out"
+    assert "outcome" not in result.metadata
+
+
+def test_remaining_time_follows_the_activity_into_threads():
+    async def body():
+        seen = await asyncio.to_thread(remaining_time)
+        return ActivityResult.success_result(data={"remaining": seen})
+
+    result = asyncio.run(_activity(body, timeout=30).execute({}))
+
+    assert result.success
+    assert 29 < result.data["remaining"] <= 30
+
+
+def test_remaining_time_without_a_deadline():
+    assert remaining_time() is None
+    assert remaining_time(10) == 10
+
+
+def test_nested_deadline_scopes_only_tighten():
+    with deadline_scope(5):
+        with deadline_scope(60):
+            assert remaining_time() <= 5
+        with deadline_scope(1):
+            assert remaining_time() <= 1
+        assert 4 < remaining_time() <= 5
+        assert remaining_time(2) == 2
+    assert remaining_time() is None
+
+
+def test_remaining_time_never_drops_below_the_minimum():
+    with deadline_scope(0):
+        assert remaining_time() == MIN_TIMEOUT
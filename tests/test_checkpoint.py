@@ -0,0 +1,60 @@
+import json
+
+from framework.checkpoint import RuntimeCheckpoint
+from framework.persistence import WriteBehindPersister
+from framework.shared_data import SharedData
+
+
+def _shared_data():
+    shared_data = SharedData()
+    shared_data.initialize()
+    return shared_data
+
+
+def test_sections_round_trip(tmp_path):
+    shared_data = _shared_data()
+    shared_data.set("state", "mood", "curious")
+    checkpoint = RuntimeCheckpoint(str(tmp_path))
+    checkpoint.register(
+        "shared_data", shared_data.export_state, shared_data.restore_state
+    )
+    checkpoint.save()
+
+    restored = _shared_data()
+    fresh = RuntimeCheckpoint(str(tmp_path))
+    fresh.register("shared_data", restored.export_state, restored.restore_state)
+
+    assert fresh.restore()
+    assert restored.get("state", "mood") == "curious"
+
+
+def test_failing_sections_do_not_block_the_rest(tmp_path):
+    restored = []
+    checkpoint = RuntimeCheckpoint(str(tmp_path))
+    checkpoint.register("broken", lambda: 1 / 0, lambda data: None)
+    checkpoint.register("ok", lambda: [1, 2], restored.append)
+    checkpoint.save()
+
+    assert "broken" not in checkpoint.load()
+    assert checkpoint.restore()
+    assert restored == [[1, 2]]
+
+
+def test_missing_or_foreign_checkpoints_are_ignored(tmp_path):
+    checkpoint = RuntimeCheckpoint(str(tmp_path))
+    assert checkpoint.load() is None
+    assert not checkpoint.restore()
+
+    checkpoint.checkpoint_file.write_text(json.dumps({"version": 0}))
+    assert checkpoint.load() is None
+
+
+def test_saves_go_through_the_persister(tmp_path):
+    checkpoint = RuntimeCheckpoint(str(tmp_path))
+    checkpoint.register("counter", lambda: 7, lambda data: None)
+    persister = WriteBehindPersister()
+    checkpoint.attach_persister(persister)
+
+    checkpoint.save()
+
+    assert checkpoint.load()["counter"] == 7
@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from framework.activity_decorator import ActivityBase, ActivityResult, activity
+from framework.activity_selector import ActivitySelector
+from framework.clock import VirtualClock
+from framework.executor import ConcurrentExecutor
+from framework.simulation import SimulatedActivityLoader
+from framework.state import State
+
+
+def _activity_class(name, energy_cost=0.1, required_skills=None, instance_cost=None):
+    async def execute(self, shared_data) -> ActivityResult:
+        await asyncio.sleep(0)
+        return ActivityResult.success_result()
+
+    def __init__(self):
+        ActivityBase.__init__(self)
+        if instance_cost is not None:
+            self.energy_cost = instance_cost
+
+    cls = type(name, (ActivityBase,), {"execute": execute, "__init__": __init__})
+    return activity(
+        name=name,
+        energy_cost=energy_cost,
+        cooldown=3600,
+        required_skills=required_skills,
+    )(cls)
+
+
+def _being(tmp_path, classes, config):
+    clock = VirtualClock()
+    state = State(str(tmp_path), clock=clock)
+    selector = ActivitySelector({}, state, clock=clock)
+    selector.set_activity_loader(
+        SimulatedActivityLoader({cls.__name__: cls for cls in classes})
+    )
+
+    async def execute_activity(activity):
+        return await activity.execute(None)
+
+    being = SimpleNamespace(
+        activity_selector=selector, state=state, execute_activity=execute_activity
+    )
+    return being, ConcurrentExecutor(being, {"mode": "concurrent", **config})
+
+
+def test_fill_respects_max_concurrent_and_skill_limits(tmp_path):
+    classes = [
+        _activity_class("TweetA", required_skills=["twitter_posting"]),
+        _activity_class("TweetB", required_skills=["twitter_posting"]),
+        _activity_class("Draw"),
+        _activity_class("Analyze"),
+    ]
+    being, executor = _being(
+        tmp_path,
+        classes,
+        {"max_concurrent": 3, "skill_concurrency": {"twitter_posting": 1}},
+    )
+
+    async def run():
+        started = executor.fill()
+        names = {type(a).__name__ for a in started}
+        reserved = being.state.get_reserved_energy()
+        await executor.wait_all()
+        return names, reserved
+
+    names, reserved = asyncio.run(run())
+
+    assert len(names) == 3
+    assert len(names & {"TweetA", "TweetB"}) == 1
+    assert reserved == pytest.approx(0.3)
+    assert being.state.get_reserved_energy() == pytest.approx(0)
+
+
+def test_failed_energy_reservation_does_not_start_a_cooldown(tmp_path):
+    # The class cost passes selection, but the instance needs more energy
+    greedy = _activity_class("Greedy", energy_cost=0.1, instance_cost=5.0)
+    being, executor = _being(tmp_path, [greedy], {})
+    selector = being.activity_selector
+
+    started = executor.fill()
+
+    assert started == []
+    assert "Greedy" not in selector.last_activity_times
+    assert being.state.get_reserved_energy() == 0
+    # Retried once the scheduler is woken, e.g. when energy is released
+    selector.scheduler.wake()
+    assert selector.select_next_activity() is not None
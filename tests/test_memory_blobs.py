@@ -0,0 +1,50 @@
+from framework.memory import Memory
+from framework.memory_blobs import BlobStore, is_blob_ref
+
+
+def test_identical_payloads_are_stored_once(tmp_path):
+    blobs = BlobStore(tmp_path / "blobs")
+    first = blobs.put({"prompt": "x" * 100})
+    second = blobs.put({"prompt": "x" * 100})
+
+    assert first == second
+    assert len(list((tmp_path / "blobs").rglob("*.json.gz"))) == 1
+    assert blobs.get(first["$blob"]) == {"prompt": "x" * 100}
+
+
+def test_externalize_only_moves_large_fields(tmp_path):
+    blobs = BlobStore(tmp_path / "blobs")
+    value = {"small": "ok", "large": "y" * 200, "count": 3}
+
+    externalized = blobs.externalize(value, threshold=64)
+
+    assert externalized["small"] == "ok"
+    assert externalized["count"] == 3
+    assert is_blob_ref(externalized["large"])
+    assert value["large"] == "y" * 200
+    assert blobs.resolve(externalized) == value
+    assert blobs.externalize("short", threshold=64) == "short"
+
+
+def test_memory_externalizes_and_resolves_payloads(tmp_path, store_activity):
+    memory = Memory(str(tmp_path), blob_threshold=64)
+    store_activity(memory, "DrawActivity", {"prompt": "z" * 500, "size": 1})
+    store_activity(memory, "DrawActivity", {"prompt": "z" * 500, "size": 2})
+
+    stored = memory.short_term_memory[-1]["data"]
+    assert is_blob_ref(stored["prompt"])
+    assert len(list((tmp_path / "blobs").rglob("*.json.gz"))) == 1
+
+    recent = memory.get_recent_activities(limit=2)
+    assert [r["data"] for r in recent] == [
+        {"prompt": "z" * 500, "size": 2},
+        {"prompt": "z" * 500, "size": 1},
+    ]
+
+
+def test_missing_blob_resolves_to_none(tmp_path):
+    blobs = BlobStore(tmp_path / "blobs")
+    ref = blobs.put("payload" * 50)
+    blobs.clear()
+
+    assert blobs.resolve(ref) is None
@@ -0,0 +1,68 @@
+import json
+
+from framework.memory import Memory
+from framework.memory_entry import MemoryEntry, entry_to_json, extract_artifacts
+
+
+def test_extract_artifacts_from_nested_payloads():
+    data = {
+        "image_data": {"url": "https://example.com/a.png"},
+        "tweet_id": 12345,
+        "commits_analyzed": ["abc", "def", "abc"],
+        "flag": True,
+    }
+
+    assert extract_artifacts(data, {"generation_id": "gen-1"}) == {
+        "media_urls": ["https://example.com/a.png"],
+        "tweet_ids": ["12345"],
+        "commit_shas": ["abc", "def"],
+        "generation_ids": ["gen-1"],
+    }
+    assert extract_artifacts({"text": "nothing here"}, None) == {}
+
+
+def test_entry_round_trips_and_acts_like_a_dict():
+    entry = MemoryEntry(
+        timestamp="2026-01-01T00:00:00",
+        activity_type="PostTweetActivity",
+        success=True,
+        data={"tweet_id": "42"},
+        seq=7,
+    )
+
+    assert entry.tweet_ids == ("42",)
+    assert entry.media_urls == ()
+    assert entry["activity_type"] == "PostTweetActivity"
+    assert entry.get("missing", "default") == "default"
+    assert {**entry}["artifacts"] == {"tweet_ids": ["42"]}
+
+    copy = MemoryEntry.from_dict(json.loads(entry_to_json(entry)))
+    assert copy.to_dict() == entry.to_dict()
+    assert MemoryEntry.from_dict(entry) is entry
+
+
+def test_entry_without_artifacts_omits_the_field():
+    entry = MemoryEntry.from_dict({"timestamp": "t", "activity_type": "Nap"})
+
+    assert "artifacts" not in entry
+    assert entry.metadata == {}
+    assert "artifacts" not in entry.to_dict()
+
+
+def test_memory_indexes_artifacts(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    store_activity(
+        memory, "DrawActivity", {"image_data": {"url": "https://example.com/1.png"}}
+    )
+    store_activity(memory, "PostTweetActivity", {"tweet_id": "99"})
+    store_activity(
+        memory, "DrawActivity", {"image_data": {"url": "https://example.com/2.png"}}
+    )
+
+    urls = memory.get_artifacts("media_urls")
+    assert [a["value"] for a in urls] == [
+        "https://example.com/2.png",
+        "https://example.com/1.png",
+    ]
+    assert memory.get_artifacts("tweet_ids")[0]["activity_type"] == "PostTweetActivity"
+    assert memory.get_artifacts("unknown") == []
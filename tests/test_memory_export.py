@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from framework.memory import Memory
+from framework.memory_export import SCHEMA_VERSION, read_records, write_records
+
+
+@pytest.mark.parametrize("name", ["memory.ndjson", "memory.ndjson.gz"])
+def test_write_and_read_records(tmp_path, name):
+    path = tmp_path / name
+    records = [
+        {"timestamp": f"2026-01-0{i}T00:00:00", "activity_type": "A", "seq": i}
+        for i in range(1, 4)
+    ]
+
+    assert write_records(path, records) == 3
+
+    read = list(read_records(path))
+    assert [r["seq"] for r in read] == [1, 2, 3]
+    assert read[0]["id"] == "2026-01-01T00:00:00|A"
+    assert not (tmp_path / (name + ".tmp")).exists()
+
+
+def test_headerless_files_are_migrated_from_v1(tmp_path):
+    path = tmp_path / "old.ndjson"
+    path.write_text(
+        json.dumps({"timestamp": "2025-01-01T00:00:00", "activity_type": "A"})
+        + "\nnot json\n",
+        encoding="utf-8",
+    )
+
+    (record,) = read_records(path)
+
+    assert record["metadata"] == {}
+    assert record["success"] is False
+    assert record["id"] == "2025-01-01T00:00:00|A"
+
+
+def test_newer_schema_is_rejected(tmp_path):
+    path = tmp_path / "future.ndjson"
+    header = {"format": "memory_export", "schema_version": SCHEMA_VERSION + 1}
+    path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(read_records(path))
+
+
+def test_memory_export_import_round_trip(tmp_path, store_activity):
+    source = Memory(str(tmp_path / "source"), blob_threshold=32)
+    for i in range(5):
+        store_activity(source, "DrawActivity", {"n": i, "prompt": "p" * 100})
+    export = tmp_path / "backup.ndjson.gz"
+    assert source.export_ndjson(str(export)) == 5
+
+    target = Memory(str(tmp_path / "target"))
+    assert target.import_ndjson(str(export)) == {"imported": 5, "duplicates": 0}
+    assert target.import_ndjson(str(export)) == {"imported": 0, "duplicates": 5}
+
+    recent = target.get_recent_activities(limit=5)
+    assert [a["data"]["n"] for a in recent] == [4, 3, 2, 1, 0]
+    assert recent[0]["data"]["prompt"] == "p" * 100
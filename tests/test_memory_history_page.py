@@ -0,0 +1,74 @@
+import pytest
+from framework.memory import SHORT_TERM_CAPACITY, Memory, decode_cursor, encode_cursor
+
+
+def _walk(memory, **filters):
+    pages, cursor = [], None
+    while True:
+        page = memory.get_history_page(cursor=cursor, **filters)
+        pages.append(page)
+        assert page["next_cursor"] != cursor, "cursor did not advance"
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_short_long_term_and_archive(tmp_path, store_activity):
+    memory = Memory(str(tmp_path), retention={"default": {"max_entries": 5}})
+    total = SHORT_TERM_CAPACITY + 20
+    for i in range(total):
+        store_activity(memory, "DrawActivity", {"n": i})
+    assert memory.apply_retention() == 15
+
+    pages = _walk(memory, limit=7)
+
+    numbers = [a["data"]["n"] for page in pages for a in page["activities"]]
+    assert numbers == list(reversed(range(total)))
+    assert all(page["has_more"] for page in pages[:-1])
+    assert not pages[-1]["has_more"]
+
+
+def test_filters_apply_across_pages(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    for i in range(12):
+        store_activity(
+            memory, "DrawActivity" if i % 2 else "NapActivity", {"n": i}, i % 3 != 0
+        )
+
+    draws = _walk(memory, limit=2, activity_type="DrawActivity")
+    assert [a["data"]["n"] for p in draws for a in p["activities"]] == [
+        11,
+        9,
+        7,
+        5,
+        3,
+        1,
+    ]
+
+    failures = _walk(memory, limit=3, success=False)
+    assert [a["data"]["n"] for p in failures for a in p["activities"]] == [9, 6, 3, 0]
+
+
+def test_cursor_round_trip_and_malformed_cursors(tmp_path):
+    assert decode_cursor(encode_cursor("2026-01-01T00:00:00", 3)) == (
+        "2026-01-01T00:00:00",
+        3,
+    )
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        Memory(str(tmp_path)).get_history_page(cursor=encode_cursor("t", "x"))
+
+
+def test_pages_walk_a_store_loaded_from_a_baseline_file(tmp_path, baseline_memory_file):
+    entries = baseline_memory_file(130)
+    memory = Memory(str(tmp_path))
+
+    pages = _walk(memory, limit=40)
+
+    numbers = [a["data"]["n"] for page in pages for a in page["activities"]]
+    assert numbers == [e["data"]["n"] for e in reversed(entries)]
+    assert len(pages) == 4
+    assert pages[-1]["has_more"] is False
+    draws = _walk(memory, limit=40, activity_type="DrawActivity")
+    assert sum(len(page["activities"]) for page in draws) == 65
@@ -0,0 +1,36 @@
+from framework.memory import SHORT_TERM_CAPACITY, Memory
+
+
+def test_long_term_segments_are_loaded_on_demand(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    for i in range(SHORT_TERM_CAPACITY + 40):
+        store_activity(
+            memory, "DrawActivity" if i % 2 else "PostTweetActivity", {"n": i}
+        )
+    memory.close()
+
+    reloaded = Memory(str(tmp_path), max_resident_segments=1)
+    store = reloaded.long_term_memory
+    assert sorted(store.types()) == ["DrawActivity", "PostTweetActivity"]
+    assert store.resident_types() == []
+
+    draws = reloaded.get_activity_history("DrawActivity")
+    assert [a["data"]["n"] for a in draws] == list(range(1, 40, 2))
+    assert store.resident_types() == ["DrawActivity"]
+
+    reloaded.get_activity_history("PostTweetActivity")
+    # Only max_resident_segments stay in RAM
+    assert store.resident_types() == ["PostTweetActivity"]
+
+
+def test_long_term_appends_do_not_load_the_segment(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    for i in range(SHORT_TERM_CAPACITY + 5):
+        store_activity(memory, "DrawActivity", {"n": i})
+    memory.close()
+
+    reloaded = Memory(str(tmp_path))
+    store_activity(reloaded, "DrawActivity", {"n": "new"})
+
+    assert reloaded.long_term_memory.resident_types() == []
+    assert len(reloaded.get_activity_history("DrawActivity")) == 6
@@ -0,0 +1,78 @@
+import json
+
+from framework.memory import MEMORY_FORMAT_VERSION, Memory
+
+
+def _all_seqs(memory):
+    return [entry["seq"] for entry in memory._iter_history()]
+
+
+def test_baseline_entries_get_unique_seqs_in_time_order(tmp_path, baseline_memory_file):
+    entries = baseline_memory_file(130)
+
+    memory = Memory(str(tmp_path))
+
+    history = list(memory._iter_history())
+    assert [e["data"]["n"] for e in history] == [e["data"]["n"] for e in entries]
+    assert [e["seq"] for e in history] == list(range(1, 131))
+    assert memory._last_seq == 130
+
+
+def test_assigned_seqs_are_persisted(tmp_path, baseline_memory_file):
+    baseline_memory_file(130)
+    Memory(str(tmp_path))
+
+    data = json.loads((tmp_path / "memory.json").read_text())
+    assert data["format_version"] == MEMORY_FORMAT_VERSION
+    assert "long_term" not in data
+
+    reloaded = Memory(str(tmp_path))
+    assert _all_seqs(reloaded) == list(range(1, 131))
+    reloaded.store_activity_result(
+        {"activity_type": "DrawActivity", "result": {"success": True}}
+    )
+    assert _all_seqs(reloaded)[-1] == 131
+
+
+def test_wal_journal_is_folded_in_before_renumbering(tmp_path, baseline_memory_file):
+    baseline_memory_file(60)
+    memory = Memory(str(tmp_path), storage_mode="wal")
+    memory.store_activity_result(
+        {"activity_type": "DrawActivity", "result": {"success": True, "data": {}}}
+    )
+    # Crash with the new entry only in the journal, on a pre-seq file
+    memory._journal.close()
+    data = json.loads((tmp_path / "memory.json").read_text())
+    del data["format_version"]
+    (tmp_path / "memory.json").write_text(json.dumps(data))
+
+    reloaded = Memory(str(tmp_path), storage_mode="wal")
+
+    # Renumbered above every seq the snapshot and journal already used
+    assert _all_seqs(reloaded) == list(range(62, 123))
+    assert reloaded.get_recent_activities(limit=1)[0]["data"] == {}
+    assert reloaded._journal.record_count == 0
+
+
+def test_archived_entries_are_renumbered(tmp_path):
+    memory = Memory(str(tmp_path), retention={"default": {"max_entries": 10}})
+    for _ in range(150):
+        memory.store_activity_result(
+            {"activity_type": "DrawActivity", "result": {"success": True, "data": {}}}
+        )
+    memory.apply_retention()
+    memory.close()
+    assert list(memory.archive.read("DrawActivity"))
+    # Entries archived by the original seq-less format read as seq 0
+    for partition in memory.archive.partitions("DrawActivity"):
+        partition.unlink()
+    memory.archive.write([{**entry, "seq": 0} for entry in memory._iter_history()][:40])
+    data = json.loads((tmp_path / "memory.json").read_text())
+    del data["format_version"]
+    (tmp_path / "memory.json").write_text(json.dumps(data))
+
+    reloaded = Memory(str(tmp_path))
+
+    seqs = _all_seqs(reloaded)
+    assert len(seqs) == len(set(seqs))
+    assert seqs == sorted(seqs)
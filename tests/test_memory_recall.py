@@ -0,0 +1,79 @@
+import numpy as np
+from framework.memory import Memory
+from framework.memory_vectors import HashingEmbedder
+
+
+def test_embeddings_are_normalized_and_stable():
+    embedder = HashingEmbedder(64)
+    vector = embedder.embed("red bean paste")
+
+    assert abs(np.linalg.norm(vector) - 1) < 1e-6
+    assert np.array_equal(vector, HashingEmbedder(64).embed("red bean paste"))
+    assert not embedder.embed("").any()
+
+
+def test_recall_ranks_similar_entries_first(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    store_activity(
+        memory, "DrawActivity", {"text": "painting cherry blossoms in spring"}
+    )
+    store_activity(
+        memory, "AnalyzeNewCommitsActivity", {"text": "refactored the database layer"}
+    )
+    store_activity(
+        memory, "PostTweetActivity", {"text": "cherry blossoms falling like snow"}
+    )
+
+    results = memory.recall("cherry blossom", k=2)
+
+    assert {r["activity_type"] for r in results} == {
+        "DrawActivity",
+        "PostTweetActivity",
+    }
+    assert results[0]["score"] >= results[1]["score"]
+    draws = memory.recall("cherry blossom", activity_type="DrawActivity")
+    assert [r["activity_type"] for r in draws] == ["DrawActivity"]
+
+
+def test_vectors_are_reopened_and_caught_up(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    for i in range(10):
+        store_activity(memory, "DrawActivity", {"text": f"lantern number {i}"})
+    memory.close()
+    reopened = Memory(str(tmp_path))
+    store_activity(reopened, "DrawActivity", {"text": "paper crane"})
+
+    assert len(reopened.vectors) == 11
+    assert reopened.recall("paper crane", k=1)[0]["data"]["text"] == "paper crane"
+
+
+def test_recall_finds_each_entry_of_a_store_loaded_from_a_baseline_file(
+    tmp_path, baseline_memory_file
+):
+    cranes = {5, 70, 120}
+    baseline_memory_file(
+        130, data=lambda i: {"text": "paper crane" if i in cranes else f"entry {i}"}
+    )
+    memory = Memory(str(tmp_path))
+
+    results = memory.recall("paper crane", k=3)
+
+    assert [r["data"]["text"] for r in results] == ["paper crane"] * 3
+    assert {r["seq"] for r in results} == {i + 1 for i in cranes}
+
+
+def test_stale_vectors_are_rebuilt_on_first_recall(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    store_activity(memory, "DrawActivity", {"text": "paper crane"})
+    for i in range(120):
+        store_activity(memory, "DrawActivity", {"text": f"lantern number {i}"})
+    memory.close()
+    (tmp_path / "vectors" / "vectors.json").unlink()
+
+    reloaded = Memory(str(tmp_path))
+    assert len(reloaded.vectors) == 0
+    store_activity(reloaded, "DrawActivity", {"text": "origami swan"})
+
+    assert reloaded.recall("paper crane", k=1)[0]["data"]["text"] == "paper crane"
+    assert reloaded.recall("origami swan", k=1)[0]["data"]["text"] == "origami swan"
+    assert len(reloaded.vectors) == 122
@@ -0,0 +1,44 @@
+import json
+
+from framework.memory import SHORT_TERM_CAPACITY, Memory
+
+
+def test_recent_activities_are_newest_first_and_paginated(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    for i in range(30):
+        store_activity(memory, "DrawActivity", {"n": i})
+
+    assert [a["data"]["n"] for a in memory.get_recent_activities(limit=3)] == [
+        29,
+        28,
+        27,
+    ]
+    page = memory.get_recent_activities(limit=3, offset=27)
+    assert [a["data"]["n"] for a in page] == [2, 1, 0]
+
+
+def test_short_term_memory_is_bounded(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    for i in range(SHORT_TERM_CAPACITY + 25):
+        store_activity(memory, "DrawActivity", {"n": i})
+
+    assert len(memory.short_term_memory) == SHORT_TERM_CAPACITY
+    assert memory.short_term_memory[0]["data"]["n"] == 25
+    assert len(memory.long_term_memory.get("DrawActivity", [])) == 25
+
+
+def test_unordered_memory_file_is_sorted_once_at_load(tmp_path):
+    entries = [
+        {
+            "timestamp": f"2024-01-0{day}T00:00:00+00:00",
+            "activity_type": "A",
+            "success": True,
+            "data": {"day": day},
+        }
+        for day in (3, 1, 2)
+    ]
+    (tmp_path / "memory.json").write_text(json.dumps({"short_term": entries}))
+
+    memory = Memory(str(tmp_path))
+
+    assert [a["data"]["day"] for a in memory.get_recent_activities()] == [3, 2, 1]
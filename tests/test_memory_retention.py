@@ -0,0 +1,38 @@
+from framework.memory import SHORT_TERM_CAPACITY, Memory
+from framework.memory_archive import MemoryArchive
+
+
+def test_entries_past_max_entries_are_archived(tmp_path, store_activity):
+    memory = Memory(str(tmp_path), retention={"default": {"max_entries": 10}})
+    for i in range(SHORT_TERM_CAPACITY + 50):
+        store_activity(memory, "DrawActivity", {"n": i})
+
+    archived = memory.apply_retention()
+
+    assert archived == 40
+    assert len(memory.long_term_memory.get("DrawActivity")) == 10
+    history = memory.get_activity_history("DrawActivity", include_archive=True)
+    assert [a["data"]["n"] for a in history] == list(range(50))
+    assert len(memory.get_activity_history("DrawActivity")) == 10
+
+
+def test_newest_long_term_entry_is_always_kept(tmp_path, store_activity):
+    memory = Memory(str(tmp_path), retention={"DrawActivity": {"max_age_days": 0}})
+    for i in range(SHORT_TERM_CAPACITY + 3):
+        store_activity(memory, "DrawActivity", {"n": i})
+
+    memory.apply_retention("DrawActivity")
+
+    assert [e["data"]["n"] for e in memory.long_term_memory.get("DrawActivity")] == [2]
+
+
+def test_archive_reads_only_partitions_since(tmp_path):
+    archive = MemoryArchive(tmp_path / "archive")
+    archive.write(
+        {"timestamp": f"2024-{month:02d}-15T00:00:00+00:00", "activity_type": "A"}
+        for month in (1, 2, 3)
+    )
+
+    assert len(archive.partitions("A")) == 3
+    since = list(archive.read("A", since="2024-02-01"))
+    assert [e["timestamp"][:7] for e in since] == ["2024-02", "2024-03"]
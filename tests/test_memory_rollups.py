@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+from framework.memory import Memory
+from framework.memory_rollups import MemoryRollups
+
+
+def _entry(timestamp, activity_type, success=True, energy=0.0, duration=None):
+    return {
+        "timestamp": timestamp.isoformat(),
+        "activity_type": activity_type,
+        "success": success,
+        "energy": energy,
+        "duration": duration,
+    }
+
+
+def _base():
+    now = datetime.now(timezone.utc)
+    return now.replace(minute=0, second=0, microsecond=0) - timedelta(days=1)
+
+
+def test_hourly_buckets_with_type_breakdown():
+    base = _base()
+    rollups = MemoryRollups()
+    rollups.record(_entry(base, "DrawActivity", energy=0.2, duration=4.0))
+    rollups.record(_entry(base + timedelta(minutes=10), "DrawActivity", success=False))
+    rollups.record(_entry(base + timedelta(hours=1), "NapActivity", duration=1.0))
+
+    series = rollups.timeseries("hour")
+
+    assert [b["count"] for b in series] == [2, 1]
+    first = series[0]
+    assert first["success_rate"] == 0.5
+    assert first["energy"] == 0.2
+    assert first["mean_duration"] == 4.0
+    assert set(first["by_type"]) == {"DrawActivity"}
+    assert rollups.timeseries("day")[0]["count"] == 3
+
+
+def test_range_and_type_filters():
+    base = _base()
+    rollups = MemoryRollups()
+    for hour in range(5):
+        rollups.record(_entry(base + timedelta(hours=hour), "DrawActivity"))
+    rollups.record(_entry(base + timedelta(hours=2), "NapActivity"))
+
+    since = (base + timedelta(hours=1, minutes=30)).isoformat()
+    until = (base + timedelta(hours=3)).isoformat()
+    series = rollups.timeseries("hour", since=since, until=until)
+    assert len(series) == 3
+
+    naps = rollups.timeseries("hour", activity_type="NapActivity")
+    assert len(naps) == 1
+    assert "by_type" not in naps[0]
+
+
+def test_old_hourly_buckets_are_pruned_but_daily_kept():
+    old = _base() - timedelta(days=30)
+    rollups = MemoryRollups(hourly_retention_days=7)
+    rollups.record(_entry(old, "DrawActivity"))
+    rollups.record(_entry(_base(), "DrawActivity"))
+
+    assert len(rollups.timeseries("hour")) == 1
+    assert len(rollups.timeseries("day")) == 2
+
+
+def test_round_trip_through_dict():
+    rollups = MemoryRollups()
+    rollups.record(_entry(_base(), "DrawActivity", energy=0.1))
+
+    restored = MemoryRollups.from_dict(rollups.to_dict())
+
+    assert restored.timeseries("day") == rollups.timeseries("day")
+
+
+def test_memory_timeseries(tmp_path):
+    memory = Memory(str(tmp_path))
+    memory.store_activity_result(
+        {"activity_type": "DrawActivity", "result": {"success": True, "data": None}}
+    )
+
+    assert memory.get_activity_timeseries("day")[0]["count"] == 1
+    assert memory.get_activity_timeseries("week") == []
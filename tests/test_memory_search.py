@@ -0,0 +1,157 @@
+import logging
+
+from framework.memory import INDEX_SAVE_INTERVAL, SHORT_TERM_CAPACITY, Memory
+from framework.memory_index import InvertedIndex, tokenize
+
+
+def test_tokenize_lowercases_and_drops_short_tokens():
+    assert tokenize("A Cherry-Blossom, 2024!") == ["cherry", "blossom", "2024"]
+
+
+def test_search_matches_every_word_newest_first(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    store_activity(memory, "DrawActivity", {"text": "cherry blossom at dawn"})
+    store_activity(memory, "PostTweetActivity", {"text": "cherry blossom haiku"})
+    store_activity(memory, "DrawActivity", {"text": "cherry tree"})
+
+    results = memory.search("Cherry blossom")
+    assert [r["data"]["text"] for r in results] == [
+        "cherry blossom haiku",
+        "cherry blossom at dawn",
+    ]
+    draws = memory.search("cherry", activity_type="DrawActivity", limit=1)
+    assert [r["data"]["text"] for r in draws] == ["cherry tree"]
+    assert memory.search("unknown words") == []
+
+
+def test_search_reaches_archived_entries(tmp_path, store_activity):
+    memory = Memory(str(tmp_path), retention={"default": {"max_entries": 1}})
+    store_activity(memory, "DrawActivity", {"text": "first lantern"})
+    for i in range(SHORT_TERM_CAPACITY + 5):
+        store_activity(memory, "DrawActivity", {"text": f"filler {i}"})
+    memory.apply_retention()
+
+    assert [r["data"]["text"] for r in memory.search("lantern")] == ["first lantern"]
+
+
+def test_index_survives_a_crash_without_a_rebuild(tmp_path, caplog, store_activity):
+    memory = Memory(str(tmp_path))
+    for i in range(INDEX_SAVE_INTERVAL + 7):
+        store_activity(memory, "DrawActivity", {"text": f"entry{i}"})
+    # No close(): only the incremental saves reached disk
+    caplog.clear()
+
+    with caplog.at_level(logging.INFO, logger="framework.memory"):
+        reloaded = Memory(str(tmp_path))
+        assert reloaded.search(f"entry{INDEX_SAVE_INTERVAL + 6}")
+
+    assert "Rebuilt memory search index" not in caplog.text
+    assert len(reloaded.index) == INDEX_SAVE_INTERVAL + 7
+
+
+def test_index_is_read_on_first_use_not_at_startup(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    for i in range(SHORT_TERM_CAPACITY + 20):
+        store_activity(memory, "DrawActivity", {"text": f"entry{i}"})
+    memory.close()
+
+    reloaded = Memory(str(tmp_path))
+    assert len(reloaded.index) == 0
+    store_activity(reloaded, "DrawActivity", {"text": "fresh"})
+
+    assert [r["data"]["text"] for r in reloaded.search("fresh")] == ["fresh"]
+    assert reloaded.search("entry0")
+    assert len(reloaded.index) == SHORT_TERM_CAPACITY + 21
+
+
+def test_stale_index_is_rebuilt_on_first_use(tmp_path, caplog, store_activity):
+    memory = Memory(str(tmp_path))
+    for i in range(SHORT_TERM_CAPACITY + 20):
+        store_activity(memory, "DrawActivity", {"text": f"entry{i}"})
+    memory.close()
+    (tmp_path / "memory_index.log.jsonl").unlink()
+
+    with caplog.at_level(logging.INFO, logger="framework.memory"):
+        reloaded = Memory(str(tmp_path))
+        store_activity(reloaded, "DrawActivity", {"text": "fresh"})
+        assert "Rebuilt memory search index" not in caplog.text
+        assert reloaded.search("fresh")
+
+    assert "Rebuilt memory search index" in caplog.text
+    assert reloaded.search("entry0")
+    reloaded.close()
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger="framework.memory"):
+        assert Memory(str(tmp_path)).search("fresh")
+    assert "Rebuilt memory search index" not in caplog.text
+
+
+def test_index_saves_append_to_the_log_without_rewriting_the_base(
+    tmp_path, store_activity
+):
+    memory = Memory(str(tmp_path))
+    base = (tmp_path / "memory_index.json.gz").read_bytes()
+    for i in range(INDEX_SAVE_INTERVAL * 2):
+        store_activity(memory, "DrawActivity", {"text": f"entry{i}"})
+    memory.close()
+
+    assert (tmp_path / "memory_index.json.gz").read_bytes() == base
+    log = (tmp_path / "memory_index.log.jsonl").read_text().splitlines()
+    assert len(log) == 1 + INDEX_SAVE_INTERVAL * 2
+    reloaded = Memory(str(tmp_path))
+    assert reloaded.search("entry0")
+    assert len(reloaded.index) == INDEX_SAVE_INTERVAL * 2
+
+
+def test_index_log_is_folded_into_the_base_once_it_outgrows_it(
+    tmp_path, monkeypatch, store_activity
+):
+    monkeypatch.setattr("framework.memory.INDEX_COMPACT_MIN_ENTRIES", 60)
+    memory = Memory(str(tmp_path))
+    for i in range(INDEX_SAVE_INTERVAL * 3):
+        store_activity(memory, "DrawActivity", {"text": f"entry{i}"})
+    memory.close()
+
+    # Folded at 100 logged entries; the last 50 are in the log again
+    log = (tmp_path / "memory_index.log.jsonl").read_text().splitlines()
+    assert len(log) == 1 + INDEX_SAVE_INTERVAL
+    base = InvertedIndex()
+    assert base.load(tmp_path / "memory_index.json.gz")
+    assert len(base) == INDEX_SAVE_INTERVAL * 2
+    reloaded = Memory(str(tmp_path))
+    assert reloaded.search("entry149")
+    assert len(reloaded.index) == INDEX_SAVE_INTERVAL * 3
+
+
+def test_index_save_and_load_round_trip(tmp_path):
+    index = InvertedIndex()
+    index.add(
+        {"seq": 1, "timestamp": "2024-01-01", "activity_type": "A", "data": "red bean"}
+    )
+    index.add(
+        {"seq": 2, "timestamp": "2024-01-02", "activity_type": "B", "data": "red sun"}
+    )
+    assert index.save(tmp_path / "index.json.gz")
+
+    loaded = InvertedIndex()
+    assert loaded.load(tmp_path / "index.json.gz")
+    assert loaded.max_seq == 2
+    assert [hit[0] for hit in loaded.search("red", limit=10)] == [2, 1]
+
+
+def test_search_finds_each_entry_of_a_store_loaded_from_a_baseline_file(
+    tmp_path, baseline_memory_file
+):
+    texts = {5: "red lantern", 70: "red kite", 120: "red panda"}
+    baseline_memory_file(130, data=lambda i: {"text": texts.get(i, f"entry {i}")})
+    memory = Memory(str(tmp_path))
+
+    results = memory.search("red")
+
+    assert [r["data"]["text"] for r in results] == [
+        "red panda",
+        "red kite",
+        "red lantern",
+    ]
+    assert len({r["seq"] for r in results}) == 3
+    assert memory.search("kite", activity_type="DrawActivity")[0]["seq"] == 71
@@ -0,0 +1,72 @@
+import pytest
+from framework.memory import Memory, create_memory
+from framework.memory_sqlite import SQLiteMemory
+
+
+def test_create_memory_selects_sqlite(tmp_path):
+    memory = create_memory({"storage_mode": "sqlite"}, str(tmp_path))
+    assert isinstance(memory, SQLiteMemory)
+    memory.close()
+
+
+def test_create_memory_passes_the_rollup_and_retention_config(tmp_path):
+    memory = create_memory(
+        {"storage_mode": "sqlite", "rollup_hourly_days": 7}, str(tmp_path)
+    )
+    assert memory.rollups.hourly_retention_days == 7
+    with pytest.raises(NotImplementedError):
+        memory.apply_retention()
+    memory.close()
+
+    with pytest.raises(ValueError, match="retention"):
+        create_memory(
+            {"storage_mode": "sqlite", "retention": {"default": {"max_entries": 5}}},
+            str(tmp_path),
+        )
+
+
+def test_inherited_history_walks_read_the_table(tmp_path, store_activity):
+    memory = SQLiteMemory(str(tmp_path))
+    for i in range(5):
+        store_activity(memory, "DrawActivity", {"n": i})
+
+    entries = memory._iter_entries(include_archive=True)
+    assert [e["data"]["n"] for e in entries] == list(range(5))
+    memory.close()
+
+
+def test_queries_cover_the_whole_history(tmp_path, store_activity):
+    memory = SQLiteMemory(str(tmp_path))
+    for i in range(120):
+        store_activity(
+            memory, "DrawActivity" if i % 2 else "PostTweetActivity", {"n": i}
+        )
+    store_activity(memory, "DrawActivity", {"n": 120}, success=False)
+
+    recent = memory.get_recent_activities(limit=3, offset=100)
+    assert [a["data"]["n"] for a in recent] == [20, 19, 18]
+    history = memory.get_activity_history("PostTweetActivity")
+    assert [a["data"]["n"] for a in history[:3]] == [0, 2, 4]
+    assert memory.count_activities("DrawActivity") == 61
+    assert memory.count_activities("DrawActivity", success=False) == 1
+    memory.close()
+
+    reopened = SQLiteMemory(str(tmp_path))
+    assert reopened.get_activity_count() == 121
+    assert reopened.get_recent_activities(limit=1)[0]["data"]["n"] == 120
+    reopened.close()
+
+
+def test_existing_json_memory_is_imported_once(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    for i in range(3):
+        store_activity(memory, "DrawActivity", {"n": i})
+    memory.close()
+
+    imported = SQLiteMemory(str(tmp_path))
+    assert imported.count_activities() == 3
+    imported.close()
+
+    again = SQLiteMemory(str(tmp_path))
+    assert again.count_activities() == 3
+    again.close()
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+from framework.memory import Memory
+
+
+def test_stats_are_updated_on_every_store(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    store_activity(memory, "DrawActivity", duration=2.0)
+    store_activity(memory, "DrawActivity", success=False, duration=4.0)
+    store_activity(memory, "PostTweetActivity")
+
+    draw = memory.get_activity_stats("DrawActivity")
+    assert draw["count"] == 2
+    assert draw["success_count"] == 1
+    assert draw["failure_count"] == 1
+    assert draw["success_rate"] == 0.5
+    assert draw["mean_duration"] == pytest.approx(3.0)
+    assert memory.get_activity_count() == 3
+    assert set(memory.get_activity_stats()) == {"DrawActivity", "PostTweetActivity"}
+    assert memory.get_activity_stats("Unknown")["count"] == 0
+
+
+def test_stats_are_persisted_and_rebuilt_for_old_files(tmp_path, store_activity):
+    memory = Memory(str(tmp_path))
+    for _ in range(3):
+        store_activity(memory, "DrawActivity")
+    memory.close()
+    assert Memory(str(tmp_path)).get_activity_stats("DrawActivity")["count"] == 3
+
+    # Memory files written before stats existed are rebuilt from the entries
+    memory_file = tmp_path / "memory.json"
+    data = json.loads(memory_file.read_text())
+    del data["stats"]
+    memory_file.write_text(json.dumps(data))
+    assert Memory(str(tmp_path)).get_activity_stats("DrawActivity")["count"] == 3
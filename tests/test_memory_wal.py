@@ -0,0 +1,45 @@
+import json
+
+from framework.memory import Memory
+
+
+def test_journaled_records_are_replayed_after_a_crash(tmp_path, store_activity):
+    memory = Memory(str(tmp_path), storage_mode="wal")
+    for i in range(5):
+        store_activity(memory, "DrawActivity", {"n": i})
+    # No close(): the records only exist in the journal
+
+    reloaded = Memory(str(tmp_path), storage_mode="wal")
+
+    assert reloaded.get_activity_count() == 5
+    recent = reloaded.get_recent_activities(limit=5)
+    assert [a["data"]["n"] for a in recent] == [4, 3, 2, 1, 0]
+
+
+def test_torn_final_line_is_skipped(tmp_path, store_activity):
+    memory = Memory(str(tmp_path), storage_mode="wal")
+    store_activity(memory, "DrawActivity", {"n": 0})
+    memory._journal.close()
+    with open(tmp_path / "memory.wal.jsonl", "a") as f:
+        f.write('{"seq": 2, "activity_type": "Draw')
+
+    reloaded = Memory(str(tmp_path), storage_mode="wal")
+    store_activity(reloaded, "DrawActivity", {"n": 1})
+    reloaded._journal.close()
+
+    again = Memory(str(tmp_path), storage_mode="wal")
+    assert [a["data"]["n"] for a in again.get_recent_activities()] == [1, 0]
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path, store_activity):
+    memory = Memory(str(tmp_path), storage_mode="wal", compaction_threshold=1000)
+    for i in range(12):
+        store_activity(memory, "DrawActivity", {"n": i})
+
+    memory.compact(wait=True)
+
+    with open(tmp_path / "memory.json") as f:
+        assert json.load(f)["last_seq"] == 12
+    assert (tmp_path / "memory.wal.jsonl").read_text().strip() == ""
+    memory.close()
+    assert Memory(str(tmp_path), storage_mode="wal").get_activity_count() == 12
@@ -0,0 +1,67 @@
+import asyncio
+
+from framework.persistence import WriteBehindPersister
+
+
+def _recording_store(persister, name="store"):
+    value = {"n": 0}
+    writes = []
+    persister.register(name, lambda: dict(value), writes.append)
+    return value, writes
+
+
+def test_writes_through_until_started():
+    persister = WriteBehindPersister()
+    value, writes = _recording_store(persister)
+
+    value["n"] = 1
+    persister.mark_dirty("store")
+
+    assert writes == [{"n": 1}]
+
+
+def test_saves_within_the_interval_are_coalesced():
+    persister = WriteBehindPersister(flush_interval_ms=20)
+    value, writes = _recording_store(persister)
+
+    async def run():
+        persister.start()
+        for n in range(1, 6):
+            value["n"] = n
+            persister.mark_dirty("store")
+        await asyncio.sleep(0.2)
+        persister.stop()
+
+    asyncio.run(run())
+
+    assert writes == [{"n": 5}]
+    assert persister.coalesced_count == 4
+
+
+def test_stop_flushes_pending_saves():
+    persister = WriteBehindPersister(flush_interval_ms=60_000)
+    value, writes = _recording_store(persister)
+
+    async def run():
+        persister.start()
+        value["n"] = 7
+        persister.mark_dirty("store")
+        persister.stop()
+
+    asyncio.run(run())
+
+    assert writes == [{"n": 7}]
+
+
+def test_an_older_snapshot_never_overwrites_a_newer_one():
+    persister = WriteBehindPersister()
+    value, writes = _recording_store(persister)
+
+    value["n"] = 1
+    older = persister._take_snapshots({"store"})
+    value["n"] = 2
+    newer = persister._take_snapshots({"store"})
+    persister._write_all(newer)
+    persister._write_all(older)
+
+    assert writes == [{"n": 2}]
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+from framework.pipeline import Pipeline, PipelineError, Stage
+
+
+def test_independent_stages_run_concurrently():
+    pipeline = Pipeline("fan_out")
+
+    @pipeline.stage(depends_on=["base"])
+    async def left(base):
+        await asyncio.sleep(0.1)
+        return base + 1
+
+    @pipeline.stage(depends_on=["base"], blocking=True)
+    def right(base):
+        time.sleep(0.1)
+        return base + 2
+
+    @pipeline.stage(depends_on=["left", "right"], output=int)
+    def total(left, right):
+        return left + right
+
+    started = time.monotonic()
+    result = asyncio.run(pipeline.run(base=10))
+
+    assert result.success
+    assert result["total"] == 23
+    assert time.monotonic() - started < 0.18
+    assert set(result.summary()["stage_seconds"]) == {"left", "right", "total"}
+
+
+def test_invalid_definitions_raise_pipeline_error():
+    pipeline = Pipeline("broken")
+    pipeline.add_stage(Stage("a", lambda b: b, ["b"]))
+    pipeline.add_stage(Stage("b", lambda a: a, ["a"]))
+    with pytest.raises(PipelineError, match="cycle"):
+        pipeline.validate()
+
+    with pytest.raises(PipelineError, match="duplicate"):
+        pipeline.add_stage(Stage("a", lambda: None))
+
+    unknown = Pipeline("unknown")
+    unknown.add_stage(Stage("a", lambda missing: missing, ["missing"]))
+    with pytest.raises(PipelineError, match="unknown"):
+        asyncio.run(unknown.run())
+
+
+def test_optional_stage_failure_yields_none():
+    pipeline = Pipeline("optional")
+
+    @pipeline.stage(optional=True)
+    def image():
+        raise RuntimeError("no image today")
+
+    @pipeline.stage(depends_on=["image"])
+    def post(image):
+        return {"image": image}
+
+    result = asyncio.run(pipeline.run())
+
+    assert result.success
+    assert result["post"] == {"image": None}
+
+
+def test_failing_stage_cancels_the_rest():
+    pipeline = Pipeline("failing")
+    cancelled = []
+
+    @pipeline.stage()
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    @pipeline.stage()
+    async def broken():
+        raise ValueError("bad input")
+
+    @pipeline.stage(depends_on=["broken"])
+    def after(broken):
+        return broken
+
+    async def scenario():
+        result = await pipeline.run()
+        await asyncio.sleep(0)
+        return result
+
+    result = asyncio.run(scenario())
+
+    assert not result.success
+    assert result.failed_stage == "broken"
+    assert result.error == "broken: bad input"
+    assert cancelled == ["slow"]
+    assert "after" not in result.timings
+    assert not result.to_activity_result().success
+
+
+def test_output_type_is_checked():
+    pipeline = Pipeline("typed")
+    pipeline.add_stage(Stage("text", lambda: 42, output=str))
+
+    result = asyncio.run(pipeline.run())
+
+    assert not result.success
+    assert "expected str" in result.error
@@ -0,0 +1,72 @@
+import asyncio
+
+from activities import activity_post_a_tweet as module
+from framework.memory import Memory
+from framework.shared_data import SharedData
+
+
+def _shared_data(tmp_path):
+    shared_data = SharedData()
+    shared_data.initialize()
+    shared_data.set(
+        "system",
+        "character_config",
+        {"personality": {"calm": 0.8}, "backstory": {"origin": "A bean"}},
+    )
+    shared_data.set("system", "memory_ref", Memory(str(tmp_path)))
+    return shared_data
+
+
+def test_missing_composio_toolset_fails_before_generating(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(module.composio_manager, "_toolset", None)
+    monkeypatch.setattr(
+        module.PostTweetActivity,
+        "_generate_tweet",
+        lambda self, prompt: calls.append(prompt),
+    )
+
+    activity = module.PostTweetActivity()
+    result = asyncio.run(activity.execute(_shared_data(tmp_path)))
+
+    assert not result.success
+    assert "x_api" in result.error
+    assert calls == []
+
+
+def test_image_prompt_and_image_reach_the_post(tmp_path, monkeypatch):
+    posted = []
+
+    async def generate_image_prompt(self, tweet_text, personality_data, origin):
+        return f"{origin}: {tweet_text}"
+
+    async def generate_image_mj(self, image_prompt):
+        return ["https://example.com/bean.png"]
+
+    async def post_tweet(self, text, media_urls=None):
+        posted.append((text, media_urls))
+        return {"success": True, "tweet_id": "7"}
+
+    monkeypatch.setenv("MJ_API_KEY", "key")
+    monkeypatch.setattr(module.composio_manager, "_toolset", object())
+    monkeypatch.setattr(
+        module.PostTweetActivity,
+        "_generate_tweet",
+        lambda self, prompt: module.TweetDraft("Beans rest", prompt),
+    )
+    monkeypatch.setattr(
+        module.PostTweetActivity, "_generate_image_prompt", generate_image_prompt
+    )
+    monkeypatch.setattr(
+        module.PostTweetActivity, "_generate_image_mj", generate_image_mj
+    )
+    monkeypatch.setattr(module.XAPISkill, "post_tweet", post_tweet)
+
+    activity = module.PostTweetActivity()
+    result = asyncio.run(activity.execute(_shared_data(tmp_path)))
+
+    assert result.success, result.error
+    assert posted == [("Beans rest", ["https://example.com/bean.png"])]
+    assert result.data["tweet_id"] == "7"
+    assert result.metadata["image_prompt_used"] == "A bean: Beans rest"
+    assert result.metadata["image_count"] == 1
@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+
+import framework.main
+from activities import activity_post_recent_memory_tweet as module
+from framework.memory import Memory
+from framework.shared_data import SharedData
+
+
+def test_related_memories_reach_the_prompt(tmp_path, monkeypatch, store_activity):
+    """
+    Without memory_ref in shared data, the activity falls back to the running
+    being's memory, and old memories related to the objectives are recalled
+    into the prompt next to the recent ones.
+    """
+    memory = Memory(str(tmp_path))
+    store_activity(
+        memory, "DrawActivity", {"description": "a garden to spread positivity"}
+    )
+    for i in range(20):
+        store_activity(
+            memory, "AnalyzeNewCommitsActivity", {"summary": f"reviewed commit {i}"}
+        )
+
+    shared_data = SharedData()
+    shared_data.initialize()
+    shared_data.set(
+        "system",
+        "character_config",
+        {
+            "personality": {"kindness": 0.9},
+            "objectives": {"primary": "Spread positivity"},
+        },
+    )
+    monkeypatch.setattr(
+        framework.main, "_current_being", SimpleNamespace(memory=memory)
+    )
+
+    prompts = []
+
+    async def initialize():
+        return True
+
+    async def get_chat_completion(prompt, **kwargs):
+        prompts.append(prompt)
+        return {"success": True, "data": {"content": "A tweet"}}
+
+    async def post_tweet(self, text, media_urls=None):
+        return {"success": True, "tweet_id": "1"}
+
+    monkeypatch.setattr(module.chat_skill, "initialize", initialize)
+    monkeypatch.setattr(module.chat_skill, "get_chat_completion", get_chat_completion)
+    monkeypatch.setattr(module.XAPISkill, "post_tweet", post_tweet)
+
+    activity = module.PostRecentMemoriesTweetActivity()
+    result = asyncio.run(activity.execute(shared_data))
+
+    assert result.success, result.error
+    assert "reviewed commit 19" in prompts[0]
+    assert "spread positivity" in prompts[0]
+    assert "reviewed commit 0}" not in prompts[0]
+    memory.close()
+
+
+def test_media_urls_do_not_accumulate_across_runs(
+    tmp_path, monkeypatch, store_activity
+):
+    """The pooled instance only keeps media URLs of the memories of its current run."""
+    memory = Memory(str(tmp_path))
+    shared_data = SharedData()
+    shared_data.initialize()
+    shared_data.set("system", "memory_ref", memory)
+    shared_data.set("system", "character_config", {"objectives": {}})
+
+    async def initialize():
+        return True
+
+    async def get_chat_completion(prompt, **kwargs):
+        return {"success": True, "data": {"content": "A tweet"}}
+
+    posted = []
+
+    async def post_tweet(self, text, media_urls=None):
+        posted.append(media_urls)
+        return {"success": True, "tweet_id": "1"}
+
+    monkeypatch.setattr(module.chat_skill, "initialize", initialize)
+    monkeypatch.setattr(module.chat_skill, "get_chat_completion", get_chat_completion)
+    monkeypatch.setattr(module.XAPISkill, "post_tweet", post_tweet)
+
+    activity = module.PostRecentMemoriesTweetActivity(num_activities_to_fetch=1)
+    for i in range(3):
+        store_activity(
+            memory, "DrawActivity", {"image_url": f"https://example.com/{i}.png"}
+        )
+        asyncio.run(activity.execute(shared_data))
+
+    assert len(activity._media_urls_by_memory) == 1
+    assert posted[-1] == ["https://example.com/2.png"]
+    memory.close()
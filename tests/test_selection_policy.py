@@ -0,0 +1,81 @@
+from collections import Counter
+
+import pytest
+from framework.selection_policy import (
+    BanditPolicy,
+    PersonalityPolicy,
+    create_selection_policy,
+)
+
+
+class Reliable:
+    pass
+
+
+class Flaky:
+    pass
+
+
+@pytest.mark.parametrize("algorithm", ["thompson", "ucb"])
+def test_bandits_prefer_the_reliable_arm(algorithm):
+    policy = BanditPolicy(algorithm, {"seed": 1})
+    for _ in range(30):
+        policy.record_outcome("Reliable", True, None)
+        policy.record_outcome("Flaky", False, None)
+
+    picks = Counter(policy.choose([Reliable, Flaky], {}).__name__ for _ in range(50))
+
+    assert picks["Reliable"] >= 45
+
+
+def test_slow_arms_are_penalised():
+    policy = BanditPolicy("ucb", {"latency_weight": 1.0})
+    policy.record_outcome("Reliable", True, 3600)
+    policy.record_outcome("Flaky", True, 1)
+
+    assert policy.choose([Reliable, Flaky], {}) is Flaky
+
+
+def test_counts_decay_so_arms_recover():
+    policy = BanditPolicy("thompson", {"decay": 0.5})
+    for _ in range(20):
+        policy.record_outcome("Flaky", False, None)
+    assert policy.arms["Flaky"][1] == pytest.approx(2.0, abs=1e-4)
+
+    for _ in range(5):
+        policy.record_outcome("Flaky", True, None)
+    successes, failures = policy.arms["Flaky"][:2]
+    assert successes > 1.9
+    assert failures < 0.1
+
+
+def test_seeding_scales_stats_to_the_decay_horizon():
+    policy = BanditPolicy("thompson", {"decay": 0.9})
+    policy.seed_from_stats(
+        {"Reliable": {"count": 100, "success_count": 80, "failure_count": 20}}
+    )
+
+    assert policy.arms["Reliable"][:2] == pytest.approx([8.0, 2.0])
+
+
+def test_state_round_trip():
+    policy = BanditPolicy("ucb")
+    policy.record_outcome("Reliable", True, 12.0)
+
+    restored = BanditPolicy("ucb")
+    restored.restore_state(policy.export_state())
+    restored.restore_state({"arms": {"Broken": [1, 2]}})
+
+    assert restored.arms == policy.arms
+
+
+def test_create_selection_policy():
+    class StubMemory:
+        def get_activity_stats(self):
+            return {"Reliable": {"count": 2, "success_count": 2, "failure_count": 0}}
+
+    assert isinstance(create_selection_policy(), PersonalityPolicy)
+    assert isinstance(create_selection_policy({"policy": "nope"}), PersonalityPolicy)
+    policy = create_selection_policy({"policy": "thompson"}, StubMemory())
+    assert policy.name == "thompson"
+    assert policy.arms["Reliable"][0] == 2
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from framework.shared_data import SharedData
+
+
+def _shared_data(policies=None):
+    shared_data = SharedData(policies)
+    shared_data.initialize()
+    return shared_data
+
+
+def test_versions_increase_on_every_change():
+    shared_data = _shared_data()
+    assert shared_data.get_version("memory", "news") == 0
+
+    shared_data.set("memory", "news", "a")
+    first = shared_data.get_version("memory", "news")
+    shared_data.set("memory", "news", "b")
+    second = shared_data.get_version("memory", "news")
+    shared_data.delete("memory", "news")
+
+    assert 0 < first < second < shared_data.get_version("memory", "news")
+    assert not shared_data.set("unknown", "key", 1)
+
+
+def test_category_snapshot_is_shared_until_changed():
+    shared_data = _shared_data()
+    shared_data.set("state", "mood", "calm")
+
+    snapshot = shared_data.get_category_data("state")
+    assert shared_data.get_category_data("state") is snapshot
+    with pytest.raises(TypeError):
+        snapshot["mood"] = "busy"
+
+    shared_data.set("state", "mood", "busy")
+    assert snapshot["mood"] == "calm"
+    assert shared_data.get_category_data("state")["mood"] == "busy"
+
+
+def test_watch_wakes_on_change():
+    async def scenario():
+        shared_data = _shared_data()
+        version = shared_data.get_version("memory", "news")
+        waiter = asyncio.create_task(
+            shared_data.watch("memory", "news", since_version=version)
+        )
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        shared_data.set("memory", "news", "fresh")
+        value, new_version = await asyncio.wait_for(waiter, 1)
+
+        assert value == "fresh"
+        assert new_version > version
+        assert not shared_data._watchers
+
+    asyncio.run(scenario())
+
+
+def test_watch_returns_at_once_if_already_changed_and_times_out():
+    async def scenario():
+        shared_data = _shared_data()
+        shared_data.set("memory", "news", "old")
+
+        assert await shared_data.watch("memory", "news", since_version=0) == (
+            "old",
+            shared_data.get_version("memory", "news"),
+        )
+        with pytest.raises(asyncio.TimeoutError):
+            await shared_data.watch("memory", "news", timeout=0.01)
+        with pytest.raises(KeyError):
+            await shared_data.watch("unknown", "news")
+
+    asyncio.run(scenario())
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr("framework.shared_data.time", clock)
+    return clock
+
+
+def test_keys_expire_after_ttl(clock):
+    shared_data = _shared_data({"temp": {"ttl_seconds": 10}})
+    shared_data.set("temp", "a", 1)
+    shared_data.set("temp", "b", 2, ttl=60)
+
+    clock.now += 11
+    assert shared_data.get("temp", "a") is None
+    assert shared_data.get("temp", "b") == 2
+    assert shared_data.get_stats()["temp"]["evictions"]["ttl"] == 1
+
+
+def test_least_recently_used_keys_are_evicted(clock):
+    shared_data = _shared_data({"memory": {"max_entries": 2}})
+    shared_data.set("memory", "a", 1)
+    shared_data.set("memory", "b", 2)
+    shared_data.get("memory", "a")
+    shared_data.set("memory", "c", 3)
+
+    assert set(shared_data.get_category_data("memory")) == {"a", "c"}
+    assert shared_data.get_stats()["memory"]["evictions"]["lru"] == 1
+
+
+def test_max_bytes_keeps_the_newest_key(clock):
+    shared_data = _shared_data()
+    shared_data.set("memory", "small", "x")
+    shared_data.set("memory", "big", "y" * 10000)
+
+    shared_data.set_policies({"memory": {"max_bytes": 1000}})
+
+    assert set(shared_data.get_category_data("memory")) == {"big"}
+    stats = shared_data.get_stats()["memory"]
+    assert stats["evictions"]["bytes"] == 1
+    assert stats["approx_bytes"] > 1000
+
+
+def test_export_and_restore_keep_remaining_ttl(clock):
+    shared_data = _shared_data()
+    shared_data.set("memory", "news", {"headline": "hi"}, ttl=30)
+    shared_data.set("system", "ref", object())
+    exported = shared_data.export_state()
+
+    assert "system" not in exported
+    clock.now += 20
+    restored = _shared_data()
+    restored.restore_state(exported)
+    assert restored.get("memory", "news") == {"headline": "hi"}
+    clock.now += 11
+    assert restored.get("memory", "news") is None
@@ -0,0 +1,29 @@
+from framework.simulation import Simulation, synthetic_activities
+
+
+def test_simulation_runs_on_the_virtual_clock_without_writing_state(
+    tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    simulation = Simulation(synthetic_activities(20, seed=1), seed=1)
+
+    report = simulation.run(2 * 86400)
+
+    assert report["total_runs"] > 0
+    assert report["busy_seconds"] + report["idle_seconds"] == 2 * 86400
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_simulation_respects_cooldowns():
+    activities = synthetic_activities(5, seed=2)
+    simulation = Simulation(
+        activities,
+        outcomes={cls.__name__: {"duration": 1} for cls in activities.values()},
+        seed=2,
+    )
+
+    report = simulation.run(86400)
+
+    for cls in activities.values():
+        # One run when first due, then at most one per cooldown
+        assert report["runs"].get(cls.__name__, 0) <= 1 + 86400 // cls.cooldown